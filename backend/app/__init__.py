@@ -4,7 +4,8 @@ from config import Config
 from app.api import register_routes
 from app.middleware.auth_middleware import (
     load_user_from_request,
-    update_auth_cookies
+    update_auth_cookies,
+    start_jwks_refresher,
 )
 
 def create_app():
@@ -27,6 +28,7 @@ def create_app():
     
     app.before_request(load_user_from_request)
     app.after_request(update_auth_cookies)
+    start_jwks_refresher()
     
     register_routes(app)
 
@@ -1,18 +1,16 @@
-from flask import Blueprint, request, g
+import json
+from flask import Blueprint, Response, request, g, stream_with_context
 from app.services.transform_ai_service import transform_advisor_service, story_service
 from app.services.transformation_service import TransformationService
 from app.services.experience_service import experience_service
 from app.services.ai_chat_service import chat_service, ChatRequest
-from app.services.farmer_service import farmer_service
+from app.services.farm_loader import get_farm_loader
 from app.services.plan_service import plan_service
 from app.auth.decorators import require_auth
 
 ai_bp = Blueprint("ai", __name__)
 
-@ai_bp.route("/ai/chat", methods=["POST"])
-@require_auth
-def ai_chat():
-    """General AI assistant"""
+def _chat_request_from_body() -> ChatRequest:
     data = request.get_json() or {}
     
     user_message = data.get("message", "")
@@ -24,15 +22,21 @@ def ai_chat():
     # Later: replace with real user ID from auth
     session_id = data.get("session_id", "anonymous")
     
+    return ChatRequest(
+        message=user_message,
+        history=history,
+        language=language,
+        session_id=session_id,
+        user_id=g.user_id,
+        ai_type="assistant",
+    )
+
+@ai_bp.route("/ai/chat", methods=["POST"])
+@require_auth
+def ai_chat():
+    """General AI assistant"""
     try:
-        response = chat_service.chat(ChatRequest(
-            message=user_message,
-            history=history,
-            language=language,
-            session_id=session_id,
-            user_id=g.user_id,
-            ai_type="assistant",
-        ))
+        response = chat_service.chat(_chat_request_from_body())
         return {
             "response": response
         }
@@ -40,6 +44,39 @@ def ai_chat():
         # Guardrails rejection - return 400 with clear message
         return {"error": str(e)}, 400
 
+@ai_bp.route("/ai/chat/stream", methods=["POST"])
+@require_auth
+def ai_chat_stream():
+    """
+    General AI assistant, streamed as Server-Sent Events.
+
+    Same body as /ai/chat. Emits one `data: {"token": "..."}` event per
+    fragment, then `event: done`. Guardrail rejections still return a
+    plain 400 before the stream opens; failures mid-stream arrive as
+    `event: error`.
+    """
+    try:
+        tokens = chat_service.chat_stream(_chat_request_from_body())
+    except ValueError as e:
+        return {"error": str(e)}, 400
+
+    def event_stream():
+        try:
+            for token in tokens:
+                yield f"data: {json.dumps({'token': token})}\n\n"
+            yield "event: done\ndata: {}\n\n"
+        except ValueError as e:
+            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+        except Exception:
+            yield f"event: error\ndata: {json.dumps({'error': 'Sorry, something went wrong. Please try again.'})}\n\n"
+
+    return Response(
+        stream_with_context(event_stream()),
+        mimetype="text/event-stream",
+        # X-Accel-Buffering: stop nginx from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @ai_bp.route("/farms/<farm_id>/ai", methods=["POST"])
 @require_auth
 def ai_interaction(farm_id):
@@ -52,10 +89,12 @@ def ai_interaction(farm_id):
     language = data.get("language", "en")
     
     # Fetch full farm record from DB for real context
-    farm_record = farmer_service.get_farm_by_id(farm_id) or {}
+    # (request loader — farm and farmer come back from one joined query)
+    loader = get_farm_loader()
+    farm_record = loader.farm(farm_id) or {}
     
     # Fetch farmer profile for goals/readiness context
-    farmer_profile = farmer_service.get_farmer_for_user(g.user_id) or {}
+    farmer_profile = loader.farmer() or {}
     
     # Build enriched farm_data combining both
     farm_data = {
@@ -103,8 +142,9 @@ def ai_explain_experience(farm_id, experience_id):
         return {"error": "Experience not found"}, 404
     
     # Fetch farm + farmer context for personalized advice
-    farm_record = farmer_service.get_farm_by_id(farm_id) or {}
-    farmer_profile = farmer_service.get_farmer_for_user(g.user_id) or {}
+    loader = get_farm_loader()
+    farm_record = loader.farm(farm_id) or {}
+    farmer_profile = loader.farmer() or {}
     
     farm_context = {
         "farm_type": farm_record.get("farm_type"),
@@ -157,8 +197,9 @@ def generate_experience_story(farm_id, experience_id):
         return {"error": "Experience not found"}, 404
     
     # Fetch farm context for richer story
-    farm_record = farmer_service.get_farm_by_id(farm_id) or {}
-    farmer_profile = farmer_service.get_farmer_for_user(g.user_id) or {}
+    loader = get_farm_loader()
+    farm_record = loader.farm(farm_id) or {}
+    farmer_profile = loader.farmer() or {}
     
     farm_context = {
         "farm_type": farm_record.get("farm_type"),
@@ -1,85 +1,196 @@
 # routes/drone.py
 
-from flask import Blueprint, jsonify, g
-from app.services.simulation.sim_state import SIMULATION_STATE
-from app.services.simulation.telemetry_emitter import telemetry_engine
-# from app.services.simulation.telemetry_emitter import telemetry_engine, TelemetryEmitter
+import json
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from app.services.simulation.scheduler import simulation_scheduler
+from app.services.simulation.telemetry_broadcaster import telemetry_broadcaster
+from app.services.simulation.telemetry_history import SERIES, DOWNSAMPLERS, downsample
 from app.auth.decorators import require_auth
-from app.services.farmer_service import farmer_service
+from app.services.farm_loader import get_farm_loader
+from config import Config
 
 drone_bp = Blueprint("drone", __name__)
 
-@drone_bp.route("/drone/status", methods=["GET"])
-def drone_status():
-    if not SIMULATION_STATE["drone"]:
+# --- Per-farm missions ---
+
+@drone_bp.route("/farms/<farm_id>/drone/status", methods=["GET"])
+@require_auth
+def farm_drone_status(farm_id):
+    if not get_farm_loader().verify_ownership(farm_id):
+        return jsonify({"error": "Farm not found or access denied"}), 403
+
+    emitter = simulation_scheduler.get(farm_id)
+    if not emitter or not emitter.latest:
         return jsonify({
-            "status": "INITIALIZING"
+            "status": "INITIALIZING",
+            "mission": emitter.status()["mission"] if emitter else None
         })
+    return jsonify(emitter.status())
+
+@drone_bp.route("/farms/<farm_id>/drone/zones", methods=["GET"])
+@require_auth
+def farm_drone_zones(farm_id):
+    if not get_farm_loader().verify_ownership(farm_id):
+        return jsonify({"error": "Farm not found or access denied"}), 403
+
+    emitter = simulation_scheduler.get(farm_id)
+    zones = list(emitter.farm.zones.values()) if emitter else []
+    return jsonify({"zones": zones})
+
+@drone_bp.route("/farms/<farm_id>/drone/stream", methods=["GET"])
+@require_auth
+def farm_drone_stream(farm_id):
+    """
+    Live telemetry as Server-Sent Events — replaces polling /drone/status.
+
+    Sends the latest point on connect, then one `data: {...}` event per
+    scan. A viewer that falls too far behind gets `event: dropped` and
+    should reconnect (EventSource does this automatically).
+    """
+    if not get_farm_loader().verify_ownership(farm_id):
+        return jsonify({"error": "Farm not found or access denied"}), 403
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    if request.method == "HEAD":
+        # Flask answers HEAD with this view — no body, so take no viewer slot
+        return Response(mimetype="text/event-stream", headers=headers)
+
+    subscription = telemetry_broadcaster.subscribe(farm_id)
+    if subscription is None:
+        return jsonify({"error": "Too many live viewers, try again shortly"}), 503
+
+    emitter = simulation_scheduler.get(farm_id)
+    latest = emitter.latest if emitter else None
+
+    def event_stream():
+        # Something goes out at once, so headers aren't held until the first scan
+        yield f"data: {json.dumps(latest)}\n\n" if latest else ": connected\n\n"
+        yield from subscription.events(Config.DRONE_STREAM_HEARTBEAT_SECONDS)
+
+    response = Response(
+        stream_with_context(event_stream()),
+        mimetype="text/event-stream",
+        # X-Accel-Buffering: stop nginx from buffering the stream
+        headers=headers,
+    )
+    # On close, not in the generator: a body that is never iterated
+    # (HEAD, early disconnect) must still release the slot
+    response.call_on_close(lambda: telemetry_broadcaster.unsubscribe(subscription))
+    return response
+
+@drone_bp.route("/farms/<farm_id>/drone/history", methods=["GET"])
+@require_auth
+def farm_drone_history(farm_id):
+    """
+    Recent telemetry from memory, downsampled for charts.
+
+    Query params:
+        series — comma-separated, any of battery, ndvi, x, y, zone_id (default battery,ndvi)
+        points — max points per series (default 300)
+        method — lttb (default) or minmax
+        since  — only points after this epoch-seconds timestamp
+    """
+    if not get_farm_loader().verify_ownership(farm_id):
+        return jsonify({"error": "Farm not found or access denied"}), 403
 
+    series = [s.strip() for s in request.args.get("series", "battery,ndvi").split(",") if s.strip()]
+    method = request.args.get("method", "lttb")
+    try:
+        points = int(request.args.get("points", 300))
+        since = request.args.get("since", type=float)
+    except ValueError:
+        return jsonify({"error": "points must be an integer"}), 400
+
+    unknown = [s for s in series if s not in SERIES]
+    if unknown:
+        return jsonify({"error": f"Unknown series: {', '.join(unknown)}"}), 400
+    if method not in DOWNSAMPLERS:
+        return jsonify({"error": f"method must be one of: {', '.join(DOWNSAMPLERS)}"}), 400
+    points = max(2, min(points, Config.TELEMETRY_HISTORY_MAX_POINTS))
+
+    emitter = simulation_scheduler.get(farm_id)
+    if not emitter:
+        return jsonify({"farm_id": farm_id, "method": method, "total": 0, "series": {}})
+
+    columns = emitter.history.snapshot(since)
     return jsonify({
-        "drone": SIMULATION_STATE["drone"],
-        "last_updated": SIMULATION_STATE["last_updated"],
-        "mission": {
-            "status": SIMULATION_STATE["mission"]["mission_status"],
-            "progress": SIMULATION_STATE["mission"]["completion_percentage"]
-        }
+        "farm_id": farm_id,
+        "method": method,
+        "total": len(columns["timestamp"]),
+        "series": downsample(columns, series, points, method)
     })
 
+@drone_bp.route("/farms/<farm_id>/drone/start", methods=["POST"])
+@require_auth
+def farm_start_mission(farm_id):
+    if not get_farm_loader().verify_ownership(farm_id):
+        return jsonify({"error": "Farm not found or access denied"}), 403
+
+    simulation_scheduler.start_mission(farm_id)
+    return jsonify({"message": "Mission started", "farm_id": farm_id})
+
+@drone_bp.route("/farms/<farm_id>/drone/stop", methods=["POST"])
+@require_auth
+def farm_stop_mission(farm_id):
+    if not get_farm_loader().verify_ownership(farm_id):
+        return jsonify({"error": "Farm not found or access denied"}), 403
+
+    simulation_scheduler.stop_mission(farm_id)
+    return jsonify({"message": "Mission stopped", "farm_id": farm_id})
+
+@drone_bp.route("/farms/<farm_id>/drone/reset", methods=["POST"])
+@require_auth
+def farm_reset_mission(farm_id):
+    if not get_farm_loader().verify_ownership(farm_id):
+        return jsonify({"error": "Farm not found or access denied"}), 403
+
+    simulation_scheduler.reset_mission(farm_id)
+    return jsonify({"message": "Mission reset", "farm_id": farm_id})
+
+# --- Legacy routes ---
+# Scoped to one of the caller's farms: the farm_id in the body or query
+# string, or the user's first farm.
+
+def _resolve_farm_id():
+    data = request.get_json(silent=True) or {}
+    return get_farm_loader().default_farm_id(data.get("farm_id") or request.args.get("farm_id"))
+
+@drone_bp.route("/drone/status", methods=["GET"])
+@require_auth
+def drone_status():
+    farm_id = _resolve_farm_id()
+    if not farm_id:
+        return jsonify({"error": "Farm not found or access denied"}), 403
+    return farm_drone_status(farm_id)
+
 @drone_bp.route("/drone/zones", methods=["GET"])
+@require_auth
 def get_zones():
-    zones = list(SIMULATION_STATE.get("zones", {}).values())
-    return jsonify({"zones": zones})
+    farm_id = _resolve_farm_id()
+    if not farm_id:
+        return jsonify({"error": "Farm not found or access denied"}), 403
+    return farm_drone_zones(farm_id)
 
 @drone_bp.route("/drone/start", methods=["POST"])
 @require_auth
 def start_mission():
-    # Get user's real farm_id and wire it to telemetry engine
-    ids = farmer_service.get_or_create_for_user(
-        user_id=g.user_id,
-        farm_type="general"  # default since drone start doesn't know farm type
-    )
-    farm_id = ids["farm_id"]
-    # Wire farm_id into the running telemetry engine
-    telemetry_engine.farm_id = farm_id
-    
-    SIMULATION_STATE["mission"]["is_running"] = True
-    SIMULATION_STATE["mission"]["mission_status"] = "IN_PROGRESS"
-    return jsonify({"message": "Mission started"})
+    farm_id = _resolve_farm_id()
+    if not farm_id:
+        return jsonify({"error": "Farm not found or access denied"}), 403
+    return farm_start_mission(farm_id)
 
 @drone_bp.route("/drone/stop", methods=["POST"])
 @require_auth
 def stop_mission():
-    SIMULATION_STATE["mission"]["is_running"] = False
-    SIMULATION_STATE["mission"]["mission_status"] = "STOPPED"
-    # Clear farm_id when mission stops
-    telemetry_engine.farm_id = None
-    return jsonify({"message": "Mission stopped"})
+    farm_id = _resolve_farm_id()
+    if not farm_id:
+        return jsonify({"error": "Farm not found or access denied"}), 403
+    return farm_stop_mission(farm_id)
 
 @drone_bp.route("/drone/reset", methods=["POST"])
 @require_auth
 def reset_mission():
-    
-    # Clear farm_id on reset
-    telemetry_engine.farm_id = None
-    # Reset drone simulator position
-    if telemetry_engine.drone:
-        telemetry_engine.drone.x = 1
-        telemetry_engine.drone.y = 1
-        telemetry_engine.drone.battery = 100
-        telemetry_engine.drone.status = "IDLE"
-        telemetry_engine.drone.decision_state = "IDLE"
-        telemetry_engine.drone.last_scan_time = None
-        
-    SIMULATION_STATE["drone"] = None
-    SIMULATION_STATE["last_updated"] = None
-
-    SIMULATION_STATE["mission"] = {
-        "total_zones": len(SIMULATION_STATE["zones"]),
-        "scanned_zones": set(),
-        "poor_zones_detected": set(),
-        "mission_status": "NOT_STARTED",
-        "completion_percentage": 0,
-        "is_running": False
-    }
-
-    return jsonify({"message": "Mission reset"})
+    farm_id = _resolve_farm_id()
+    if not farm_id:
+        return jsonify({"error": "Farm not found or access denied"}), 403
+    return farm_reset_mission(farm_id)
@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request, g
 from app.auth.decorators import require_auth
 from app.services.farmer_service import farmer_service
+from app.services.farm_loader import get_farm_loader
 
 farm_bp = Blueprint("farm", __name__)
 
@@ -64,13 +65,15 @@ def create_farm():
 @require_auth
 def get_farm(farm_id):
     """Get a single farm by id."""
-    if not farmer_service.verify_farm_ownership(farm_id, g.user_id):
-        return jsonify({"error": "Farm not found or access denied"}), 403
-
-    farm = farmer_service.get_farm_by_id(farm_id)
-    if not farm:
+    # Ownership check and fetch in one query
+    loader = get_farm_loader()
+    farm = loader.owned_farm(farm_id)
+    if farm:
+        return jsonify({"farm": farm}), 200
+    # Not the user's farm — tell a missing farm from someone else's
+    if not loader.farm(farm_id):
         return jsonify({"error": "Farm not found"}), 404
-    return jsonify({"farm": farm}), 200
+    return jsonify({"error": "Farm not found or access denied"}), 403
 
 
 @farm_bp.route("/farms/<farm_id>", methods=["PATCH"])
@@ -80,7 +83,7 @@ def update_farm(farm_id):
     Update farm details.
     Only fields provided in body will be updated.
     """
-    if not farmer_service.verify_farm_ownership(farm_id, g.user_id):
+    if not get_farm_loader().verify_ownership(farm_id):
         return jsonify({"error": "Farm not found or access denied"}), 403
 
     data = request.get_json() or {}
@@ -1,6 +1,8 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 
-from app.services.simulation.sim_state import SIMULATION_STATE
+from app.auth.decorators import require_auth
+from app.services.farm_loader import get_farm_loader
+from app.services.simulation.scheduler import simulation_scheduler
 
 health_bp = Blueprint("health", __name__)
 health_live_bp = Blueprint("health_live", __name__)
@@ -15,8 +17,15 @@ def health_check():
     
 
 @health_live_bp.route("/health/live", methods=["GET"])
+@require_auth
 def health_live():
-    drone = SIMULATION_STATE.get("drone")
+    """Latest scan of one of the caller's farms — ?farm_id=, or their first farm."""
+    farm_id = get_farm_loader().default_farm_id(request.args.get("farm_id"))
+    if not farm_id:
+        return jsonify({"error": "Farm not found or access denied"}), 403
+
+    emitter = simulation_scheduler.get(farm_id)
+    drone = emitter.latest if emitter else None
 
     if not drone:
         return jsonify({"status": "NO_DATA"})
@@ -1,61 +1,134 @@
 from flask import Blueprint
 from app.core.supabase import supabase
+from app.auth.decorators import require_auth, require_role
+from app.services.ai.vector_index import knowledge_index
+from app.services.ai.embeddings.cached import embedding_cache
+from app.services.ai.answer_cache import answer_cache
+from app.services.ai.guardrails import guardrail_stats
+from app.services.ai.evaluator import evaluator_service
+from app.services.ai.latency_stats import latency_stats
+from app.services.ai.interaction_loger import log_writer
+from app.services.usage_meter import usage_meter
+from app.services.plan_service import plan_service
+from app.middleware.auth_middleware import jwt_cache_stats
+from app.utils.supabase_client import pool_stats
+from app.services.farmer_service import farmer_service
+from app.services.simulation.scheduler import simulation_scheduler
+from app.services.simulation.telemetry_repository import telemetry_writer
+from app.services.simulation.telemetry_broadcaster import telemetry_broadcaster
+from config import Config
 from datetime import date
 
 platform_bp = Blueprint("platform", __name__)
 
 
+def _rollup_totals() -> dict:
+    """
+    Headline numbers from the rollup tables kept by the triggers in
+    data/migrations/003_observability_rollups.sql — constant time,
+    however much history there is.
+    """
+    res = supabase.rpc("observability_totals", {"p_today": date.today().isoformat()}).execute()
+    totals = res.data or {}
+    evals = totals.get("evaluations") or {}
+    total_interactions = totals.get("interactions", 0)
+
+    def avg(metric):
+        count = evals.get(f"{metric}_count") or 0
+        return round(float(evals[f"{metric}_sum"]) / count, 2) if count else 0
+
+    return {
+        "total_interactions":    total_interactions,
+        "today_interactions":    totals.get("today_interactions", 0),
+        "avg_latency_ms":        int(totals.get("latency_ms_sum", 0) / total_interactions) if total_interactions else 0,
+        "rag_hit_rate":          round(totals.get("rag_hits", 0) / total_interactions, 2) if total_interactions else 0,
+        "web_count":             totals.get("web_count", 0),
+        "whatsapp_count":        totals.get("whatsapp_count", 0),
+        "eval_count":            evals.get("evaluations") or 0,
+        "low_score_count":       evals.get("low_score_count") or 0,
+        "avg_faithfulness":      avg("faithfulness"),
+        "avg_answer_relevance":  avg("answer_relevance"),
+        "avg_context_precision": avg("context_precision"),
+        "avg_completeness":      avg("completeness"),
+        "avg_safety":            avg("safety"),
+        "avg_score_overall":     avg("avg_score"),
+    }
+
+
+def _scanned_totals() -> dict:
+    """
+    Same numbers computed from every log and evaluation row.
+    Fallback for databases where the rollup migration hasn't run yet.
+    """
+    # All interaction logs 
+    all_logs = supabase.table("ai_interaction_logs").select(
+        "id, source, rag_hit, latency_ms, created_at, retrieval_scores"
+    ).execute()
+    logs = all_logs.data or []
+
+    total_interactions = len(logs)
+    today_str = date.today().isoformat()
+    today_interactions = sum(1 for l in logs if l["created_at"].startswith(today_str))
+    avg_latency_ms = int(sum(l["latency_ms"] for l in logs) / total_interactions) if total_interactions else 0
+    rag_hits = sum(1 for l in logs if l["rag_hit"])
+    rag_hit_rate = round(rag_hits / total_interactions, 2) if total_interactions else 0
+    web_count = sum(1 for l in logs if l["source"] == "web")
+    whatsapp_count = sum(1 for l in logs if l["source"] == "whatsapp")
+
+    # All evaluation results 
+    eval_result = supabase.table("evaluation_results").select(
+        "faithfulness, answer_relevance, context_precision, completeness, safety, avg_score"
+    ).execute()
+    evals = eval_result.data or []
+    eval_count = len(evals)
+
+    def safe_avg(field):
+        values = [e[field] for e in evals if e.get(field) is not None]
+        return round(sum(values) / len(values), 2) if values else 0
+
+    # RAG-only metrics (faithfulness + context_precision only exist for RAG hits)
+    rag_evals = [e for e in evals if e.get("faithfulness") is not None]
+    rag_eval_count = len(rag_evals)
+
+    avg_faithfulness = round(
+        sum(e["faithfulness"] for e in rag_evals) / rag_eval_count, 2
+    ) if rag_eval_count else 0
+    
+    cp_values = [e["context_precision"] for e in rag_evals if e.get("context_precision") is not None]
+    avg_context_precision = round(sum(cp_values) / len(cp_values), 2) if cp_values else 0
+
+    # Low scoring interactions count
+    low_score_count = sum(
+        1 for e in evals
+        if e.get("avg_score") is not None and e["avg_score"] < 0.6
+    )
+
+    return {
+        "total_interactions":    total_interactions,
+        "today_interactions":    today_interactions,
+        "avg_latency_ms":        avg_latency_ms,
+        "rag_hit_rate":          rag_hit_rate,
+        "web_count":             web_count,
+        "whatsapp_count":        whatsapp_count,
+        "eval_count":            eval_count,
+        "low_score_count":       low_score_count,
+        "avg_faithfulness":      avg_faithfulness,
+        "avg_answer_relevance":  safe_avg("answer_relevance"),
+        "avg_context_precision": avg_context_precision,
+        "avg_completeness":      safe_avg("completeness"),
+        "avg_safety":            safe_avg("safety"),
+        "avg_score_overall":     safe_avg("avg_score"),
+    }
+
+
 @platform_bp.route("/platform/observability/stats", methods=["GET"])
 def observability_stats():
     try:
-        # All interaction logs 
-        all_logs = supabase.table("ai_interaction_logs").select(
-            "id, source, rag_hit, latency_ms, created_at, retrieval_scores"
-        ).execute()
-        logs = all_logs.data or []
-
-        total_interactions = len(logs)
-        today_str = date.today().isoformat()
-        today_interactions = sum(1 for l in logs if l["created_at"].startswith(today_str))
-        avg_latency_ms = int(sum(l["latency_ms"] for l in logs) / total_interactions) if total_interactions else 0
-        rag_hits = sum(1 for l in logs if l["rag_hit"])
-        rag_hit_rate = round(rag_hits / total_interactions, 2) if total_interactions else 0
-        web_count = sum(1 for l in logs if l["source"] == "web")
-        whatsapp_count = sum(1 for l in logs if l["source"] == "whatsapp")
-
-        # All evaluation results 
-        eval_result = supabase.table("evaluation_results").select(
-            "faithfulness, answer_relevance, context_precision, completeness, safety, avg_score"
-        ).execute()
-        evals = eval_result.data or []
-        eval_count = len(evals)
-
-        def safe_avg(field):
-            values = [e[field] for e in evals if e.get(field) is not None]
-            return round(sum(values) / len(values), 2) if values else 0
-
-        # RAG-only metrics (faithfulness + context_precision only exist for RAG hits)
-        rag_evals = [e for e in evals if e.get("faithfulness") is not None]
-        rag_eval_count = len(rag_evals)
-
-        avg_faithfulness = round(
-            sum(e["faithfulness"] for e in rag_evals) / rag_eval_count, 2
-        ) if rag_eval_count else 0
-        
-        cp_values = [e["context_precision"] for e in rag_evals if e.get("context_precision") is not None]
-        avg_context_precision = round(sum(cp_values) / len(cp_values), 2) if cp_values else 0
-
-        # All-interaction metrics
-        avg_answer_relevance  = safe_avg("answer_relevance")
-        avg_completeness      = safe_avg("completeness")
-        avg_safety            = safe_avg("safety")
-        avg_score_overall     = safe_avg("avg_score")
-
-        # Low scoring interactions count
-        low_score_count = sum(
-            1 for e in evals
-            if e.get("avg_score") is not None and e["avg_score"] < 0.6
-        )
+        try:
+            totals = _rollup_totals()
+        except Exception as e:
+            print(f"[OBSERVABILITY_ERROR] Rollups unavailable, scanning tables: {e}")
+            totals = _scanned_totals()
 
         # Recent interactions with full eval data joined
         recent_result = supabase.table("ai_interaction_logs").select(
@@ -103,24 +176,75 @@ def observability_stats():
 
         return {
             # Health
-            "total_interactions":   total_interactions,
-            "today_interactions":   today_interactions,
-            "avg_latency_ms":       avg_latency_ms,
-            "rag_hit_rate":         rag_hit_rate,
-            "web_count":            web_count,
-            "whatsapp_count":       whatsapp_count,
-            "eval_count":           eval_count,
-            "low_score_count":      low_score_count,
+            "total_interactions":   totals["total_interactions"],
+            "today_interactions":   totals["today_interactions"],
+            "avg_latency_ms":       totals["avg_latency_ms"],
+            "rag_hit_rate":         totals["rag_hit_rate"],
+            "web_count":            totals["web_count"],
+            "whatsapp_count":       totals["whatsapp_count"],
+            "eval_count":           totals["eval_count"],
+            "low_score_count":      totals["low_score_count"],
             # Quality averages
-            "avg_faithfulness":       avg_faithfulness,
-            "avg_answer_relevance":   avg_answer_relevance,
-            "avg_context_precision":  avg_context_precision,
-            "avg_completeness":       avg_completeness,
-            "avg_safety":             avg_safety,
-            "avg_score_overall":      avg_score_overall,
+            "avg_faithfulness":       totals["avg_faithfulness"],
+            "avg_answer_relevance":   totals["avg_answer_relevance"],
+            "avg_context_precision":  totals["avg_context_precision"],
+            "avg_completeness":       totals["avg_completeness"],
+            "avg_safety":             totals["avg_safety"],
+            "avg_score_overall":      totals["avg_score_overall"],
+            # p50/p90/p99 per stage, by provider and by source (this process, since start)
+            "latency":              latency_stats.snapshot(),
             # Recent
             "recent_interactions":  recent_interactions,
         }
 
     except Exception as e:
-        return {"error": str(e)}, 500
\ No newline at end of file
+        return {"error": str(e)}, 500
+
+
+@platform_bp.route("/platform/observability/runtime", methods=["GET"])
+def runtime_stats():
+    """
+    In-process counters for this worker — caches, queues, indexes.
+    Values are per process and reset on restart.
+    """
+    return {
+        "embedding_cache": embedding_cache.stats(),
+        "answer_cache":    answer_cache.stats(),
+        "guardrails":      guardrail_stats(),
+        "evaluator":       evaluator_service.stats(),
+        "interaction_log": log_writer.stats(),
+        "usage_meter":     usage_meter.stats(),
+        "plan_cache":      plan_service.cache_stats(),
+        "jwt_cache":       jwt_cache_stats(),
+        "supabase_pool":   pool_stats(),
+        "farmer_cache":    farmer_service.cache_stats(),
+        "simulation":      simulation_scheduler.stats(),
+        "telemetry":       telemetry_writer.stats(),
+        "drone_stream":    telemetry_broadcaster.stats(),
+        "knowledge_index": {
+            "retrieval_mode": Config.RETRIEVAL_MODE,
+            "ready":          knowledge_index.is_ready,
+            "chunks":         knowledge_index.size,
+        },
+    }
+
+
+@platform_bp.route("/platform/knowledge/refresh", methods=["POST"])
+@require_auth
+@require_role("admin")
+def refresh_knowledge_index():
+    """
+    Call after scripts/ingest.py changes the knowledge base.
+    Drops cached answers, and reloads the in-process vector index when
+    RETRIEVAL_MODE is "local" (the RPC always sees the latest rows).
+    """
+    answer_cache.clear()
+
+    if Config.RETRIEVAL_MODE.lower() != "local":
+        return {"retrieval_mode": Config.RETRIEVAL_MODE, "refreshed": False}
+
+    try:
+        chunk_count = knowledge_index.refresh()
+        return {"retrieval_mode": "local", "refreshed": True, "chunks": chunk_count}
+    except Exception as e:
+        return {"error": str(e)}, 500
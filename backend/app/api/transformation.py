@@ -1,7 +1,7 @@
 from flask import Blueprint, request, jsonify, g
 from app.services.transformation_service import TransformationService
 from app.services.experience_service import experience_service
-from app.services.farmer_service import farmer_service
+from app.services.farm_loader import get_farm_loader
 from app.auth.decorators import require_auth
 from app.services.plan_service import plan_service
 
@@ -16,16 +16,17 @@ def transform_farm(farm_id):
     Run personalized farm transformation for a specific farm.
     Reads all farm data from DB — no body needed from frontend.
     """
-    if not farmer_service.verify_farm_ownership(farm_id, g.user_id):
+    # Ownership check, farm record and farmer profile — one joined query
+    loader = get_farm_loader()
+    owned_farm = loader.owned_farm(farm_id)
+    if not owned_farm:
         return jsonify({"error": "Farm not found or access denied"}), 403
 
-    # Fetch full farm record from DB
-    farm_data = farmer_service.get_farm_by_id(farm_id)
-    if not farm_data:
-        return jsonify({"error": "Farm not found"}), 404
+    # Copy — the loader's record is shared for the rest of the request
+    farm_data = dict(owned_farm)
 
     # Fetch farmer profile for goals/budget context
-    farmer_profile = farmer_service.get_farmer_for_user(g.user_id) or {}
+    farmer_profile = loader.farmer() or {}
 
     # Merge farmer profile into farm_data so scoring engine
     # has full context — budget, goals, visitor experience etc.
@@ -61,7 +62,7 @@ def transform_farm(farm_id):
 @require_auth
 def get_farm_experiences(farm_id):
     """Get all experiences for a specific farm."""
-    if not farmer_service.verify_farm_ownership(farm_id, g.user_id):
+    if not get_farm_loader().verify_ownership(farm_id):
         return jsonify({"error": "Farm not found or access denied"}), 403
 
     experiences = experience_service.list_experiences(farm_id)
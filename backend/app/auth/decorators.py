@@ -165,7 +165,7 @@ def require_verified_email(f):
     return decorated_function
 
 
-def require_plan(feature: str):
+def require_plan(feature: str, fresh: bool = False):
     """
     Decorator factory that checks if user has access to a feature based on their plan.
     
@@ -192,6 +192,9 @@ def require_plan(feature: str):
         def carbon_estimate():
             ...
 
+    Plans are served from PlanService's short-lived cache. Pass fresh=True
+    on admin/billing routes that must read user_plans directly.
+
     Supported features:
         "ai"             → checks total AI usage against ai_chats_limit
         "transformation" → checks transformations_used against transformations_limit
@@ -202,7 +205,7 @@ def require_plan(feature: str):
         def decorated_function(*args, **kwargs):
             from app.services.plan_service import plan_service
 
-            plan = plan_service.get_plan(g.user_id)
+            plan = plan_service.get_plan(g.user_id, fresh=fresh)
 
             if not plan:
                 # No plan row — fail open, let request through
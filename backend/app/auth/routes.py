@@ -31,6 +31,7 @@ from app.utils.supabase_client import get_admin_supabase_client, get_supabase_cl
 from app.auth.decorators import require_auth
 from app.middleware.auth_middleware import (
     _set_auth_cookies,
+    refresh_session_tokens,
     ACCESS_TOKEN_COOKIE,
     REFRESH_TOKEN_COOKIE
 )
@@ -550,17 +551,17 @@ def refresh():
         return jsonify({"error": "No refresh token found"}), 401
 
     try:
-        anon_client = get_supabase_client()
-        session_response = anon_client.auth.refresh_session(refresh_token)
+        # Shared with the middleware's silent refresh — one call per refresh token
+        tokens = refresh_session_tokens(refresh_token)
 
-        if not session_response.session:
+        if not tokens:
             return jsonify({"error": "Session refresh failed"}), 401
 
-        session = session_response.session
+        access_token, new_refresh_token = tokens
 
         response = make_response(jsonify({"message": "Token refreshed"}), 200)
-        if session.refresh_token:
-            _set_auth_cookies(response, session.access_token, session.refresh_token)
+        if new_refresh_token:
+            _set_auth_cookies(response, access_token, new_refresh_token)
         return response
 
     except Exception as e:
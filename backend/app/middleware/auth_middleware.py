@@ -15,15 +15,22 @@
 #   We verify using Supabase's JWKS endpoint which supports both ES256 and HS256.
 #   This is faster than calling get_user() on every request because JWKS
 #   responses are cached — no network call needed after the first request.
+#   A background thread keeps those keys warm, and verified tokens are cached
+#   by digest until their exp, so polling endpoints skip verification entirely.
 # =============================================================================
 
 import os
+import time
+import hashlib
 import logging
+import threading
 from config import Config
 import jwt
 from jwt import PyJWKClient
 from flask import g, request, make_response
-from app.utils.supabase_client import get_supabase_client, get_admin_supabase_client
+from app.utils.supabase_client import get_supabase_client, get_admin_supabase_client, get_db_client
+from app.utils.ttl_cache import TTLCache
+from app.utils.single_flight import SingleFlight
 
 # Cookie names — centralized here so we never typo them
 ACCESS_TOKEN_COOKIE = "sb_access_token"
@@ -33,6 +40,17 @@ REFRESH_TOKEN_COOKIE = "sb_refresh_token"
 # PyJWKClient caches the public keys from Supabase's JWKS endpoint
 # This means after the first request, JWT verification requires no network call
 _jwks_client = None
+_jwks_refresher = None
+_jwks_lock = threading.Lock()
+
+# Verified claims keyed on sha256(token); each entry lives until the token's exp
+_claims_cache = TTLCache(max_size=Config.JWT_CACHE_SIZE, ttl_seconds=3600)
+
+# Session refresh: one refresh_session call per refresh token, however many
+# requests race on it. The result is kept briefly so requests still carrying
+# the old cookies get the same new session instead of a rejected refresh.
+_refresh_flights = SingleFlight()
+_refreshed_sessions = TTLCache(max_size=Config.JWT_CACHE_SIZE, ttl_seconds=Config.SESSION_REFRESH_CACHE_SECONDS)
 
 logger = logging.getLogger(__name__)
 
@@ -47,15 +65,103 @@ def _get_jwks_client() -> PyJWKClient:
     """
     global _jwks_client
     if _jwks_client is None:
-        supabase_url = os.environ.get("SUPABASE_URL")
-        if not supabase_url:
-            raise RuntimeError("SUPABASE_URL not set in environment")
-        jwks_url = f"{supabase_url}/auth/v1/.well-known/jwks.json"
-        # cache_keys=True → keys are cached, lifespan=3600 → refresh every hour
-        _jwks_client = PyJWKClient(jwks_url, cache_keys=True, lifespan=3600)
+        with _jwks_lock:
+            if _jwks_client is None:
+                supabase_url = os.environ.get("SUPABASE_URL")
+                if not supabase_url:
+                    raise RuntimeError("SUPABASE_URL not set in environment")
+                jwks_url = f"{supabase_url}/auth/v1/.well-known/jwks.json"
+                # cache_keys=True → keys are cached, lifespan=3600 → refresh every hour
+                # (start_jwks_refresher re-fetches well before that)
+                _jwks_client = PyJWKClient(jwks_url, cache_keys=True, lifespan=3600)
     return _jwks_client
 
 
+def start_jwks_refresher():
+    """
+    Starts a daemon thread that re-fetches the JWKS every
+    JWKS_REFRESH_SECONDS (shorter than the client's key lifespan), so the
+    cached key set never expires and request threads never wait on the
+    JWKS endpoint. Only an unknown kid (key rotation) still triggers a
+    fetch on the request path. Safe to call more than once.
+    """
+    global _jwks_refresher
+    with _jwks_lock:
+        if _jwks_refresher is not None:
+            return
+        _jwks_refresher = threading.Thread(target=_refresh_jwks_forever, name="jwks-refresher", daemon=True)
+        _jwks_refresher.start()
+
+
+def _refresh_jwks_forever():
+    while True:
+        try:
+            _get_jwks_client().get_jwk_set(refresh=True)
+            delay = Config.JWKS_REFRESH_SECONDS
+        except Exception as e:
+            logger.error(f"JWKS refresh error: {str(e)}")
+            delay = 30  # retry sooner while the endpoint is unreachable
+        time.sleep(delay)
+
+
+def _decode_jwt_cached(token: str) -> dict:
+    """
+    _decode_jwt with a cache in front.
+
+    Only successfully verified tokens are cached, and only until their exp —
+    after that the entry is gone and _decode_jwt raises ExpiredSignatureError
+    as before. Callers must treat the returned claims as read-only.
+    """
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    payload = _claims_cache.get(key)
+    if payload is not None:
+        return payload
+
+    payload = _decode_jwt(token)
+    exp = payload.get("exp")
+    if exp:
+        _claims_cache.set(key, payload, ttl=exp - time.time())
+    return payload
+
+
+def jwt_cache_stats() -> dict:
+    return {
+        "claims":             _claims_cache.stats(),
+        "refreshed_sessions": _refreshed_sessions.stats(),
+        "refresh_flights":    _refresh_flights.stats(),
+    }
+
+
+def refresh_session_tokens(refresh_token: str) -> tuple[str, str] | None:
+    """
+    Exchanges a refresh token for (access_token, refresh_token).
+
+    Concurrent callers with the same refresh token share one
+    refresh_session call, and a successful result is reused for
+    SESSION_REFRESH_CACHE_SECONDS. Supabase rotates refresh tokens, so
+    racing refreshes would otherwise invalidate each other.
+
+    Returns None if Supabase returned no session; raises on errors.
+    """
+    # Cache and flights are keyed on a digest — raw refresh tokens are never kept
+    key = hashlib.sha256(refresh_token.encode("utf-8")).hexdigest()
+    tokens = _refreshed_sessions.get(key)
+    if tokens is not None:
+        return tokens
+
+    def refresh():
+        supabase = get_supabase_client()
+        response = supabase.auth.refresh_session(refresh_token)
+        if not response.session:
+            return None
+        new_tokens = (response.session.access_token, response.session.refresh_token)
+        # Cached before the flight ends, so later callers never start a second refresh
+        _refreshed_sessions.set(key, new_tokens)
+        return new_tokens
+
+    return _refresh_flights.do(key, refresh, timeout=Config.SESSION_REFRESH_TIMEOUT_SECONDS)
+
+
 def _decode_jwt(token: str) -> dict:
     """
     Decodes and verifies a Supabase JWT.
@@ -117,7 +223,7 @@ def load_user_from_request():
         return
 
     try:
-        payload = _decode_jwt(access_token)
+        payload = _decode_jwt_cached(access_token)
 
         user_id = payload.get("sub")
         if not user_id:
@@ -137,8 +243,8 @@ def load_user_from_request():
             "email_confirmed_at": payload.get("email_confirmed_at"),
         }
 
-        # Create a Supabase client scoped to this user (RLS applies)
-        g.supabase = get_supabase_client(access_token=access_token)
+        # Pooled client scoped to this user (RLS applies)
+        g.supabase = get_db_client(access_token=access_token)
 
     except jwt.ExpiredSignatureError:
         # Token expired — try silent refresh
@@ -160,17 +266,15 @@ def _try_refresh_session(refresh_token: str):
     If successful, updates g.user and signals after_request to update cookies.
     """
     try:
-        supabase = get_supabase_client()
-        response = supabase.auth.refresh_session(refresh_token)
+        # Single-flight: concurrent requests from one browser share this refresh
+        tokens = refresh_session_tokens(refresh_token)
         # supabase = get_admin_supabase_client()
         # response = supabase.auth.refresh_session(refresh_token)
 
-        if response.session:
-            session = response.session
-            new_access_token = session.access_token
-            new_refresh_token = session.refresh_token
+        if tokens:
+            new_access_token, new_refresh_token = tokens
 
-            payload = _decode_jwt(new_access_token)
+            payload = _decode_jwt_cached(new_access_token)
 
             user_id = payload.get("sub")
             app_metadata = payload.get("app_metadata", {})
@@ -185,7 +289,7 @@ def _try_refresh_session(refresh_token: str):
                 "role": g.user_role,
                 "email_confirmed_at": payload.get("email_confirmed_at"),
             }
-            g.supabase = get_supabase_client(access_token=new_access_token)
+            g.supabase = get_db_client(access_token=new_access_token)
 
             # Signal after_request to update cookies with new tokens
             g._new_tokens = {
@@ -0,0 +1,136 @@
+import threading
+import time
+import numpy as np
+from app.services.ai.vector_index import knowledge_index
+from config import Config
+
+
+class _LanguageBucket:
+    """
+    Fixed-size ring of cached answers for one language.
+
+    Embeddings live in one preallocated float32 matrix so a lookup is a
+    single matrix-vector product. When full, the oldest slot is overwritten.
+    """
+
+    def __init__(self, capacity: int, dimension: int):
+        self.vectors = np.zeros((capacity, dimension), dtype=np.float32)
+        self.expires_at = np.zeros(capacity, dtype=np.float64)  # 0 = empty slot
+        self.payloads = [None] * capacity
+        self.next_slot = 0
+
+    def add(self, vector: np.ndarray, payload: dict, expires_at: float):
+        slot = self.next_slot
+        self.vectors[slot] = vector
+        self.expires_at[slot] = expires_at
+        self.payloads[slot] = payload
+        self.next_slot = (slot + 1) % len(self.payloads)
+
+    def best_match(self, vector: np.ndarray, now: float) -> tuple[float, dict | None]:
+        live = self.expires_at > now
+        if not live.any():
+            return 0.0, None
+        scores = self.vectors @ vector
+        scores[~live] = -1.0
+        slot = int(np.argmax(scores))
+        return float(scores[slot]), self.payloads[slot]
+
+    def size(self, now: float) -> int:
+        return int((self.expires_at > now).sum())
+
+
+class SemanticAnswerCache:
+    """
+    Serves a stored answer when a new question embeds close enough
+    to one answered recently.
+
+    - Keyed by language — an Urdu question never gets an English answer
+    - Only for first-turn messages; callers must skip it when there is history
+    - Bounded: at most `max_entries` answers per language, oldest overwritten
+    - Entries expire after `ttl_seconds`
+    - clear() drops everything, called when the knowledge base is re-ingested
+    """
+
+    def __init__(self, similarity_threshold: float, max_entries: int, ttl_seconds: int, enabled: bool = True):
+        self.enabled = enabled and max_entries > 0
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._buckets: dict[str, _LanguageBucket] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def lookup(self, language: str, embedding: list[float]) -> dict | None:
+        """Returns the cached payload for the closest question, or None."""
+        vector = self._normalize(embedding)
+        if vector is None:
+            return None
+
+        with self._lock:
+            bucket = self._buckets.get(language)
+            if bucket is None or bucket.vectors.shape[1] != vector.shape[0]:
+                self.misses += 1
+                return None
+
+            similarity, payload = bucket.best_match(vector, time.time())
+            if payload is None or similarity < self.similarity_threshold:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return payload
+
+    def store(self, language: str, embedding: list[float], payload: dict):
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        with self._lock:
+            bucket = self._buckets.get(language)
+            # Embedding model changed (different dimension) — start over
+            if bucket is None or bucket.vectors.shape[1] != vector.shape[0]:
+                bucket = _LanguageBucket(self.max_entries, vector.shape[0])
+                self._buckets[language] = bucket
+            bucket.add(vector, payload, time.time() + self.ttl_seconds)
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        now = time.time()
+        with self._lock:
+            sizes = {lang: bucket.size(now) for lang, bucket in self._buckets.items()}
+        return {
+            "enabled":       self.enabled,
+            "entries":       sizes,
+            "hits":          self.hits,
+            "misses":        self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate":      round(self.hits / lookups, 4) if lookups else 0,
+        }
+
+    @staticmethod
+    def _normalize(embedding: list[float]) -> np.ndarray | None:
+        if not embedding:
+            return None
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return None
+        return vector / norm
+
+
+answer_cache = SemanticAnswerCache(
+    similarity_threshold=Config.ANSWER_CACHE_SIMILARITY,
+    max_entries=Config.ANSWER_CACHE_SIZE,
+    ttl_seconds=Config.ANSWER_CACHE_TTL_SECONDS,
+    enabled=Config.ANSWER_CACHE_ENABLED,
+)
+
+# New or changed chunks picked up by the local index invalidate stored answers
+knowledge_index.on_change(answer_cache.clear)
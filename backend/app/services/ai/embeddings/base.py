@@ -4,4 +4,12 @@ class BaseEmbeddingProvider(ABC):
     
     @abstractmethod    
     def embed(self, text: str) -> list[float]:
-        pass
\ No newline at end of file
+        pass
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embed many texts, returning vectors in the same order.
+        Default is one embed() call per text — providers override
+        this with real batching or concurrency.
+        """
+        return [self.embed(text) for text in texts]
\ No newline at end of file
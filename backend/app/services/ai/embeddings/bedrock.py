@@ -1,5 +1,6 @@
 import boto3
 import json
+from concurrent.futures import ThreadPoolExecutor
 from config import Config
 from .base import BaseEmbeddingProvider
 
@@ -28,4 +29,13 @@ class BrEmbeddingProvider(BaseEmbeddingProvider):
             response_body = json.loads(response["body"].read())
             return response_body["embedding"]
         except Exception as e:
-            raise ValueError(f"Bedrock embedding error: {e}")
\ No newline at end of file
+            raise ValueError(f"Bedrock embedding error: {e}")
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        # Titan embeddings take one input per call — run calls concurrently,
+        # bounded so bulk ingestion doesn't trip Bedrock throttling
+        if not texts:
+            return []
+        workers = min(Config.BEDROCK_EMBEDDING_CONCURRENCY, len(texts))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self.embed, texts))
\ No newline at end of file
@@ -0,0 +1,52 @@
+from config import Config
+from app.utils.ttl_cache import TTLCache
+from .base import BaseEmbeddingProvider
+
+# Shared by every cached provider in the process, so the retriever and any
+# other caller that embeds the same question reuse one entry
+embedding_cache = TTLCache(
+    max_size=Config.EMBEDDING_CACHE_SIZE,
+    ttl_seconds=Config.EMBEDDING_CACHE_TTL_SECONDS,
+)
+
+
+class CachedEmbeddingProvider(BaseEmbeddingProvider):
+    """
+    Caching wrapper around any embedding provider.
+
+    Repeated questions ("how do I start agritourism") skip the remote
+    embedding call entirely. Keys are normalized text — case and
+    whitespace differences map to the same entry.
+    """
+
+    def __init__(self, provider: BaseEmbeddingProvider, cache: TTLCache = None):
+        self.provider = provider
+        self.cache = cache or embedding_cache
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(text.split()).casefold()
+
+    def embed(self, text: str) -> list[float]:
+        key = self.normalize(text)
+        embedding = self.cache.get(key)
+        if embedding is not None:
+            return embedding
+
+        embedding = self.provider.embed(text)
+        if embedding:
+            self.cache.set(key, embedding)
+        return embedding
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        keys = [self.normalize(text) for text in texts]
+        embeddings = [self.cache.get(key) for key in keys]
+
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            fetched = self.provider.embed_batch([texts[i] for i in missing])
+            for i, embedding in zip(missing, fetched):
+                embeddings[i] = embedding
+                if embedding:
+                    self.cache.set(keys[i], embedding)
+        return embeddings
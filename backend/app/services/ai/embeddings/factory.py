@@ -1,19 +1,29 @@
 from config import Config
 from .base import BaseEmbeddingProvider
 from .bedrock import BrEmbeddingProvider
+from .cached import CachedEmbeddingProvider
 from .huggingface import HfEmbeddingProvider
 
-def get_embedding_provider() -> BaseEmbeddingProvider:
-    
+def get_embedding_provider(cached: bool = True) -> BaseEmbeddingProvider:
+    """
+    Returns the configured embedding provider.
+
+    By default it is wrapped in CachedEmbeddingProvider so repeated queries
+    skip the remote call. Pass cached=False for bulk jobs (scripts/ingest.py)
+    where every text is unique and would only churn the cache.
+    """
     provider = Config.EMBEDDING_PROVIDER.lower()
-    
+
     if provider == "huggingface":
-        return HfEmbeddingProvider()
+        instance = HfEmbeddingProvider()
     elif provider == "bedrock":
-        return BrEmbeddingProvider()
+        instance = BrEmbeddingProvider()
     else:
         raise ValueError(
             f"Unknown Embedding provider: '{provider}'. "
             f"Valid options: 'huggingface', 'bedrock'"
         )
-        
\ No newline at end of file
+
+    if cached and Config.EMBEDDING_CACHE_SIZE > 0:
+        return CachedEmbeddingProvider(instance)
+    return instance
@@ -10,14 +10,25 @@ class HfEmbeddingProvider(BaseEmbeddingProvider):
         self.api_url = f"https://router.huggingface.co/hf-inference/models/{self.model}/pipeline/feature-extraction"
         
     def embed(self, text: str) -> list[float]:
+        return self._post(text)
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        # feature-extraction accepts a list of inputs and returns one vector per input
+        if not texts:
+            return []
+        embeddings = self._post(texts)
+        if len(embeddings) != len(texts):
+            raise ValueError(f"HuggingFace API returned {len(embeddings)} embeddings for {len(texts)} inputs")
+        return embeddings
+
+    def _post(self, inputs):
         headers = {
             "Authorization": f"Bearer {self.api_key}"
         }
         payload = {
-            "inputs": text
+            "inputs": inputs
         }
         response = requests.post(self.api_url, headers=headers, json=payload)
         if response.status_code != 200:  
             raise ValueError(f"HuggingFace API error {response.status_code}: {response.text}")
-        embedding = response.json()
-        return embedding
\ No newline at end of file
+        return response.json()
\ No newline at end of file
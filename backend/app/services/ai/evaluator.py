@@ -1,20 +1,119 @@
 import json
+import queue
+import random
+import threading
 from app.services.ai.factory import get_ai_provider
 from app.services.ai.prompts.system_prompts import evaluation_judge_system_prompt
 from app.services.ai.prompts.user_prompts import evaluation_judge_prompt, evaluation_judge_prompt_no_context
-from app.core.supabase import supabase
+from app.utils.supabase_client import get_admin_db_client
+from app.utils.batch_writer import BatchWriter
+from config import Config
 
 class EvaluatorService:
     """
     LLM-as-judge RAG evaluation service.
 
-    Runs in background thread after each RAG interaction.
+    Runs on a small pool of worker threads fed by a bounded queue.
     Scores 5 dimensions with 0.0-1.0 numeric scores and reasoning.
     Never blocks the user response.
+
+    Load shedding (evaluation is best-effort):
+    - Queue more than half full → jobs are sampled at EVALUATOR_SAMPLE_RATE_UNDER_LOAD
+    - Queue full → jobs are dropped
+    Results are inserted into evaluation_results in batches.
     """
 
     def __init__(self):
         self.provider = get_ai_provider()
+        self.workers = Config.EVALUATOR_WORKERS
+        self.sample_rate_under_load = Config.EVALUATOR_SAMPLE_RATE_UNDER_LOAD
+        self._jobs = queue.Queue(maxsize=Config.EVALUATOR_QUEUE_SIZE)
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._results = BatchWriter(
+            "evaluation_results",
+            self._insert_results,
+            max_batch=Config.EVALUATOR_INSERT_BATCH_SIZE,
+            flush_interval=Config.EVALUATOR_FLUSH_SECONDS,
+        )
+        self.enqueued = 0
+        self.sampled_out = 0
+        self.dropped = 0
+        self.completed = 0
+        self.failed = 0
+
+    def submit(self, log_id: str, user_message: str, ai_response: str, retrieved_context: str = None) -> bool:
+        """
+        Queue an interaction for judging — RAG judge when there is context,
+        no-context judge otherwise. Returns False if the job was shed.
+        """
+        if not log_id:
+            return False
+        self._ensure_workers()
+
+        maxsize = self._jobs.maxsize
+        if maxsize and self._jobs.qsize() >= maxsize // 2 and random.random() >= self.sample_rate_under_load:
+            self.sampled_out += 1
+            return False
+
+        try:
+            self._jobs.put_nowait((log_id, user_message, ai_response, retrieved_context))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.enqueued += 1
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "workers":      self.workers,
+            "queue_depth":  self._jobs.qsize(),
+            "max_queue":    self._jobs.maxsize,
+            "enqueued":     self.enqueued,
+            "completed":    self.completed,
+            "failed":       self.failed,
+            "sampled_out":  self.sampled_out,
+            "dropped":      self.dropped,
+            "result_writer": self._results.stats(),
+        }
+
+    def _ensure_workers(self):
+        if self._threads:
+            return
+        with self._start_lock:
+            if not self._threads:
+                self._threads = [
+                    threading.Thread(target=self._work, name=f"evaluator-{i}", daemon=True)
+                    for i in range(self.workers)
+                ]
+                for thread in self._threads:
+                    thread.start()
+
+    def _work(self):
+        while True:
+            log_id, user_message, ai_response, retrieved_context = self._jobs.get()
+            try:
+                if retrieved_context:
+                    self.evaluate_async(log_id, user_message, ai_response, retrieved_context)
+                else:
+                    self.evaluate_no_context_async(log_id, user_message, ai_response)
+            except Exception as e:
+                # One bad job must not take its worker (and eventually the pool) down
+                self.failed += 1
+                print(f"[EVAL_ERROR] Evaluation for log {str(log_id)[:8]}... failed: {e}")
+            finally:
+                self.completed += 1
+
+    @staticmethod
+    def _insert_results(rows: list[dict]):
+        # Rows have different columns depending on the judge — PostgREST
+        # bulk inserts need a uniform shape, so insert each shape separately
+        by_shape = {}
+        for row in rows:
+            by_shape.setdefault(frozenset(row), []).append(row)
+        admin = get_admin_db_client()
+        for batch in by_shape.values():
+            admin.table("evaluation_results").insert(batch).execute()
 
     def _judge(self, question: str, context: str, response: str) -> dict | None:
         """
@@ -65,7 +164,7 @@ class EvaluatorService:
         retrieved_context: str,
     ):
         """
-        Evaluate a single RAG interaction and store enriched scores.
+        Evaluate a single RAG interaction and queue enriched scores for storage.
         Designed to run in background thread — never raises.
         """
         if not log_id or not retrieved_context:
@@ -91,7 +190,7 @@ class EvaluatorService:
             score_values = [s for s in [faithfulness, answer_relevance, context_precision, completeness, safety] if s is not None]
             avg_score = round(sum(score_values) / len(score_values), 4) if score_values else None
 
-            supabase.table("evaluation_results").insert({
+            self._results.submit({
                 "log_id":                    log_id,
                 "faithfulness":              faithfulness,
                 "answer_relevance":          answer_relevance,
@@ -104,7 +203,7 @@ class EvaluatorService:
                 "completeness_reason":       get_reason("completeness"),
                 "safety_reason":             get_reason("safety"),
                 "avg_score":                 avg_score,
-            }).execute()
+            })
 
         except Exception as e:
             print(f"[EVAL_ERROR] Failed to store evaluation for log {str(log_id)[:8]}...: {e}")
@@ -141,7 +240,7 @@ class EvaluatorService:
             score_values = [s for s in [answer_relevance, completeness, safety] if s is not None]
             avg_score = round(sum(score_values) / len(score_values), 4) if score_values else None
 
-            supabase.table("evaluation_results").insert({
+            self._results.submit({
                 "log_id":                   log_id,
                 "answer_relevance":         answer_relevance,
                 "completeness":             completeness,
@@ -150,7 +249,7 @@ class EvaluatorService:
                 "completeness_reason":      get_reason("completeness"),
                 "safety_reason":            get_reason("safety"),
                 "avg_score":                avg_score,
-            }).execute()
+            })
 
         except Exception as e:
             print(f"[EVAL_ERROR] Failed to store no-context evaluation for log {str(log_id)[:8]}...: {e}")
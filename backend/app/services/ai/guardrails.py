@@ -1,7 +1,40 @@
 from app.services.ai.factory import get_ai_provider
 from app.services.ai.prompts.system_prompts import guardrail_system_prompt
 from app.services.ai.prompts.user_prompts import guardrail_check_prompt
+from app.services.ai.topic_classifier import TopicClassifier
+from app.utils.ttl_cache import TTLCache
+from config import Config
+import hashlib
 import json
+import threading
+
+# LLM verdicts keyed on a hash of the normalized message, shared by the process
+verdict_cache = TTLCache(
+    max_size=Config.GUARDRAIL_VERDICT_CACHE_SIZE,
+    ttl_seconds=Config.GUARDRAIL_VERDICT_CACHE_TTL_SECONDS,
+)
+
+_counters = {
+    "checks":       0,  # messages that reached the topic/safety check
+    "fast_path":    0,  # greetings accepted without a model call
+    "cache_hits":   0,  # answered from a cached LLM verdict
+    "llm_calls":    0,
+    "llm_failures": 0,  # judge errored — message let through
+}
+_counters_lock = threading.Lock()
+
+
+def _count(name: str):
+    with _counters_lock:
+        _counters[name] += 1
+
+
+def guardrail_stats() -> dict:
+    with _counters_lock:
+        counters = dict(_counters)
+    counters["llm_calls_avoided"] = counters["fast_path"] + counters["cache_hits"]
+    counters["verdict_cache"] = verdict_cache.stats()
+    return counters
 
 
 class GuardrailsService:
@@ -9,6 +42,7 @@ class GuardrailsService:
 
     def __init__(self):
         self.provider = get_ai_provider()
+        self.classifier = TopicClassifier()
 
     def validate(self, message: str):
         """
@@ -17,8 +51,39 @@ class GuardrailsService:
         Checks:
         1. Not empty
         2. Not too long
-        3. LLM safety and topic classification
+        3. Local fast path — plain greetings skip the LLM
+        4. Cached LLM verdict for the same (normalized) message
+        5. LLM safety and topic classification
         
+        Raises ValueError with user-friendly message if any check fails.
+        """
+        self.validate_input(message)
+        _count("checks")
+
+        label = (
+            self.classifier.classify(message)
+            if Config.GUARDRAIL_FAST_PATH_ENABLED
+            else TopicClassifier.AMBIGUOUS
+        )
+        if label == TopicClassifier.GREETING:
+            _count("fast_path")
+            return
+
+        key = self._cache_key(message)
+        verdict = verdict_cache.get(key)
+        if verdict is not None:
+            _count("cache_hits")
+        else:
+            verdict = self._llm_check(message)
+            if verdict is None:
+                return
+            verdict_cache.set(key, verdict)
+
+        self._enforce(verdict)
+
+    def validate_input(self, message: str):
+        """
+        Cheap local checks only (empty, too long) — no model call.
         Raises ValueError with user-friendly message if any check fails.
         """
         if not message or not message.strip():
@@ -27,13 +92,18 @@ class GuardrailsService:
         if len(message) > self.MAX_MESSAGE_LENGTH:
             raise ValueError(f"Message too long. Maximum {self.MAX_MESSAGE_LENGTH} characters allowed")
 
-        self._llm_check(message)
+    @staticmethod
+    def _cache_key(message: str) -> str:
+        normalized = " ".join(message.split()).casefold()
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
 
-    def _llm_check(self, message: str):
+    def _llm_check(self, message: str) -> dict | None:
         """
         Use LLM to classify message safety and topic relevance.
-        Fails silently if LLM check itself errors — never blocks user on judge failure.
+        Returns {"is_safe", "is_on_topic"}, or None if the LLM check itself
+        errors — never blocks user on judge failure (and never caches it).
         """
+        _count("llm_calls")
         try:
             raw = self.provider.complete(
                 system_prompt=guardrail_system_prompt(),
@@ -42,19 +112,23 @@ class GuardrailsService:
                 max_tokens=150,
             )
             result = json.loads(raw)
+            return {
+                "is_safe":     bool(result.get("is_safe", True)),
+                "is_on_topic": bool(result.get("is_on_topic", True)),
+            }
+        except Exception:
+            _count("llm_failures")
+            return None
 
-            if not result.get("is_safe", True):
-                raise ValueError("Message contains unsafe content")
-
-            if not result.get("is_on_topic", True):
-                raise ValueError(
-                    "I'm specialized in agritourism and sustainable farming. "
-                    "I'm not able to help with that topic, but I'd be happy to "
-                    "answer any questions about starting farm experiences, carbon "
-                    "credits, or regenerative farming. What would you like to know?"
-                )
+    @staticmethod
+    def _enforce(verdict: dict):
+        if not verdict["is_safe"]:
+            raise ValueError("Message contains unsafe content")
 
-        except ValueError:
-            raise
-        except Exception:
-            pass
\ No newline at end of file
+        if not verdict["is_on_topic"]:
+            raise ValueError(
+                "I'm specialized in agritourism and sustainable farming. "
+                "I'm not able to help with that topic, but I'd be happy to "
+                "answer any questions about starting farm experiences, carbon "
+                "credits, or regenerative farming. What would you like to know?"
+            )
@@ -1,12 +1,63 @@
 import json
 from datetime import datetime, timezone
-from app.core.supabase import supabase
+from typing import Callable
+from app.utils.supabase_client import get_admin_db_client
 from app.services.plan_service import plan_service
+from app.utils.batch_writer import BatchWriter
+from config import Config
+
+
+def _insert_logs(rows: list[dict]) -> list:
+    response = get_admin_db_client().table("ai_interaction_logs").insert(rows).execute()
+    # PostgREST returns inserted rows in request order
+    return [item["id"] for item in response.data] if response.data else [None] * len(rows)
+
+
+def _flush_logs(entries: list[tuple[dict, Callable[[str], None] | None]]):
+    """
+    Bulk insert queued log rows, then run on_logged callbacks with the ids
+    Supabase assigned. If the bulk insert fails (one bad row fails the
+    whole request) fall back to one insert per row, so only the bad rows
+    are lost.
+    """
+    rows = [row for row, _ in entries]
+    try:
+        ids = _insert_logs(rows)
+    except Exception as e:
+        print(f"[AI_LOG_ERROR] Bulk insert of {len(rows)} logs failed, retrying one by one: {e}")
+        ids = []
+        for row in rows:
+            try:
+                ids.extend(_insert_logs([row]))
+            except Exception as row_error:
+                print(f"[AI_LOG_ERROR] Dropped log for session {row['session_id']}: {row_error}")
+                ids.append(None)
+
+    for (row, on_logged), log_id in zip(entries, ids):
+        if log_id and on_logged:
+            try:
+                on_logged(log_id)
+            except Exception as e:
+                print(f"[AI_LOG_ERROR] on_logged callback failed for log {str(log_id)[:8]}...: {e}")
+
+
+# One writer per process, shared by every InteractionLogger
+log_writer = BatchWriter(
+    "ai_interaction_logs",
+    _flush_logs,
+    max_batch=Config.AI_LOG_BATCH_SIZE,
+    flush_interval=Config.AI_LOG_FLUSH_SECONDS,
+    max_queue=Config.AI_LOG_QUEUE_SIZE,
+)
+
 
 class InteractionLogger:
     """
     Logs every AI chat interaction to Supabase.
     Structured for observability and RAG evaluation.
+
+    Records are queued and bulk-inserted by a background writer, so
+    logging adds no database round trip to the request.
     """
 
     def log(
@@ -23,31 +74,34 @@ class InteractionLogger:
         user_id: str = None,
         ai_type: str = "assistant",
         retrieval_scores: list[float] = None,
-    ) -> str | None:
-        try:
-            response = supabase.table("ai_interaction_logs").insert({
-                "session_id": session_id,
-                "user_message": user_message,
-                "ai_response": ai_response,
-                "language": language,
-                "latency_ms": latency_ms,
-                "source": source,
-                "rag_hit": rag_hit,
-                "response_length": response_length,
-                "retrieved_context": retrieved_context,
-                "retrieval_scores": retrieval_scores or [],
-                "user_id": user_id,
-            }).execute()
-            
-            log_id = response.data[0]["id"] if response.data else None
-            # Increment counter if user is known
-            if user_id:
-                plan_service.increment_ai_counter(user_id, ai_type)
-                
-            return log_id
+        on_logged: Callable[[str], None] = None,
+    ) -> bool:
+        """
+        Queue one interaction for logging. Returns False if it was dropped.
+        on_logged(log_id) runs on the writer thread once the row is stored.
+        """
+        row = {
+            "session_id": session_id,
+            "user_message": user_message,
+            "ai_response": ai_response,
+            "language": language,
+            "latency_ms": latency_ms,
+            "source": source,
+            "rag_hit": rag_hit,
+            "response_length": response_length,
+            "retrieved_context": retrieved_context,
+            "retrieval_scores": retrieval_scores or [],
+            "user_id": user_id,
+        }
+        # Usage is metered here, not after the insert — a lost log row must
+        # never mean an unbilled interaction
+        if user_id:
+            plan_service.increment_ai_counter(user_id, ai_type)
 
-        except Exception as e:
-            print(f"[AI_LOG_ERROR] Failed to log interaction: {e}")
+        queued = log_writer.submit((row, on_logged))
+        if not queued:
+            print(f"[AI_LOG_ERROR] Log queue full, dropped interaction for session {session_id}")
+        return queued
             
         # record = {
         #     "timestamp": datetime.now(timezone.utc).isoformat(),
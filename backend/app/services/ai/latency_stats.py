@@ -0,0 +1,91 @@
+import math
+import threading
+import numpy as np
+from config import Config
+
+# Log-spaced buckets: each is 5% wider than the last, so any reported
+# percentile is within ~2.5% of the true value. 1ms → 10min fits in ~275 buckets.
+_GROWTH = 1.05
+_MAX_MS = 600_000
+_BUCKETS = int(math.log(_MAX_MS) / math.log(_GROWTH)) + 2
+_UPPER_BOUNDS = np.array([_GROWTH ** (i + 1) for i in range(_BUCKETS)])
+
+
+class LatencyHistogram:
+    """
+    Fixed-memory streaming histogram (HDR-style, log buckets).
+
+    record() is O(1); quantile() walks ~275 counters. Nothing is ever
+    dropped or sampled, so p99 covers every recorded call since start.
+    """
+
+    def __init__(self):
+        self.counts = np.zeros(_BUCKETS, dtype=np.int64)
+        self.count = 0
+        self.total_ms = 0
+        self.max_ms = 0
+
+    def record(self, ms: float):
+        ms = max(float(ms), 0.0)
+        bucket = 0 if ms <= 1 else min(int(math.log(ms) / math.log(_GROWTH)), _BUCKETS - 1)
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q: float) -> int:
+        if not self.count:
+            return 0
+        rank = max(math.ceil(q * self.count), 1)
+        bucket = int(np.searchsorted(np.cumsum(self.counts), rank))
+        # Geometric middle of the bucket, never above the largest value actually seen
+        return int(round(min(_UPPER_BOUNDS[bucket] / math.sqrt(_GROWTH), self.max_ms)))
+
+    def summary(self) -> dict:
+        return {
+            "count":  self.count,
+            "avg_ms": int(self.total_ms / self.count) if self.count else 0,
+            "p50_ms": self.quantile(0.50),
+            "p90_ms": self.quantile(0.90),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": int(self.max_ms),
+        }
+
+
+class LatencyStats:
+    """
+    Per-stage latency histograms for AI calls, grouped two ways:
+    by provider (groq / bedrock) and by source (web / whatsapp / farm_advisor …).
+
+    Stages are whatever the caller times — the chat pipeline records
+    guardrail, embedding, retrieval, completion, first_token and total.
+    """
+
+    def __init__(self):
+        self._histograms: dict[tuple[str, str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, source: str, stage: str, ms: float, provider: str = None):
+        provider = (provider or Config.AI_PROVIDER).lower()
+        with self._lock:
+            for key in (("provider", provider, stage), ("source", source or "unknown", stage)):
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = LatencyHistogram()
+                histogram.record(ms)
+
+    def record_timings(self, source: str, timings: dict, provider: str = None):
+        """Record every "<stage>_ms" entry of a timings dict."""
+        for key, value in timings.items():
+            if key.endswith("_ms") and isinstance(value, (int, float)):
+                self.record(source, key[:-3], value, provider)
+
+    def snapshot(self) -> dict:
+        result = {"by_provider": {}, "by_source": {}}
+        with self._lock:
+            for (dimension, name, stage), histogram in self._histograms.items():
+                result[f"by_{dimension}"].setdefault(name, {})[stage] = histogram.summary()
+        return result
+
+
+latency_stats = LatencyStats()
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 
 class BaseAIProvider(ABC):
     """
@@ -53,4 +54,19 @@ class BaseAIProvider(ABC):
             {"role": "user", "content": "..."}
         ]
         """
-        pass
\ No newline at end of file
+        pass
+
+    def chat_stream(
+        self,
+        messages: list,
+        temperature: float = 0.4,
+        max_tokens: int = 1500
+    ) -> Iterator[str]:
+        """
+        Streaming multi-turn chat — yields text fragments as the model
+        generates them. Same messages format as chat().
+
+        Default implementation yields the whole chat() response at once,
+        so providers without a streaming API still work with streaming callers.
+        """
+        yield self.chat(messages, temperature=temperature, max_tokens=max_tokens)
\ No newline at end of file
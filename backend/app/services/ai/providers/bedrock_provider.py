@@ -1,4 +1,5 @@
 import json
+from collections.abc import Iterator
 import boto3
 from config import Config
 from .base import BaseAIProvider
@@ -66,6 +67,44 @@ class BedrockProvider(BaseAIProvider):
         temperature: float = 0.4,
         max_tokens: int = 1500
     ) -> str:
+        body = self._chat_body(messages, temperature, max_tokens)
+
+        response = self.client.invoke_model(
+            modelId=self.model,
+            body=json.dumps(body),
+            contentType="application/json",
+            accept="application/json",
+        )
+
+        response_body = json.loads(response["body"].read())
+        return response_body["output"]["message"]["content"][0]["text"]
+
+    def chat_stream(
+        self,
+        messages: list,
+        temperature: float = 0.4,
+        max_tokens: int = 1500
+    ) -> Iterator[str]:
+        body = self._chat_body(messages, temperature, max_tokens)
+
+        response = self.client.invoke_model_with_response_stream(
+            modelId=self.model,
+            body=json.dumps(body),
+            contentType="application/json",
+            accept="application/json",
+        )
+
+        # Event stream of chunks; Nova puts generated text in contentBlockDelta events
+        for event in response["body"]:
+            chunk = event.get("chunk")
+            if not chunk:
+                continue
+            payload = json.loads(chunk["bytes"])
+            text = payload.get("contentBlockDelta", {}).get("delta", {}).get("text")
+            if text:
+                yield text
+
+    def _chat_body(self, messages: list, temperature: float, max_tokens: int) -> dict:
         # Bedrock requires system messages separated from conversation
         # Extract system message from list, pass rest as conversation
         system_messages = [
@@ -79,21 +118,11 @@ class BedrockProvider(BaseAIProvider):
             if m["role"] != "system"
         ]
 
-        body = {
+        return {
             "messages": conversation,
             "system": system_messages,
             "inferenceConfig": {
                 "temperature": temperature,
                 "maxTokens": max_tokens,
             }
-        }
-
-        response = self.client.invoke_model(
-            modelId=self.model,
-            body=json.dumps(body),
-            contentType="application/json",
-            accept="application/json",
-        )
-
-        response_body = json.loads(response["body"].read())
-        return response_body["output"]["message"]["content"][0]["text"]
\ No newline at end of file
+        }
\ No newline at end of file
@@ -1,3 +1,4 @@
+from collections.abc import Iterator
 from groq import Groq
 from config import Config
 from .base import BaseAIProvider
@@ -44,4 +45,24 @@ class GroqProvider(BaseAIProvider):
             temperature=temperature,
             max_tokens=max_tokens,
         )
-        return response.choices[0].message.content
\ No newline at end of file
+        return response.choices[0].message.content
+
+    def chat_stream(
+        self,
+        messages: list,
+        temperature: float = 0.4,
+        max_tokens: int = 1500
+    ) -> Iterator[str]:
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+        )
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            token = chunk.choices[0].delta.content
+            if token:
+                yield token
\ No newline at end of file
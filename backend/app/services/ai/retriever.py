@@ -1,27 +1,55 @@
+import time
 from app.core.supabase import supabase
 from app.services.ai.embeddings.factory import get_embedding_provider
+from app.services.ai.vector_index import knowledge_index
+from config import Config
 
 class ContextRetriever:
+    """
+    Retrieves knowledge base chunks relevant to a query.
+
+    Two engines, picked by Config.RETRIEVAL_MODE:
+    - "rpc":   Supabase match_chunks RPC per query
+    - "local": in-process vector index (see vector_index.py), loaded at startup.
+               Falls back to the RPC while the index is not loaded yet.
+    """
     SIMILARITY_THRESHOLD = 0.5
     
     def __init__(self):
         self.provider = get_embedding_provider()
+        self.mode = Config.RETRIEVAL_MODE.lower()
+        self.index = knowledge_index if self.mode == "local" else None
+        if self.index and not self.index.is_ready:
+            self.index.refresh_async()
     
-    def retrieve(self, query: str, top_k: int = 3) -> list[dict]:
+    def retrieve(self, query: str, top_k: int = 3, timings: dict = None) -> list[dict]:
+        """
+        Returns chunks above SIMILARITY_THRESHOLD as {content, similarity}.
+        If a timings dict is passed, embedding_ms and search_ms are added to it.
+        """
+        start = time.time()
         query_embedding = self.provider.embed(query)
+        embedded = time.time()
+        if timings is not None:
+            timings["embedding_ms"] = timings.get("embedding_ms", 0) + int((embedded - start) * 1000)
         if not query_embedding:
             return []
         
-        result = supabase.rpc("match_chunks", {
-            "query_embedding": query_embedding,
-            "match_count": top_k
-        }).execute()
+        if self.index and self.index.is_ready:
+            rows = self.index.search(query_embedding, top_k)
+        else:
+            rows = self._match_chunks_rpc(query_embedding, top_k)
+        if timings is not None:
+            timings["search_ms"] = int((time.time() - embedded) * 1000)
+
+        if self.index:
+            self.index.maybe_refresh()
         
-        if not result.data:
+        if not rows:
             return []
 
         filtered = [
-            row for row in result.data
+            row for row in rows
             if row.get("similarity", 1.0) >= self.SIMILARITY_THRESHOLD
         ]
 
@@ -30,6 +58,13 @@ class ContextRetriever:
             for row in filtered
         ]
 
+    def _match_chunks_rpc(self, query_embedding: list[float], top_k: int) -> list[dict]:
+        result = supabase.rpc("match_chunks", {
+            "query_embedding": query_embedding,
+            "match_count": top_k
+        }).execute()
+        return result.data or []
+
 # RUN: python -m services.ai.retriever 
 # if __name__ == "__main__":
 #     context_retriever = ContextRetriever()
@@ -0,0 +1,168 @@
+import json
+import threading
+import time
+import numpy as np
+from app.utils.supabase_client import get_admin_db_client
+from config import Config
+
+
+class LocalVectorIndex:
+    """
+    In-process cosine similarity index over knowledge_chunks.
+
+    Every chunk embedding is loaded once into a single contiguous float32
+    matrix with L2-normalized rows, so a query is one matrix-vector product
+    instead of a match_chunks RPC round trip.
+
+    Refreshing builds a new matrix off to the side and swaps it in with a
+    single assignment — searches never see a half-built index.
+    """
+
+    PAGE_SIZE = 1000
+    RETRY_SECONDS = 30
+
+    def __init__(self, refresh_interval: int = 0):
+        self.refresh_interval = refresh_interval
+        self._snapshot = (np.zeros((0, 0), dtype=np.float32), [])
+        self._loaded_at = None
+        self._last_attempt = 0.0
+        self._refresh_lock = threading.Lock()
+        self._async_pending = threading.Lock()  # held from refresh_async() until its thread ends
+        self._listeners = []
+
+    @property
+    def is_ready(self) -> bool:
+        return self._loaded_at is not None
+
+    @property
+    def size(self) -> int:
+        return len(self._snapshot[1])
+
+    def on_change(self, callback):
+        """Register a callback run after a refresh that changed the indexed chunks."""
+        self._listeners.append(callback)
+
+    def refresh(self) -> int:
+        """
+        Reload all chunks from Supabase and swap in the new matrix.
+        Returns the number of chunks now indexed.
+        """
+        with self._refresh_lock:
+            contents = []
+            vectors = []
+            for row in self._fetch_all():
+                embedding = row.get("embedding")
+                if not embedding:
+                    continue
+                # PostgREST returns pgvector columns as "[0.1,0.2,...]" strings
+                if isinstance(embedding, str):
+                    embedding = json.loads(embedding)
+                contents.append(row["content"])
+                vectors.append(embedding)
+
+            if vectors:
+                matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                matrix /= norms
+            else:
+                matrix = np.zeros((0, 0), dtype=np.float32)
+
+            changed = self.is_ready and contents != self._snapshot[1]
+            self._snapshot = (matrix, contents)
+            self._loaded_at = time.time()
+
+        if changed:
+            for callback in self._listeners:
+                callback()
+
+        print(f"[VECTOR_INDEX] Loaded {len(contents)} chunks")
+        return len(contents)
+
+    def refresh_async(self):
+        """
+        Refresh in a background thread — never blocks the caller. At most
+        one background refresh at a time; concurrent callers are no-ops.
+        """
+        if not self._async_pending.acquire(blocking=False):
+            return
+        if self._refresh_lock.locked():
+            # A refresh is already running on another thread
+            self._async_pending.release()
+            return
+        # Stamped before the thread starts, so maybe_refresh() throttles at once
+        self._last_attempt = time.time()
+        try:
+            threading.Thread(target=self._safe_refresh, daemon=True).start()
+        except Exception:
+            self._async_pending.release()
+            raise
+
+    def maybe_refresh(self):
+        """
+        Kick off a background refresh if the index is older than refresh_interval,
+        or retry the initial load if it failed.
+        """
+        now = time.time()
+        if not self.is_ready:
+            if now - self._last_attempt >= self.RETRY_SECONDS:
+                self.refresh_async()
+            return
+        if self.refresh_interval and now - self._loaded_at >= self.refresh_interval:
+            self.refresh_async()
+
+    def search(self, query_embedding: list[float], top_k: int = 3) -> list[dict]:
+        """
+        Top-k cosine search. Returns rows shaped like match_chunks output:
+        [{"content": str, "similarity": float}, ...] ordered best first.
+        """
+        matrix, contents = self._snapshot
+        if not contents:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if query.shape[0] != matrix.shape[1]:
+            print(f"[VECTOR_INDEX] Query dimension {query.shape[0]} != index dimension {matrix.shape[1]}")
+            return []
+
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+
+        scores = matrix @ (query / norm)
+        k = min(top_k, len(contents))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            {"content": contents[i], "similarity": float(scores[i])}
+            for i in top
+        ]
+
+    def _fetch_all(self):
+        admin = get_admin_db_client()
+        start = 0
+        while True:
+            result = (
+                admin.table("knowledge_chunks")
+                .select("id, content, embedding")
+                .order("id")
+                .range(start, start + self.PAGE_SIZE - 1)
+                .execute()
+            )
+            rows = result.data or []
+            yield from rows
+            if len(rows) < self.PAGE_SIZE:
+                return
+            start += self.PAGE_SIZE
+
+    def _safe_refresh(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"[VECTOR_INDEX_ERROR] Failed to load knowledge_chunks: {e}")
+        finally:
+            self._async_pending.release()
+
+
+knowledge_index = LocalVectorIndex(refresh_interval=Config.LOCAL_INDEX_REFRESH_SECONDS)
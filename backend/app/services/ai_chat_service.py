@@ -1,11 +1,15 @@
+import json
 import time
-import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from app.services.ai.factory import get_ai_provider
 from app.services.ai.prompts.system_prompts import ai_assistant_system_prompt
 from app.services.ai.guardrails import GuardrailsService
 from app.services.ai.interaction_loger import InteractionLogger
 from app.services.ai.retriever import ContextRetriever
 from app.services.ai.evaluator import evaluator_service
+from app.services.ai.answer_cache import answer_cache
+from app.services.ai.latency_stats import latency_stats
 from config import Config
 from dataclasses import dataclass, field
 
@@ -18,6 +22,25 @@ class ChatRequest:
     source: str = "web"
     user_id: str = None
     ai_type: str = "assistant"
+
+@dataclass
+class _PreparedChat:
+    """State carried from the pre-model steps to logging/evaluation."""
+    request_start: float
+    messages: list = field(default_factory=list)
+    rag_hit: bool = False
+    retrieved_context: str = None
+    similarities: list = field(default_factory=list)
+    cache_embedding: list = None
+    cached_response: str = None
+    timings: dict = field(default_factory=dict)
+
+# Shared by all chat requests in the process — bounds how many
+# retrievals run alongside guardrail checks at any one time
+_pipeline_executor = ThreadPoolExecutor(
+    max_workers=Config.CHAT_PIPELINE_WORKERS,
+    thread_name_prefix="chat-pipeline",
+)
     
 class AIChatService:
     """
@@ -40,22 +63,28 @@ class AIChatService:
         self.guardrails = GuardrailsService()
         self.logger = InteractionLogger()
         self.retriever = ContextRetriever()
+        self.answer_cache = answer_cache
     
     def chat(self, request: ChatRequest) -> str:
         """
         Process a user message through the AI assistant with RAG context and multi-turn history.
 
         Steps performed:
-        1. Validate input using guardrails.
-        2. Retrieve relevant context from knowledge base (RAG).
-        3. Build structured messages including:
+        1. Cheap input checks (empty, too long).
+        2. First-turn messages only: serve a semantically cached answer if a
+           near-identical question was answered recently.
+        3. Validate input using guardrails and, concurrently, retrieve relevant
+           context from knowledge base (RAG). Retrieval is discarded if the
+           guardrail rejects the message.
+        4. Build structured messages including:
         - System prompt
         - RAG context (if any)
         - Last N turns of conversation history
         - Current user message
-        4. Call AI model with structured messages.
-        5. Measure latency and log interaction details.
-        6. Return model-generated response as plain text.
+        5. Call AI model with structured messages.
+        6. Validate the response, record per-stage timings.
+        7. Queue the interaction log; evaluation is queued once it is stored.
+        8. Cache first-turn answers, return the response as plain text.
 
         Args:
             message (str): The user's current message.
@@ -71,29 +100,160 @@ class AIChatService:
             ValueError: If the model returns an empty response.
             Exception: If guardrails or AI provider fail.
         """
-        # 1. Guardrails check, before anything reaches the model
-        self.guardrails.validate(request.message)
-        
-        # 2. Build structured messages list
-        messages, rag_hit, retrieved_context, similarities = self._build_messages(request.history, request.message, request.language)
+        prepared = self._prepare(request)
+        if prepared.cached_response is not None:
+            return prepared.cached_response
         
-        # 3. Call model and measure latency
+        # 5. Call model and measure latency
         start = time.time()
         response = self.provider.chat(
-            messages=messages,
+            messages=prepared.messages,
             temperature=self.temperature,
             max_tokens=1000,
         )
         latency_ms = int((time.time() - start) * 1000)
+
+        return self._finish(request, prepared, response, latency_ms)
+
+    def chat_stream(self, request: ChatRequest) -> Iterator[str]:
+        """
+        Streaming variant of chat() — yields response tokens as the model produces them.
+
+        Input checks, guardrails and retrieval run eagerly, so a rejected
+        message raises ValueError here, before the caller starts streaming.
+        Logging, answer caching and evaluation run on the fully assembled
+        text once the stream finishes.
+        """
+        prepared = self._prepare(request)
+        return self._stream(request, prepared)
+
+    def _stream(self, request: ChatRequest, prepared: _PreparedChat) -> Iterator[str]:
+        if prepared.cached_response is not None:
+            yield prepared.cached_response
+            return
+
+        start = time.time()
+        parts = []
+        for token in self.provider.chat_stream(
+            messages=prepared.messages,
+            temperature=self.temperature,
+            max_tokens=1000,
+        ):
+            if not parts:
+                prepared.timings["first_token_ms"] = int((time.time() - prepared.request_start) * 1000)
+            parts.append(token)
+            yield token
+        latency_ms = int((time.time() - start) * 1000)
+
+        self._finish(request, prepared, "".join(parts), latency_ms)
+
+    def _prepare(self, request: ChatRequest) -> _PreparedChat:
+        """
+        Everything that happens before the model call (steps 1-4).
+        Returns a cached answer instead of messages on an answer cache hit.
+        """
+        prepared = _PreparedChat(request_start=time.time())
+
+        # 1. Cheap input checks, before anything else
+        self.guardrails.validate_input(request.message)
+
+        # 2. Semantic answer cache — skips guardrail, RAG and model calls entirely
+        if self.answer_cache.enabled and not request.history:
+            embed_start = time.time()
+            prepared.cache_embedding = self._embed_for_cache(request.message)
+            prepared.timings["embedding_ms"] = int((time.time() - embed_start) * 1000)
+            cached = self.answer_cache.lookup(request.language, prepared.cache_embedding) if prepared.cache_embedding else None
+            if cached:
+                self._log_interaction(
+                    request,
+                    cached["response"],
+                    latency_ms=int((time.time() - prepared.request_start) * 1000),
+                    rag_hit=cached["rag_hit"],
+                    retrieved_context=cached["retrieved_context"],
+                    similarities=cached["similarities"],
+                )
+                self._record_timings(request, {
+                    **prepared.timings,
+                    "answer_cache_hit": True,
+                    "total_ms": int((time.time() - prepared.request_start) * 1000),
+                })
+                prepared.cached_response = cached["response"]
+                return prepared
+
+        # 3. Guardrails check and RAG retrieval, concurrently.
+        #    Retrieval runs on the pipeline executor while the guardrail
+        #    LLM call runs here; nothing reaches the chat model until both finish.
+        timings = prepared.timings
+        retrieval_future = _pipeline_executor.submit(self._timed, self._retrieve, request.message, timings)
+
+        guardrail_start = time.time()
+        try:
+            self.guardrails.validate(request.message)
+        except ValueError:
+            # Rejected — drop the retrieval (cancelled if it hasn't started yet)
+            retrieval_future.cancel()
+            raise
+        finally:
+            timings["guardrail_ms"] = int((time.time() - guardrail_start) * 1000)
+
+        (prepared.rag_hit, prepared.retrieved_context, prepared.similarities), timings["retrieval_ms"] = retrieval_future.result()
+        
+        # 4. Build structured messages list
+        prepared.messages = self._build_messages(request.history, request.message, request.language, prepared.retrieved_context)
+        return prepared
+
+    def _finish(self, request: ChatRequest, prepared: _PreparedChat, response: str, latency_ms: int) -> str:
+        """Steps after the model call: validate, log, cache, evaluate."""
+        timings = prepared.timings
+        timings["completion_ms"] = latency_ms
+        timings["total_ms"] = int((time.time() - prepared.request_start) * 1000)
+        self._record_timings(request, timings)
         
-        # 4. Validate response exists
+        # 6. Validate response exists
         if not response or not response.strip():
             raise ValueError("Model returned empty response")
         
         result = response.strip()
+        rag_hit = prepared.rag_hit
+        retrieved_context = prepared.retrieved_context
         
-        # 5. Log interaction
-        log_id = self.logger.log(
+        # 7. Log interaction — queued; once the row is stored its id goes
+        #    to the evaluator pool for judging (may be shed under load)
+        def evaluate(log_id: str):
+            evaluator_service.submit(log_id, request.message, result, retrieved_context if rag_hit else None)
+
+        self._log_interaction(
+            request,
+            result,
+            latency_ms=latency_ms,
+            rag_hit=rag_hit,
+            retrieved_context=retrieved_context,
+            similarities=prepared.similarities,
+            on_logged=evaluate,
+        )
+
+        # 8. Remember first-turn answers for near-identical future questions
+        if prepared.cache_embedding:
+            self.answer_cache.store(request.language, prepared.cache_embedding, {
+                "response": result,
+                "rag_hit": rag_hit,
+                "retrieved_context": retrieved_context,
+                "similarities": prepared.similarities,
+            })
+        
+        return result
+    
+    def _log_interaction(
+        self,
+        request: ChatRequest,
+        result: str,
+        latency_ms: int,
+        rag_hit: bool,
+        retrieved_context: str | None,
+        similarities: list[float],
+        on_logged=None,
+    ) -> bool:
+        return self.logger.log(
             session_id=request.session_id,
             user_message=request.message,
             ai_response=result,
@@ -106,25 +266,47 @@ class AIChatService:
             retrieval_scores=similarities,
             user_id=request.user_id,
             ai_type=request.ai_type,
+            on_logged=on_logged,
         )
-        
-        if log_id:
-            if rag_hit and retrieved_context:
-                threading.Thread(
-                    target=evaluator_service.evaluate_async,
-                    args=(log_id, request.message, result, retrieved_context),
-                    daemon=True
-                ).start()
-            else:
-                threading.Thread(
-                    target=evaluator_service.evaluate_no_context_async,
-                    args=(log_id, request.message, result),
-                    daemon=True
-                ).start()
-        
-        return result
-    
-    def _build_messages(self, history: list, new_message: str, language: str) -> tuple[list, bool, str | None]:
+
+    def _embed_for_cache(self, message: str) -> list[float] | None:
+        """
+        Embed the message for the answer cache lookup.
+        Uses the retriever's (cached) provider, so RAG reuses this embedding.
+        Never raises — a failed lookup just means a cache miss.
+        """
+        try:
+            return self.retriever.provider.embed(message)
+        except Exception as e:
+            print(f"[ANSWER_CACHE_ERROR] Embedding failed: {e}")
+            return None
+
+    def _retrieve(self, message: str, timings: dict = None) -> tuple[bool, str | None, list[float]]:
+        """
+        RAG retrieval point.
+        Returns (rag_hit, joined context or None, similarity scores).
+        Adds embedding_ms / search_ms to timings when given.
+        """
+        retrieved = self.retriever.retrieve(message, timings=timings)
+        if not retrieved:
+            return False, None, []
+
+        context = "\n\n".join([r["content"] for r in retrieved])
+        similarities = [r["similarity"] for r in retrieved]
+        return True, context, similarities
+
+    @staticmethod
+    def _timed(fn, *args):
+        """Run fn(*args) and return (result, elapsed_ms)."""
+        start = time.time()
+        result = fn(*args)
+        return result, int((time.time() - start) * 1000)
+
+    def _record_timings(self, request: ChatRequest, timings: dict):
+        latency_stats.record_timings(request.source, timings)
+        print(f"[AI_TIMING] {json.dumps({'session_id': request.session_id, 'source': request.source, **timings})}")
+
+    def _build_messages(self, history: list, new_message: str, language: str, context: str | None) -> list:
         """
         Build structured messages list for AI provider.
         """
@@ -136,14 +318,8 @@ class AIChatService:
             "content": ai_assistant_system_prompt(language)
         })
         
-        # RAG retrieval point 
-        retrieved_context = self.retriever.retrieve(new_message)
-        rag_hit = bool(retrieved_context)
-        context = "\n\n".join([r["content"] for r in retrieved_context]) if retrieved_context else None
-        similarities = [r["similarity"] for r in retrieved_context] if retrieved_context else []
-        
         # RAG injection point 
-        if retrieved_context:
+        if context:
             messages.append({
                 "role": "system",
                 "content": f"Relevant context from knowledge base:\n\n{context}"
@@ -162,6 +338,6 @@ class AIChatService:
             "content": new_message
         })
 
-        return messages, rag_hit, context if rag_hit else None, similarities
+        return messages
     
 chat_service = AIChatService()
\ No newline at end of file
@@ -0,0 +1,73 @@
+from flask import g
+from app.services.farmer_service import farmer_service
+
+_MISSING = object()
+
+
+class FarmRequestLoader:
+    """
+    Request-scoped memo for farm/farmer lookups.
+
+    One instance lives on flask.g per request (see get_farm_loader), so a
+    route that checks ownership, reads the farm and reads the farmer
+    profile hits the database once instead of four times:
+
+    - owned_farm() loads farm + farmer together with one joined query
+    - farm() / farmer() / verify_ownership() reuse whatever was loaded
+    - results, including "not found", are remembered for the request
+
+    Returned dicts are shared within the request — copy before mutating.
+    """
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self._farms = {}        # farm_id → farm | None
+        self._owned = {}        # farm_id → bool
+        self._farmer = _MISSING
+
+    def owned_farm(self, farm_id: str) -> dict | None:
+        """The farm if it belongs to the current user, else None."""
+        if farm_id not in self._owned:
+            result = farmer_service.get_owned_farm(farm_id, self.user_id)
+            self._owned[farm_id] = result is not None
+            if result:
+                farm, farmer = result
+                self._farms[farm_id] = farm
+                self._farmer = farmer
+        return self._farms.get(farm_id) if self._owned[farm_id] else None
+
+    def verify_ownership(self, farm_id: str) -> bool:
+        return self.owned_farm(farm_id) is not None
+
+    def farm(self, farm_id: str) -> dict | None:
+        """The farm by id, owned or not."""
+        if farm_id not in self._farms:
+            # Usually the user's own farm — the joined query also loads the farmer
+            if self.owned_farm(farm_id) is None:
+                self._farms[farm_id] = farmer_service.get_farm_by_id(farm_id)
+        return self._farms[farm_id]
+
+    def default_farm_id(self, farm_id: str = None) -> str | None:
+        """
+        For routes with no farm in the path: `farm_id` if the user owns it,
+        or with no farm_id the user's first farm. None if neither applies.
+        """
+        if farm_id:
+            return farm_id if self.verify_ownership(farm_id) else None
+        farms = farmer_service.get_farms_for_user(self.user_id)
+        return farms[0]["id"] if farms else None
+
+    def farmer(self) -> dict | None:
+        """The current user's farmer profile."""
+        if self._farmer is _MISSING:
+            self._farmer = farmer_service.get_farmer_for_user(self.user_id)
+        return self._farmer
+
+
+def get_farm_loader() -> FarmRequestLoader:
+    """Returns the loader for the current request, creating it on first use."""
+    loader = getattr(g, "_farm_loader", None)
+    if loader is None or loader.user_id != g.user_id:
+        loader = FarmRequestLoader(g.user_id)
+        g._farm_loader = loader
+    return loader
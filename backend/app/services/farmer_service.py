@@ -1,12 +1,41 @@
-from app.utils.supabase_client import get_admin_supabase_client
+from app.utils.supabase_client import get_admin_db_client
+from app.utils.ttl_cache import TTLCache
+from config import Config
 
 class FarmerService:
+    """
+    Farm and farmer records, with a read-through cache.
+
+    Rows change rarely and only through this service, so reads are served
+    from bounded TTL caches and every write invalidates what it touched:
+      - farms:      farm_id   → farm row
+      - farmers:    user_id   → farmer row
+      - farm_lists: farmer_id → that farmer's farms
+    Ownership is derived from cached rows (farm.farmer_id == farmer.id).
+    Callers get copies, so mutating a result never changes the cache.
+    """
+
+    def __init__(self):
+        self._farms = TTLCache(max_size=Config.FARM_CACHE_SIZE, ttl_seconds=Config.FARM_CACHE_TTL_SECONDS)
+        self._farmers = TTLCache(max_size=Config.FARM_CACHE_SIZE, ttl_seconds=Config.FARM_CACHE_TTL_SECONDS)
+        self._farm_lists = TTLCache(max_size=Config.FARM_CACHE_SIZE, ttl_seconds=Config.FARM_CACHE_TTL_SECONDS)
+
+    def cache_stats(self) -> dict:
+        return {
+            "farms":      self._farms.stats(),
+            "farmers":    self._farmers.stats(),
+            "farm_lists": self._farm_lists.stats(),
+        }
 
     def _get_or_create_farmer(self, admin, user_id: str) -> str:
         """
         Internal helper: get existing farmer for user or create one.
         Returns farmer_id. Uses actual user name from profiles table.
         """
+        cached = self._farmers.get(user_id)
+        if cached:
+            return cached["id"]
+
         farmer_res = (
             admin.table("farmers")
             .select("id")
@@ -31,6 +60,7 @@ class FarmerService:
             .insert({"user_id": user_id, "name": full_name or "Farmer"})
             .execute()
         )
+        self._farmers.set(user_id, new_farmer.data[0])
         return new_farmer.data[0]["id"]
         
     def create_farm(self, user_id: str, name: str, farm_type: str, size_category: str = "medium", 
@@ -43,7 +73,7 @@ class FarmerService:
         Called when user clicks 'Create Farm' button.
         A user can call this as many times as they want.
         """
-        admin = get_admin_supabase_client()
+        admin = get_admin_db_client()
         farmer_id = self._get_or_create_farmer(admin, user_id)
 
         new_farm = (
@@ -66,121 +96,144 @@ class FarmerService:
             })
             .execute()
         )
-        return new_farm.data[0]
+        farm = new_farm.data[0]
+        self._farms.set(farm["id"], farm)
+        self._farm_lists.pop(farmer_id)
+        return dict(farm)
 
     def get_farms_for_user(self, user_id: str) -> list:
         """
         Returns all farms belonging to this user, ordered by creation date.
         """
-        admin = get_admin_supabase_client()
-
-        farmer_res = (
-            admin.table("farmers")
-            .select("id")
-            .eq("user_id", user_id)
-            .limit(1)
-            .execute()
-        )
-        if not farmer_res.data:
+        farmer = self.get_farmer_for_user(user_id)
+        if not farmer:
             return []
 
-        farmer_id = farmer_res.data[0]["id"]
-
-        farms = (
-            admin.table("farms")
-            .select("*")
-            .eq("farmer_id", farmer_id)
-            .order("created_at", desc=False)
-            .execute()
-        )
-        return farms.data or []
+        farmer_id = farmer["id"]
+        farms = self._farm_lists.get(farmer_id)
+        if farms is None:
+            admin = get_admin_db_client()
+            res = (
+                admin.table("farms")
+                .select("*")
+                .eq("farmer_id", farmer_id)
+                .order("created_at", desc=False)
+                .execute()
+            )
+            farms = res.data or []
+            self._farm_lists.set(farmer_id, farms)
+            for farm in farms:
+                self._farms.set(farm["id"], farm)
+        return [dict(farm) for farm in farms]
 
     def get_farm_by_id(self, farm_id: str) -> dict | None:
         """Returns a single farm by id."""
-        admin = get_admin_supabase_client()
-        res = (
-            admin.table("farms")
-            .select("*")
-            .eq("id", farm_id)
-            .single()
-            .execute()
-        )
-        return res.data if res.data else None
+        farm = self._farms.get(farm_id)
+        if farm is None:
+            admin = get_admin_db_client()
+            # limit(1), not single(): single() raises when no row matches
+            res = (
+                admin.table("farms")
+                .select("*")
+                .eq("id", farm_id)
+                .limit(1)
+                .execute()
+            )
+            if not res.data:
+                return None
+            farm = res.data[0]
+            self._farms.set(farm_id, farm)
+        return dict(farm)
     
     def update_farm(self, farm_id: str, data: dict) -> dict | None:
         """Updates farm details. Only updates fields that are provided."""
-        admin = get_admin_supabase_client()
+        admin = get_admin_db_client()
+        self._farms.pop(farm_id)
         res = (
             admin.table("farms")
             .update(data)
             .eq("id", farm_id)
             .execute()
         )
-        return res.data[0] if res.data else None
+        if not res.data:
+            return None
+        farm = res.data[0]
+        self._farms.set(farm_id, farm)
+        self._farm_lists.pop(farm.get("farmer_id"))
+        return dict(farm)
 
     def get_farmer_for_user(self, user_id: str) -> dict | None:
         """Returns farmer record for this user."""
-        admin = get_admin_supabase_client()
-        res = (
-            admin.table("farmers")
-            .select("*")
-            .eq("user_id", user_id)
-            .limit(1)
-            .execute()
-        )
-        return res.data[0] if res.data else None
+        farmer = self._farmers.get(user_id)
+        if farmer is None:
+            admin = get_admin_db_client()
+            res = (
+                admin.table("farmers")
+                .select("*")
+                .eq("user_id", user_id)
+                .limit(1)
+                .execute()
+            )
+            if not res.data:
+                return None
+            farmer = res.data[0]
+            self._farmers.set(user_id, farmer)
+        return dict(farmer)
     
     def update_farmer_profile(self, user_id: str, data: dict) -> dict | None:
         """Updates farmer profile fields like budget, goals, timeline etc."""
-        admin = get_admin_supabase_client()
-        
-        farmer_res = (
-            admin.table("farmers")
-            .select("id")
-            .eq("user_id", user_id)
-            .limit(1)
-            .execute()
-        )
-        if not farmer_res.data:
+        farmer = self.get_farmer_for_user(user_id)
+        if not farmer:
             return None
 
-        farmer_id = farmer_res.data[0]["id"]
+        admin = get_admin_db_client()
+        self._farmers.pop(user_id)
         res = (
             admin.table("farmers")
             .update(data)
-            .eq("id", farmer_id)
+            .eq("id", farmer["id"])
             .execute()
         )
-        return res.data[0] if res.data else None
+        if not res.data:
+            return None
+        self._farmers.set(user_id, res.data[0])
+        return dict(res.data[0])
 
-    def verify_farm_ownership(self, farm_id: str, user_id: str) -> bool:
+    def get_owned_farm(self, farm_id: str, user_id: str) -> tuple[dict, dict] | None:
         """
-        Security check: confirms this farm belongs to this user.
-        Call this before any write operation on a specific farm.
+        Ownership check and fetch in one joined query — or none at all
+        when both rows are cached.
+        Returns (farm, farmer) if this farm belongs to this user, else None.
         """
-        admin = get_admin_supabase_client()
-
-        farmer_res = (
-            admin.table("farmers")
-            .select("id")
-            .eq("user_id", user_id)
-            .limit(1)
-            .execute()
-        )
-        if not farmer_res.data:
-            return False
-
-        farmer_id = farmer_res.data[0]["id"]
+        farm = self._farms.get(farm_id)
+        farmer = self._farmers.get(user_id)
+        if farm is not None and farmer is not None and farm.get("farmer_id") == farmer["id"]:
+            return dict(farm), dict(farmer)
 
-        farm_res = (
+        admin = get_admin_db_client()
+        res = (
             admin.table("farms")
-            .select("id")
+            .select("*, farmers!inner(*)")
             .eq("id", farm_id)
-            .eq("farmer_id", farmer_id)
+            .eq("farmers.user_id", user_id)
             .limit(1)
             .execute()
         )
-        return bool(farm_res.data)
+        if not res.data:
+            return None
+
+        farm = dict(res.data[0])
+        farmer = farm.pop("farmers")
+        self._farms.set(farm_id, farm)
+        self._farmers.set(user_id, farmer)
+        return dict(farm), dict(farmer)
+
+    def verify_farm_ownership(self, farm_id: str, user_id: str) -> bool:
+        """
+        Security check: confirms this farm belongs to this user.
+        Call this before any write operation on a specific farm.
+        """
+        return self.get_owned_farm(farm_id, user_id) is not None
 
 
 farmer_service = FarmerService()
\ No newline at end of file
@@ -1,6 +1,26 @@
 from app.core.supabase import supabase
+from app.services.usage_meter import usage_meter
+from app.utils.ttl_cache import TTLCache
+from config import Config
 
 class PlanService:
+    """
+    Plan and usage lookups for user_plans.
+
+    Rows are cached per user for PLAN_CACHE_TTL_SECONDS and unflushed
+    increments are overlaid on every read. Every delta is counted exactly
+    once: a row is cached only if no flush was in flight while it was
+    read (usage_meter.generation()), and a flush drops the rows it
+    touches in the same step that removes its batch from pending(), so
+    the next read fetches the new totals. Reads never wait on a flush.
+    """
+
+    def __init__(self):
+        self._cache = TTLCache(
+            max_size=Config.PLAN_CACHE_SIZE,
+            ttl_seconds=Config.PLAN_CACHE_TTL_SECONDS,
+        )
+        usage_meter.on_flush(self._drop_flushed)
     
     def increment_ai_counter(self, user_id: str, ai_type: str):
         """
@@ -21,28 +41,47 @@ class PlanService:
         self._increment(user_id, "transformations_used")
 
     def _increment(self, user_id: str, column: str):
-        """Base increment — fails silently, never blocks response."""
-        try:
-            res = (
-                supabase.table("user_plans")
-                .select(column)
-                .eq("user_id", user_id)
-                .single()
-                .execute()
-            )
-            if res.data:
-                current = res.data.get(column, 0) or 0
-                supabase.table("user_plans").update(
-                    {column: current + 1}
-                ).eq("user_id", user_id).execute()
-        except Exception as e:
-            print(f"[COUNTER_ERROR] Failed to increment {column}: {e}")
-
-    def get_plan(self, user_id: str) -> dict | None:
+        """
+        Base increment — recorded in memory and flushed in batches as
+        atomic server-side increments. Never blocks the response.
+        """
+        usage_meter.add(user_id, column)
+
+    def get_plan(self, user_id: str, fresh: bool = False) -> dict | None:
         """
         Returns current user plan and usage.
         Used by /plans/me endpoint in Step 5d.
+        Usage counters include increments not yet flushed to the database.
+
+        fresh=True skips the cache and re-reads user_plans — for admin and
+        billing flows that must see changes made outside this process.
         """
+        if not fresh:
+            stored, pending = usage_meter.read_with_pending(
+                user_id, lambda: self._cache.get(user_id)
+            )
+            if stored is not None:
+                return self._overlay(stored, pending)
+
+        # Read without blocking flushes; cache only a row no flush raced
+        for _ in range(2):
+            generation = usage_meter.generation()
+            stored = self._fetch(user_id)
+            if not stored:
+                return None
+            pending = usage_meter.pending_if_unchanged(
+                user_id, generation, lambda: self._cache.set(user_id, stored)
+            )
+            if pending is not None:
+                return self._overlay(stored, pending)
+
+        # A flush was in flight during both reads: the row may already include
+        # the in-flight batch. Count it anyway — over, never under — and
+        # leave the cache for the next read.
+        return self._overlay(stored, usage_meter.pending(user_id))
+
+    @staticmethod
+    def _fetch(user_id: str) -> dict | None:
         try:
             res = (
                 supabase.table("user_plans")
@@ -55,4 +94,23 @@ class PlanService:
         except Exception:
             return None
 
+    @staticmethod
+    def _overlay(stored: dict, pending: dict[str, int]) -> dict:
+        plan = dict(stored)
+        for column, amount in pending.items():
+            plan[column] = (plan.get(column) or 0) + amount
+        return plan
+
+    def invalidate(self, user_id: str):
+        """Drop the cached row, e.g. after a plan change or limit update."""
+        self._cache.pop(user_id)
+
+    def cache_stats(self) -> dict:
+        return self._cache.stats()
+
+    def _drop_flushed(self, user_id: str, columns: dict[str, int]):
+        # Runs inside the flush, after the commit: the cached row is now
+        # behind the database, so the next read re-fetches it
+        self._cache.pop(user_id)
+
 plan_service = PlanService()
\ No newline at end of file
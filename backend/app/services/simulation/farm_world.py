@@ -1,41 +1,106 @@
 # services/simulation/farm_world.py
 
-import random
-from datetime import datetime
+import math
+import time
+from collections.abc import Mapping
+from datetime import datetime, timezone
+import numpy as np
 
 class FarmWorld:
-    def __init__(self, width=100, height=100, zone_size=20):
+    """
+    Grid of square zones, stored as flat NumPy arrays (one slot per zone).
+
+    Zone ids run column by column — id = col * rows + row — matching the
+    original dict layout, so position → zone is plain integer arithmetic.
+    ~36 bytes per zone: 50k zones is under 2 MB.
+
+    `zones` is a read-only mapping that builds the familiar zone dicts
+    on access, for the drone API.
+
+    simulate_health_all() is the world tick: it redraws every zone's
+    health in one vectorized call. Scans read the current value.
+    """
+
+    def __init__(self, width=100, height=100, zone_size=20, seed=None):
         self.width = width
         self.height = height
         self.zone_size = zone_size
-        self.zones = self._create_zones()
+        self.cols = math.ceil(width / zone_size)
+        self.rows = math.ceil(height / zone_size)
+        self._rng = np.random.default_rng(seed)
+        self._create_zones()
+        self.zones = ZoneView(self)
 
     def _create_zones(self):
-        zones = {}
-        zone_id = 0
-
-        for x in range(0, self.width, self.zone_size):
-            for y in range(0, self.height, self.zone_size):
-                zones[zone_id] = {
-                    "id": zone_id,
-                    "x_range": (x, x + self.zone_size),
-                    "y_range": (y, y + self.zone_size),
-                    "base_health": random.uniform(0.55, 0.85),
-                    "stress_factor": random.uniform(0.0, 0.25),
-                    "last_updated": datetime.utcnow()
-                }
-                zone_id += 1
-
-        return zones
+        count = self.cols * self.rows
+        ids = np.arange(count)
+        # bounds[i] = (x_min, x_max, y_min, y_max)
+        x_min = (ids // self.rows) * self.zone_size
+        y_min = (ids % self.rows) * self.zone_size
+        self.bounds = np.stack(
+            [x_min, x_min + self.zone_size, y_min, y_min + self.zone_size], axis=1
+        ).astype(np.int32)
+
+        self.base_health = self._rng.uniform(0.55, 0.85, count).astype(np.float32)
+        self.stress_factor = self._rng.uniform(0.0, 0.25, count).astype(np.float32)
+        self.last_updated = np.full(count, time.time(), dtype=np.float64)
+        self.health = np.zeros(count, dtype=np.float32)
+        self.simulate_health_all()
+
+    def __len__(self):
+        return len(self.base_health)
+
+    def zone_id_at(self, x, y) -> int | None:
+        """O(1) grid lookup; None outside the grid."""
+        col = int(x // self.zone_size)
+        row = int(y // self.zone_size)
+        if x < 0 or y < 0 or col >= self.cols or row >= self.rows:
+            return None
+        return col * self.rows + row
 
     def get_zone_by_position(self, x, y):
-        for zone in self.zones.values():
-            if zone["x_range"][0] <= x < zone["x_range"][1] and \
-               zone["y_range"][0] <= y < zone["y_range"][1]:
-                return zone
-        return None
+        zone_id = self.zone_id_at(x, y)
+        return None if zone_id is None else self.zones[zone_id]
 
     def simulate_health(self, zone):
-        noise = random.uniform(-0.05, 0.05)
-        health = zone["base_health"] - zone["stress_factor"] + noise
-        return max(0.0, min(1.0, health))
+        """Current NDVI-like health of one zone (a zone dict or a zone id)."""
+        zone_id = zone["id"] if isinstance(zone, Mapping) else zone
+        return float(self.health[zone_id])
+
+    def simulate_health_all(self) -> np.ndarray:
+        """Redraws health for every zone in one vectorized call; stamps last_updated."""
+        noise = self._rng.uniform(-0.05, 0.05, len(self))
+        np.clip(self.base_health - self.stress_factor + noise, 0.0, 1.0, out=self.health)
+        self.last_updated[:] = time.time()
+        return self.health
+
+
+class ZoneView(Mapping):
+    """Read-only {zone_id: zone dict} view over a FarmWorld's arrays."""
+
+    def __init__(self, world: FarmWorld):
+        self._world = world
+
+    def __getitem__(self, zone_id):
+        world = self._world
+        if not isinstance(zone_id, (int, np.integer)) or not 0 <= zone_id < len(world):
+            raise KeyError(zone_id)
+        x_min, x_max, y_min, y_max = (int(v) for v in world.bounds[zone_id])
+        return {
+            "id": int(zone_id),
+            "x_range": (x_min, x_max),
+            "y_range": (y_min, y_max),
+            "base_health": float(world.base_health[zone_id]),
+            "stress_factor": float(world.stress_factor[zone_id]),
+            "health": round(float(world.health[zone_id]), 3),
+            # Naive UTC, as before — utcfromtimestamp() is deprecated on 3.12
+            "last_updated": datetime.fromtimestamp(
+                float(world.last_updated[zone_id]), timezone.utc
+            ).replace(tzinfo=None),
+        }
+
+    def __iter__(self):
+        return iter(range(len(self._world)))
+
+    def __len__(self):
+        return len(self._world)
@@ -0,0 +1,135 @@
+# services/simulation/scheduler.py
+
+import threading
+import time
+from app.services.simulation.telemetry_emitter import TelemetryEmitter
+from config import Config
+
+
+class SimulationScheduler:
+    """
+    Registry of per-farm drone missions, all advanced by one timer thread.
+
+    Each farm gets its own TelemetryEmitter (FarmWorld + DroneSimulator +
+    mission state), created on first use. Every `tick_interval` seconds
+    the loop calls generate_telemetry() on each running mission — a tick
+    is a few microseconds of array work, so hundreds of missions share
+    the one thread. A mission that raises is logged and skipped for that
+    tick only.
+
+    Missions that are not running and untouched for `idle_ttl` seconds
+    are dropped from the registry.
+    """
+
+    def __init__(self, tick_interval: float = 2.0, idle_ttl: float = 3600):
+        self.tick_interval = tick_interval
+        self.idle_ttl = idle_ttl
+        self._emitters: dict[str, TelemetryEmitter] = {}
+        self._touched: dict[str, float] = {}  # farm_id → monotonic time of last activity
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self.ticks = 0
+        self.emitted = 0
+        self.errors = 0
+        self.evicted = 0
+        self.last_tick_ms = 0
+
+    def get(self, farm_id: str, create: bool = False) -> TelemetryEmitter | None:
+        with self._lock:
+            emitter = self._emitters.get(farm_id)
+            if emitter is None and create:
+                emitter = self._emitters[farm_id] = TelemetryEmitter(farm_id=farm_id)
+            if emitter is not None:
+                self._touched[farm_id] = time.monotonic()
+            return emitter
+
+    def start_mission(self, farm_id: str) -> TelemetryEmitter:
+        emitter = self.get(farm_id, create=True)
+        emitter.start()
+        return emitter
+
+    def stop_mission(self, farm_id: str) -> TelemetryEmitter | None:
+        emitter = self.get(farm_id)
+        if emitter:
+            emitter.stop()
+        return emitter
+
+    def reset_mission(self, farm_id: str) -> TelemetryEmitter | None:
+        emitter = self.get(farm_id)
+        if emitter:
+            emitter.reset()
+        return emitter
+
+    def start(self):
+        """Starts the timer thread (once per process)."""
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="simulation-scheduler", daemon=True)
+                self._thread.start()
+
+    def tick(self):
+        started = time.perf_counter()
+        with self._lock:
+            running = [e for e in self._emitters.values() if e.is_running]
+
+        for emitter in running:
+            try:
+                telemetry = emitter.generate_telemetry()
+            except Exception as e:
+                self.errors += 1
+                print(f"[SIMULATION_ERROR] Farm {emitter.farm_id}: {e}")
+                continue
+            if telemetry:
+                self.emitted += 1
+
+        self._evict_idle()
+        self.ticks += 1
+        self.last_tick_ms = int((time.perf_counter() - started) * 1000)
+
+    def stats(self) -> dict:
+        with self._lock:
+            missions = len(self._emitters)
+            running = sum(1 for e in self._emitters.values() if e.is_running)
+        return {
+            "missions":     missions,
+            "running":      running,
+            "ticks":        self.ticks,
+            "emitted":      self.emitted,
+            "errors":       self.errors,
+            "evicted":      self.evicted,
+            "last_tick_ms": self.last_tick_ms,
+        }
+
+    def _evict_idle(self):
+        cutoff = time.monotonic() - self.idle_ttl
+        with self._lock:
+            idle = [
+                farm_id for farm_id, emitter in self._emitters.items()
+                if not emitter.is_running and self._touched.get(farm_id, 0) < cutoff
+            ]
+            for farm_id in idle:
+                del self._emitters[farm_id]
+                self._touched.pop(farm_id, None)
+        self.evicted += len(idle)
+
+    def _run(self):
+        # Fixed-rate schedule: a slow tick shortens the next sleep instead of drifting
+        next_tick = time.monotonic()
+        while True:
+            next_tick += self.tick_interval
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"[SIMULATION_ERROR] Tick failed: {e}")
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.monotonic()
+
+
+simulation_scheduler = SimulationScheduler(
+    tick_interval=Config.SIMULATION_TICK_SECONDS,
+    idle_ttl=Config.SIMULATION_IDLE_TTL_SECONDS,
+)
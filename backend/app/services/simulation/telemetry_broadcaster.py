@@ -0,0 +1,132 @@
+# services/simulation/telemetry_broadcaster.py
+
+import json
+import queue
+import threading
+from config import Config
+
+# Put on a subscriber's queue when it is dropped, so its stream ends cleanly
+_CLOSED = object()
+
+
+class Subscription:
+    def __init__(self, farm_id: str, queue_size: int):
+        self.farm_id = farm_id
+        self.queue = queue.Queue(maxsize=queue_size)
+
+    def events(self, heartbeat: float):
+        """
+        Yields ready-to-send SSE frames until the subscriber is dropped.
+        A comment line goes out every `heartbeat` idle seconds — that write
+        is what notices a client that disconnected.
+        """
+        while True:
+            try:
+                frame = self.queue.get(timeout=heartbeat)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            if frame is _CLOSED:
+                yield "event: dropped\ndata: {}\n\n"
+                return
+            yield frame
+
+
+class TelemetryBroadcaster:
+    """
+    Pushes each new telemetry point to the SSE clients watching its farm.
+
+    publish() runs on the scheduler thread and never blocks: the point is
+    serialized once, then put on every subscriber's bounded queue. A
+    subscriber whose queue is full is too slow to keep up — it is dropped
+    (sent `event: dropped`, which EventSource answers by reconnecting)
+    rather than slowing the simulation or buffering without limit.
+    """
+
+    def __init__(self, queue_size: int = 32, max_subscribers: int = 24):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self._count = 0
+        self._lock = threading.Lock()
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.rejected = 0
+
+    def subscribe(self, farm_id: str) -> Subscription | None:
+        """A new subscription, or None when at max_subscribers."""
+        with self._lock:
+            if self._count >= self.max_subscribers:
+                self.rejected += 1
+                return None
+            subscription = Subscription(farm_id, self.queue_size)
+            self._subscribers.setdefault(farm_id, set()).add(subscription)
+            self._count += 1
+            return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._remove(subscription)
+
+    def publish(self, farm_id: str, telemetry: dict):
+        with self._lock:
+            subscribers = list(self._subscribers.get(farm_id, ()))
+        if not subscribers:
+            return
+
+        frame = f"data: {json.dumps(telemetry)}\n\n"
+        self.published += 1
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait(frame)
+                self.delivered += 1
+            except queue.Full:
+                self._drop(subscription)
+
+    def subscriber_count(self, farm_id: str = None) -> int:
+        with self._lock:
+            if farm_id is None:
+                return self._count
+            return len(self._subscribers.get(farm_id, ()))
+
+    def stats(self) -> dict:
+        with self._lock:
+            subscribers, farms = self._count, len(self._subscribers)
+        return {
+            "subscribers":     subscribers,
+            "farms":           farms,
+            "max_subscribers": self.max_subscribers,
+            "published":       self.published,
+            "delivered":       self.delivered,
+            "dropped":         self.dropped,
+            "rejected":        self.rejected,
+        }
+
+    def _drop(self, subscription: Subscription):
+        with self._lock:
+            if not self._remove(subscription):
+                return
+        self.dropped += 1
+        # Make room for the close marker; the frames it replaces were going to be stale anyway
+        try:
+            subscription.queue.get_nowait()
+        except queue.Empty:
+            pass
+        subscription.queue.put_nowait(_CLOSED)
+
+    def _remove(self, subscription: Subscription) -> bool:
+        farm_subscribers = self._subscribers.get(subscription.farm_id)
+        if not farm_subscribers or subscription not in farm_subscribers:
+            return False
+        farm_subscribers.discard(subscription)
+        if not farm_subscribers:
+            del self._subscribers[subscription.farm_id]
+        self._count -= 1
+        return True
+
+
+telemetry_broadcaster = TelemetryBroadcaster(
+    queue_size=Config.DRONE_STREAM_QUEUE_SIZE,
+    max_subscribers=Config.DRONE_STREAM_MAX_SUBSCRIBERS,
+)
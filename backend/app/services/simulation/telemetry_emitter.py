@@ -1,26 +1,73 @@
 # services/simulation/telemetry_emitter.py
-# Simulation now feeds shared live state
+# One emitter per farm mission — advanced by the simulation scheduler
 
 from datetime import datetime
-from app.services.simulation.sim_state import SIMULATION_STATE
 from app.services.simulation.telemetry_repository import TelemetryRepository
+from app.services.simulation.telemetry_broadcaster import telemetry_broadcaster
 from app.services.simulation.drone_simulator import DroneSimulator
 from app.services.simulation.farm_world import FarmWorld
+from app.services.simulation.telemetry_history import TelemetryRing
+from config import Config
+
+
+def new_mission(total_zones: int) -> dict:
+    return {
+        "total_zones": total_zones,
+        "scanned_zones": set(),
+        "poor_zones_detected": set(),
+        "mission_status": "NOT_STARTED",
+        "completion_percentage": 0,
+        "is_running": False
+    }
+
 
 class TelemetryEmitter:
-    def __init__(self, farm_id: int = None, supabase_client=None):
+    def __init__(self, farm_id: str = None, supabase_client=None):
         self.farm_id = farm_id  # None = simulation only, real id = persists to that farm
         self.farm = FarmWorld()
         self.drone = DroneSimulator(self.farm)
-        SIMULATION_STATE["mission"]["total_zones"] = len(self.farm.zones)
-        SIMULATION_STATE["mission"]["mission_status"] = "IN_PROGRESS"
+        # Mission state is per emitter, so farms never share progress
+        self.mission = new_mission(len(self.farm.zones))
+        self.latest = None
+        self.last_updated = None
+        # Recent points for charts (/farms/<farm_id>/drone/history)
+        self.history = TelemetryRing(Config.TELEMETRY_HISTORY_SIZE)
         self.db = supabase_client
-    
+
+    def start(self):
+        if self.mission["mission_status"] == "COMPLETED":
+            self.mission = new_mission(len(self.farm.zones))
+        self.mission["is_running"] = True
+        self.mission["mission_status"] = "IN_PROGRESS"
+
+    def stop(self):
+        self.mission["is_running"] = False
+        self.mission["mission_status"] = "STOPPED"
+
+    def reset(self):
+        # Reset drone simulator position
+        self.drone.x = 1
+        self.drone.y = 1
+        self.drone.battery = 100
+        self.drone.status = "IDLE"
+        self.drone.decision_state = "IDLE"
+        self.drone.last_scan_time = None
+
+        self.latest = None
+        self.last_updated = None
+        self.history.clear()
+        self.mission = new_mission(len(self.farm.zones))
+
+    @property
+    def is_running(self) -> bool:
+        return self.mission["is_running"]
+
     def generate_telemetry(self):
         
-        if not SIMULATION_STATE["mission"]["is_running"]:
+        if not self.mission["is_running"]:
             return None
-        # Move the drone first
+        # Advance the world (every zone, one vectorized call), then the drone
+        self.farm.simulate_health_all()
         self.drone.tick()
         # scan if ready after 5 sec
         if not self.drone.should_scan():
@@ -32,7 +79,7 @@ class TelemetryEmitter:
 
         ndvi = self.farm.simulate_health(zone)
         
-        mission = SIMULATION_STATE["mission"]
+        mission = self.mission
 
         # Track scanned zones
         mission["scanned_zones"].add(zone["id"])
@@ -51,7 +98,7 @@ class TelemetryEmitter:
         if mission["completion_percentage"] >= 100:
             mission["mission_status"] = "COMPLETED"
             self.drone.decision_state = "MISSION_COMPLETED"
-            SIMULATION_STATE["mission"]["is_running"] = False
+            mission["is_running"] = False
             self.drone.status = "IDLE"
 
         telemetry = {
@@ -63,14 +110,17 @@ class TelemetryEmitter:
             "ndvi_score": round(ndvi, 3),
             "health_label": self._label_health(ndvi),
             "decision_state": self.drone.decision_state,
-            "mission_progress": SIMULATION_STATE["mission"]["completion_percentage"],
-            "poor_zones_detected": len(SIMULATION_STATE["mission"]["poor_zones_detected"])
+            "mission_progress": mission["completion_percentage"],
+            "poor_zones_detected": len(mission["poor_zones_detected"])
         }
         
         # Store live state for APIs / UI
-        SIMULATION_STATE["drone"] = telemetry
-        SIMULATION_STATE["zones"] = self.farm.zones
-        SIMULATION_STATE["last_updated"] = telemetry["timestamp"]
+        self.latest = telemetry
+        self.last_updated = telemetry["timestamp"]
+        self.history.append(telemetry)
+
+        # Push to live dashboards (/farms/<farm_id>/drone/stream)
+        telemetry_broadcaster.publish(self.farm_id, telemetry)
         
         # Persistent state (credibility)
         if self.farm_id:
@@ -81,10 +131,23 @@ class TelemetryEmitter:
         
         return telemetry
 
+    def status(self) -> dict:
+        return {
+            "farm_id": self.farm_id,
+            "drone": self.latest,
+            "last_updated": self.last_updated,
+            "mission": {
+                "status": self.mission["mission_status"],
+                "progress": self.mission["completion_percentage"],
+                "total_zones": self.mission["total_zones"],
+                "scanned_zones": len(self.mission["scanned_zones"]),
+                "poor_zones_detected": len(self.mission["poor_zones_detected"])
+            }
+        }
+
     def _label_health(self, ndvi):
         if ndvi > 0.65:
             return "Good"
         elif ndvi > 0.4:
             return "Moderate"
         return "Poor"
-telemetry_engine = TelemetryEmitter(farm_id=None)
\ No newline at end of file
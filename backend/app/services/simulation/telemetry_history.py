@@ -0,0 +1,143 @@
+# services/simulation/telemetry_history.py
+
+import threading
+from datetime import datetime, timezone
+import numpy as np
+
+# Series a history query can ask for → ring column
+SERIES = {
+    "battery": "battery",
+    "ndvi":    "ndvi",
+    "x":       "x",
+    "y":       "y",
+    "zone_id": "zone",
+}
+
+
+class TelemetryRing:
+    """
+    Fixed-size ring buffer of recent telemetry for one farm.
+
+    One NumPy array per field, ~28 bytes per point; once full, each new
+    point overwrites the oldest. append() runs on the scheduler thread,
+    snapshot() on request threads.
+    """
+
+    def __init__(self, capacity: int = 2048):
+        self.capacity = capacity
+        self.timestamp = np.zeros(capacity, dtype=np.float64)  # epoch seconds
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.battery = np.zeros(capacity, dtype=np.float32)
+        self.ndvi = np.zeros(capacity, dtype=np.float32)
+        self.zone = np.zeros(capacity, dtype=np.int32)
+        self._next = 0
+        self.size = 0
+        self._lock = threading.Lock()
+
+    def append(self, telemetry: dict):
+        # Emitter timestamps are naive UTC isoformat strings
+        ts = datetime.fromisoformat(telemetry["timestamp"]).replace(tzinfo=timezone.utc).timestamp()
+        with self._lock:
+            i = self._next
+            self.timestamp[i] = ts
+            self.x[i] = telemetry["position"]["x"]
+            self.y[i] = telemetry["position"]["y"]
+            self.battery[i] = telemetry["battery"]
+            self.ndvi[i] = telemetry["ndvi_score"]
+            self.zone[i] = telemetry["zone_id"]
+            self._next = (i + 1) % self.capacity
+            self.size = min(self.size + 1, self.capacity)
+
+    def clear(self):
+        with self._lock:
+            self._next = 0
+            self.size = 0
+
+    def snapshot(self, since: float = None) -> dict[str, np.ndarray]:
+        """Copies of every column in time order, optionally only points after `since`."""
+        with self._lock:
+            start = (self._next - self.size) % self.capacity
+            order = (start + np.arange(self.size)) % self.capacity
+            columns = {
+                name: getattr(self, name)[order]
+                for name in ("timestamp", "x", "y", "battery", "ndvi", "zone")
+            }
+        if since is not None:
+            keep = columns["timestamp"] > since
+            columns = {name: values[keep] for name, values in columns.items()}
+        return columns
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of `threshold` points that
+    keep the visual shape of the series. Always keeps first and last.
+    """
+    n = len(x)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < 3:
+        # No room for a middle bucket — the endpoints (or just the latest)
+        return np.array([0, n - 1] if threshold == 2 else [n - 1])
+
+    every = (n - 2) / (threshold - 2)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        # Third corner: average of the next bucket
+        avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        # Pick the point in this bucket forming the largest triangle with a and the average
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+    return indices
+
+
+def minmax(y: np.ndarray, points: int) -> np.ndarray:
+    """
+    Min/max bucketing: the lowest and highest point of each of points/2
+    equal buckets, in time order. Keeps every spike, unlike LTTB.
+    """
+    n = len(y)
+    buckets = points // 2
+    if n <= points:
+        return np.arange(n)
+    if buckets < 1:
+        return np.array([n - 1])
+
+    indices = []
+    for bucket in np.array_split(np.arange(n), buckets):
+        values = y[bucket]
+        indices.extend((bucket[values.argmin()], bucket[values.argmax()]))
+    return np.unique(indices)
+
+
+DOWNSAMPLERS = {
+    "lttb":   lambda t, y, points: lttb(t, y, points),
+    "minmax": lambda t, y, points: minmax(y, points),
+}
+
+
+def downsample(columns: dict[str, np.ndarray], series: list[str], points: int, method: str = "lttb") -> dict:
+    """
+    {name: {"t": [epoch ms…], "v": [value…]}} for each requested series,
+    each reduced to at most `points` points by `method`.
+    """
+    select = DOWNSAMPLERS[method]
+    timestamps = columns["timestamp"]
+    result = {}
+    for name in series:
+        values = columns[SERIES[name]].astype(np.float64)
+        indices = select(timestamps, values, points)
+        result[name] = {
+            "t": (timestamps[indices] * 1000).astype(np.int64).tolist(),
+            "v": np.round(values[indices], 3).tolist(),
+        }
+    return result
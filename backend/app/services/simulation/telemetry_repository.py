@@ -1,10 +1,31 @@
 # services/simulation/telemetry_repository.py
 
-from app.core.supabase import supabase
+from app.utils.supabase_client import get_admin_db_client
+from app.utils.batch_writer import BatchWriter
+from config import Config
+
+
+def _insert_telemetry(rows: list[dict]):
+    get_admin_db_client().table("drone_telemetry").insert(rows).execute()
+
+
+# Scans are queued and bulk-inserted off the simulation tick, so a slow
+# database never delays the scheduler. When the queue is full the oldest
+# points are dropped (counted in telemetry_writer.stats()).
+telemetry_writer = BatchWriter(
+    "drone_telemetry",
+    _insert_telemetry,
+    max_batch=Config.TELEMETRY_BATCH_SIZE,
+    flush_interval=Config.TELEMETRY_FLUSH_SECONDS,
+    max_queue=Config.TELEMETRY_QUEUE_SIZE,
+    drop_oldest=True,
+)
+
 
 class TelemetryRepository:
     @staticmethod
-    def save_telemetry(telemetry, farm_id=None):
+    def save_telemetry(telemetry, farm_id=None) -> bool:
+        """Queues one scan for the background bulk insert; never blocks the tick."""
         payload = {
             "farm_id": farm_id,
             "zone_id": telemetry["zone_id"],
@@ -16,4 +37,4 @@ class TelemetryRepository:
             "health_label": telemetry["health_label"],
         }
 
-        supabase.table("drone_telemetry").insert(payload).execute()
+        return telemetry_writer.submit(payload)
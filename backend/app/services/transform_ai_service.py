@@ -1,5 +1,7 @@
 import json
+import time
 from app.services.ai.factory import get_ai_provider
+from app.services.ai.latency_stats import latency_stats
 from app.services.ai.prompts.system_prompts import (
     farm_advisor_system_prompt,
     experience_advisor_system_prompt,
@@ -19,6 +21,14 @@ class TransformAIBase:
         self.provider = get_ai_provider()
         self.temperature = Config.AI_TEMPERATURE
 
+    def _complete(self, source: str, **kwargs) -> str:
+        """provider.complete, with its latency recorded under `source`."""
+        start = time.time()
+        try:
+            return self.provider.complete(**kwargs)
+        finally:
+            latency_stats.record(source, "completion", (time.time() - start) * 1000)
+
     def _parse_json_response(self, text: str) -> dict:
         try:
             cleaned = text.strip()
@@ -41,7 +51,8 @@ class TransformAdvisorService(TransformAIBase):
         system = farm_advisor_system_prompt(language)
         user = farm_advisory_prompt(user_prompt, transformation_summary)
 
-        raw_response = self.provider.complete(
+        raw_response = self._complete(
+            "farm_advisor",
             system_prompt=system,
             user_prompt=user,
             temperature=self.temperature,
@@ -57,7 +68,8 @@ class TransformAdvisorService(TransformAIBase):
         system = experience_advisor_system_prompt(language)
         user = experience_advisory_prompt(user_prompt, experience_details, farm_context)
 
-        raw_response = self.provider.complete(
+        raw_response = self._complete(
+            "experience_advisor",
             system_prompt=system,
             user_prompt=user,
             temperature=self.temperature,
@@ -76,7 +88,8 @@ class TransformStoryService(TransformAIBase):
         system = story_generator_system_prompt(language)
         user = story_generation_prompt(experience_details, farm_context)
         
-        raw_response = self.provider.complete(
+        raw_response = self._complete(
+            "story",
             system_prompt=system,
             user_prompt=user,
             temperature=self.temperature,
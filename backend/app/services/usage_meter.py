@@ -0,0 +1,162 @@
+import atexit
+import threading
+import time
+from collections import Counter
+from app.utils.supabase_client import get_admin_db_client
+from config import Config
+
+
+class UsageMeter:
+    """
+    In-process accumulator for user_plans usage counters.
+
+    add() only bumps an in-memory delta. A background thread flushes all
+    deltas every `flush_interval` seconds with one call to the
+    increment_usage_counters RPC, which adds them server-side in a single
+    UPDATE — no read-modify-write, so concurrent workers never lose counts.
+
+    pending(user_id) returns deltas not yet confirmed by the database
+    (queued and in flight), so callers can overlay them on stored totals.
+    A failed flush puts its deltas back for the next attempt.
+    on_flush listeners see every batch the database has accepted.
+
+    generation() works like a seqlock: it is odd while a flush is in
+    flight, so a stored read taken between two equal, even generations
+    saw no flush commit.
+    """
+
+    def __init__(self, flush_interval: float = 2.0):
+        self.flush_interval = flush_interval
+        self._deltas = Counter()     # (user_id, column) → amount
+        self._in_flight = Counter()  # being sent by the current flush
+        self._generation = 0         # +1 when a flush starts sending, +1 when it ends
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._listeners = []
+        self.flushes = 0
+        self.failures = 0
+
+    def add(self, user_id: str, column: str, amount: int = 1):
+        self._ensure_started()
+        with self._lock:
+            self._deltas[(user_id, column)] += amount
+
+    def pending(self, user_id: str) -> dict[str, int]:
+        with self._lock:
+            return self._pending(user_id)
+
+    def read_with_pending(self, user_id: str, read):
+        """
+        (read(), pending(user_id)) taken atomically with respect to
+        on_flush listeners — read() sees state from before the current
+        batch's listeners ran if and only if pending() still includes it.
+        read() must be quick and must not call back into the meter.
+        """
+        with self._lock:
+            return read(), self._pending(user_id)
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def pending_if_unchanged(self, user_id: str, generation: int, on_unchanged=None) -> dict[str, int] | None:
+        """
+        pending(user_id) if no flush was in flight at `generation` and none
+        has started since — stored totals read in between then count every
+        delta exactly once. on_unchanged() runs first, under the same lock
+        (e.g. to cache the read). None if a flush got in the way.
+        """
+        with self._lock:
+            if generation != self._generation or generation % 2:
+                return None
+            if on_unchanged:
+                on_unchanged()
+            return self._pending(user_id)
+
+    def on_flush(self, callback):
+        """
+        Register callback(user_id, {column: amount}), run after deltas are
+        persisted. Runs under the meter's lock — keep it quick, and don't
+        call add()/pending() from it.
+        """
+        self._listeners.append(callback)
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                if not self._deltas:
+                    return
+                self._in_flight, self._deltas = self._deltas, Counter()
+                self._generation += 1
+                batch = self._in_flight
+
+            try:
+                get_admin_db_client().rpc("increment_usage_counters", {
+                    "deltas": [
+                        {"user_id": user_id, "column_name": column, "amount": amount}
+                        for (user_id, column), amount in batch.items()
+                    ],
+                }).execute()
+                self.flushes += 1
+            except Exception as e:
+                self.failures += 1
+                print(f"[COUNTER_ERROR] Failed to flush {len(batch)} usage deltas: {e}")
+                with self._lock:
+                    self._deltas.update(batch)
+                    self._in_flight = Counter()
+                    self._generation += 1
+                return
+
+            # Listeners and clearing in_flight under one lock: see read_with_pending
+            with self._lock:
+                self._notify(batch)
+                self._in_flight = Counter()
+                self._generation += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            queued, in_flight = len(self._deltas), len(self._in_flight)
+        return {
+            "pending_deltas": queued,
+            "in_flight":      in_flight,
+            "flushes":        self.flushes,
+            "failures":       self.failures,
+        }
+
+    def _pending(self, user_id: str) -> dict[str, int]:
+        totals = Counter()
+        for deltas in (self._deltas, self._in_flight):
+            for (uid, column), amount in deltas.items():
+                if uid == user_id:
+                    totals[column] += amount
+        return dict(totals)
+
+    def _notify(self, batch: Counter):
+        by_user = {}
+        for (user_id, column), amount in batch.items():
+            by_user.setdefault(user_id, {})[column] = amount
+        for callback in self._listeners:
+            for user_id, columns in by_user.items():
+                try:
+                    callback(user_id, columns)
+                except Exception as e:
+                    print(f"[COUNTER_ERROR] on_flush callback failed: {e}")
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="usage-meter", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+
+usage_meter = UsageMeter(flush_interval=Config.USAGE_FLUSH_SECONDS)
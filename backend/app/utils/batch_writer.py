@@ -0,0 +1,146 @@
+import atexit
+import queue
+import threading
+import time
+from typing import Callable
+
+_STOP = object()
+
+
+class BatchWriter:
+    """
+    Buffers items in a bounded queue and hands them to `flush` in batches
+    from one background thread.
+
+    - A batch is flushed when it reaches `max_batch` items or when
+      `flush_interval` seconds have passed since its first item
+    - submit() never blocks — when the queue is full an item is dropped
+      and counted, so a slow database can't stall request threads. By
+      default the new item is dropped; with drop_oldest=True the queue
+      acts as a ring buffer and the oldest queued item makes room instead
+    - `flush` errors are printed and counted, never raised
+    - close() (also registered with atexit) drains whatever is queued
+
+    Usage:
+        writer = BatchWriter("logs", lambda rows: table.insert(rows).execute())
+        writer.submit(row)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        flush: Callable[[list], None],
+        max_batch: int = 50,
+        flush_interval: float = 2.0,
+        max_queue: int = 5000,
+        drop_oldest: bool = False,
+    ):
+        self.name = name
+        self._flush = flush
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.drop_oldest = drop_oldest
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.submitted = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.batches = 0
+        self.failed = 0
+
+    def submit(self, item) -> bool:
+        """Queue one item. Returns False if it was dropped (queue full)."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+            if not self.drop_oldest or not self._evict_oldest(item):
+                return False
+        self.submitted += 1
+        return True
+
+    def close(self, timeout: float = 10.0):
+        """Flush everything queued so far and stop the background thread."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            print(f"[BATCH_WRITER_ERROR] {self.name}: queue still full at shutdown, {self._queue.qsize()} items lost")
+            return
+        thread.join(timeout)
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "max_queue":   self._queue.maxsize,
+            "submitted":   self.submitted,
+            "dropped":     self.dropped,
+            "flushed":     self.flushed,
+            "batches":     self.batches,
+            "failed":      self.failed,
+        }
+
+    def _evict_oldest(self, item) -> bool:
+        try:
+            oldest = self._queue.get_nowait()
+        except queue.Empty:
+            oldest = None
+        if oldest is _STOP:
+            # Shutting down — keep the stop marker, drop the new item
+            self._queue.put(_STOP)
+            return False
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            return False
+
+    def _ensure_started(self):
+        # Started lazily so importing a module that owns a writer costs nothing
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"batch-writer-{self.name}", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._write(batch)
+                return
+
+            if item is not None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            if batch and (len(batch) >= self.max_batch or time.monotonic() >= deadline):
+                self._write(batch)
+                batch = []
+                deadline = None
+
+    def _write(self, batch: list):
+        if not batch:
+            return
+        try:
+            self._flush(batch)
+            self.flushed += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            print(f"[BATCH_WRITER_ERROR] {self.name}: failed to flush {len(batch)} items: {e}")
+        finally:
+            self.batches += 1
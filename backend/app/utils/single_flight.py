@@ -0,0 +1,66 @@
+import threading
+from typing import Callable
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into one.
+
+    The first caller for a key (the leader) runs fn; callers arriving while
+    it runs wait and get the leader's result — or its exception. Once the
+    leader finishes the key is free again, so store anything that should
+    outlive the flight (e.g. in a TTLCache) inside fn itself.
+
+    Usage:
+        flights = SingleFlight()
+        session = flights.do(refresh_token, lambda: client.refresh(refresh_token))
+    """
+
+    def __init__(self):
+        self._calls: dict = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.shared = 0
+
+    def do(self, key, fn: Callable, timeout: float = None):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.leaders += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            if not call.done.wait(timeout):
+                raise TimeoutError("Timed out waiting for in-flight call")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._calls),
+            "leaders":   self.leaders,
+            "shared":    self.shared,
+        }
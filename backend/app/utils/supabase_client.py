@@ -10,16 +10,35 @@
 #     - get_supabase_client()       → Anonymous client (for public operations)
 #     - get_admin_supabase_client() → Service role client (bypasses RLS, admin only)
 #
+#   Plus pooled, table/RPC-only clients for per-request data access:
+#     - get_db_client(access_token) → User-scoped (RLS applies), built per request
+#     - get_admin_db_client()       → Service role, one shared instance
+#   Both send through ONE process-wide httpx connection pool with keep-alive,
+#   so most DB calls reuse an open TLS connection instead of building a new
+#   client (and a new pool) every time. The JWT travels as a per-request
+#   header, so sharing the pool never mixes users.
+#
+#   Auth flows (sign in, refresh, admin.create_user) still use the full
+#   clients above — their auth state must not be shared.
+#
 # LEARN: Row Level Security (RLS) is a Postgres feature that restricts which rows
 #        a user can see/edit based on their JWT. When you pass a user's access_token
 #        to the Supabase client, RLS policies automatically filter data per that user.
 # =============================================================================
 
 import os
+import threading
+import httpx
 from config import Config
 from supabase import create_client, Client
+from postgrest import SyncPostgrestClient
 from flask import g  # g = "global" Flask context — lives for one request only
 
+_http_client: httpx.Client | None = None
+_admin_db: SyncPostgrestClient | None = None
+_pool_lock = threading.Lock()
+_scoped_clients_served = 0
+
 
 def get_supabase_client(access_token: str = None) -> Client:
     """
@@ -82,7 +101,93 @@ def get_admin_supabase_client() -> Client:
     return create_client(url, service_role_key)
 
 
-def get_request_supabase() -> Client:
+def _shared_http_client() -> httpx.Client:
+    """The process-wide keep-alive connection pool behind every pooled client."""
+    global _http_client
+    if _http_client is None:
+        with _pool_lock:
+            if _http_client is None:
+                # HTTP/1.1 on purpose: HTTP/2 multiplexes everything onto one
+                # connection (the load problem behind app/core/supabase.py)
+                # and would make the connection limits below meaningless
+                _http_client = httpx.Client(
+                    http2=False,
+                    follow_redirects=True,
+                    timeout=Config.SUPABASE_HTTP_TIMEOUT_SECONDS,
+                    limits=httpx.Limits(
+                        max_connections=Config.SUPABASE_POOL_MAX_CONNECTIONS,
+                        max_keepalive_connections=Config.SUPABASE_POOL_MAX_KEEPALIVE,
+                        keepalive_expiry=Config.SUPABASE_POOL_KEEPALIVE_SECONDS,
+                    ),
+                )
+    return _http_client
+
+
+def _postgrest_client(key: str, access_token: str = None) -> SyncPostgrestClient:
+    url = Config.SUPABASE_URL
+    if not url or not key:
+        raise RuntimeError("SUPABASE_URL and Supabase API keys must be set in environment variables")
+
+    return SyncPostgrestClient(
+        f"{url.rstrip('/')}/rest/v1",
+        headers={
+            "apiKey": key,
+            "Authorization": f"Bearer {access_token or key}",
+        },
+        http_client=_shared_http_client(),
+    )
+
+
+def get_db_client(access_token: str = None) -> SyncPostgrestClient:
+    """
+    Returns a pooled client for table/RPC access.
+
+    With an access_token, queries run AS that user (RLS applies) —
+    same as get_supabase_client(access_token), but without creating
+    new HTTP connections. Cheap enough to build on every request.
+
+    Usage:
+        db = get_db_client(g.access_token)
+        db.table("profiles").select("*").eq("id", g.user_id).execute()
+    """
+    global _scoped_clients_served
+    _scoped_clients_served += 1
+    return _postgrest_client(Config.SUPABASE_ANON_KEY, access_token)
+
+
+def get_admin_db_client() -> SyncPostgrestClient:
+    """
+    Returns the shared, pooled SERVICE ROLE client for table/RPC access.
+
+    ⚠️  Bypasses Row Level Security, same as get_admin_supabase_client().
+    Safe to share across threads — every request copies the headers.
+    Use get_admin_supabase_client() for auth admin operations.
+    """
+    global _admin_db
+    if _admin_db is None:
+        client = _postgrest_client(Config.SUPABASE_SERVICE_ROLE_KEY)
+        with _pool_lock:
+            if _admin_db is None:
+                _admin_db = client
+    return _admin_db
+
+
+def pool_stats() -> dict:
+    """
+    Connection pool settings for /platform/observability/runtime.
+    httpx exposes no public pool counters, so only the configured limits
+    are reported.
+    """
+    return {
+        "max_connections":       Config.SUPABASE_POOL_MAX_CONNECTIONS,
+        "max_keepalive":         Config.SUPABASE_POOL_MAX_KEEPALIVE,
+        "keepalive_seconds":     Config.SUPABASE_POOL_KEEPALIVE_SECONDS,
+        "scoped_clients_served": _scoped_clients_served,
+        "initialized":           _http_client is not None,
+    }
+
+
+def get_request_supabase() -> SyncPostgrestClient:
     """
     Returns the Supabase client for the current request.
 
@@ -98,9 +203,9 @@ def get_request_supabase() -> Client:
         data = supabase.table("farms").select("*").execute()
 
     Returns:
-        The Supabase client attached to the current request context
+        The pooled (table/RPC) client attached to the current request context
     """
-    if not hasattr(g, "supabase"):
+    if getattr(g, "supabase", None) is None:
         # No authenticated user — return anon client
-        g.supabase = get_supabase_client()
-    return g.supabase
\ No newline at end of file
+        g.supabase = get_db_client()
+    return g.supabase
@@ -47,4 +47,102 @@ class Config:
     EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "huggingface")  # or bedrock 
     HUGGINGFACE_API_KEY = os.getenv("HUGGINGFACE_API_KEY")
     HUGGINGFACE_MODEL = os.getenv("HUGGINGFACE_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
-    BEDROCK_EMBEDDING_MODEL = os.getenv("BEDROCK_EMBEDDING_MODEL", "amazon.titan-embed-text-v2:0")
\ No newline at end of file
+    BEDROCK_EMBEDDING_MODEL = os.getenv("BEDROCK_EMBEDDING_MODEL", "amazon.titan-embed-text-v2:0")
+
+    # Query embedding cache — repeated questions skip the embedding API call
+    # Size is the max number of cached queries (0 = disabled)
+    EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "2048"))
+    EMBEDDING_CACHE_TTL_SECONDS = int(os.getenv("EMBEDDING_CACHE_TTL_SECONDS", "3600"))
+    # Parallel Titan calls per embed_batch() (Bedrock has no multi-input embedding API)
+    BEDROCK_EMBEDDING_CONCURRENCY = int(os.getenv("BEDROCK_EMBEDDING_CONCURRENCY", "4"))
+
+    # RAG retrieval engine
+    # "rpc"   = Supabase match_chunks RPC on every query
+    # "local" = in-process vector index loaded from knowledge_chunks at startup
+    #           (uses the RPC as fallback until the index has loaded)
+    RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "rpc")
+    # How often the local index reloads knowledge_chunks, in seconds (0 = never)
+    # New chunks from scripts/ingest.py show up after at most this long,
+    # or immediately via POST /platform/knowledge/refresh
+    LOCAL_INDEX_REFRESH_SECONDS = int(os.getenv("LOCAL_INDEX_REFRESH_SECONDS", "900"))
+
+    # Semantic answer cache — first-turn questions that embed within
+    # ANSWER_CACHE_SIMILARITY (cosine) of a recent question get the stored answer
+    # without guardrail, retrieval or completion calls
+    ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+    ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.95"))
+    # Max cached answers per language
+    ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "500"))
+    ANSWER_CACHE_TTL_SECONDS = int(os.getenv("ANSWER_CACHE_TTL_SECONDS", "21600"))
+
+    # Max concurrent RAG retrievals running alongside guardrail checks (per process)
+    CHAT_PIPELINE_WORKERS = int(os.getenv("CHAT_PIPELINE_WORKERS", "8"))
+
+    # Guardrail fast path — plain greetings skip the LLM check; every other message
+    # gets the LLM safety and topic verdict
+    GUARDRAIL_FAST_PATH_ENABLED = os.getenv("GUARDRAIL_FAST_PATH_ENABLED", "true").lower() == "true"
+    # Cached LLM guardrail verdicts, keyed on the normalized message
+    GUARDRAIL_VERDICT_CACHE_SIZE = int(os.getenv("GUARDRAIL_VERDICT_CACHE_SIZE", "2000"))
+    GUARDRAIL_VERDICT_CACHE_TTL_SECONDS = int(os.getenv("GUARDRAIL_VERDICT_CACHE_TTL_SECONDS", "86400"))
+
+    # LLM-as-judge evaluation pool — bounded so bursts can't spawn unbounded judge calls
+    EVALUATOR_WORKERS = int(os.getenv("EVALUATOR_WORKERS", "2"))
+    EVALUATOR_QUEUE_SIZE = int(os.getenv("EVALUATOR_QUEUE_SIZE", "200"))
+    # Fraction of interactions still judged once the queue is more than half full
+    EVALUATOR_SAMPLE_RATE_UNDER_LOAD = float(os.getenv("EVALUATOR_SAMPLE_RATE_UNDER_LOAD", "0.5"))
+    # evaluation_results rows per bulk insert, and max seconds a row waits
+    EVALUATOR_INSERT_BATCH_SIZE = int(os.getenv("EVALUATOR_INSERT_BATCH_SIZE", "20"))
+    EVALUATOR_FLUSH_SECONDS = float(os.getenv("EVALUATOR_FLUSH_SECONDS", "5"))
+
+    # ai_interaction_logs are queued and bulk-inserted off the request thread
+    AI_LOG_BATCH_SIZE = int(os.getenv("AI_LOG_BATCH_SIZE", "50"))
+    AI_LOG_FLUSH_SECONDS = float(os.getenv("AI_LOG_FLUSH_SECONDS", "1"))
+    AI_LOG_QUEUE_SIZE = int(os.getenv("AI_LOG_QUEUE_SIZE", "5000"))
+
+    # Usage counters (user_plans) are accumulated in memory and flushed this often
+    USAGE_FLUSH_SECONDS = float(os.getenv("USAGE_FLUSH_SECONDS", "2"))
+    # Per-user user_plans cache used by require_plan and /plans/me
+    PLAN_CACHE_TTL_SECONDS = int(os.getenv("PLAN_CACHE_TTL_SECONDS", "60"))
+    PLAN_CACHE_SIZE = int(os.getenv("PLAN_CACHE_SIZE", "10000"))
+
+    # Verified access tokens cached (by digest) until their exp
+    JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "10000"))
+    # Background JWKS re-fetch interval — keep below the 3600s key lifespan
+    JWKS_REFRESH_SECONDS = int(os.getenv("JWKS_REFRESH_SECONDS", "900"))
+    # A refreshed session is reused this long for requests still sending the old refresh
+    # token — a replay window for that token, so keep it near Supabase's reuse interval
+    SESSION_REFRESH_CACHE_SECONDS = int(os.getenv("SESSION_REFRESH_CACHE_SECONDS", "10"))
+    # Max wait for a concurrent request's in-flight refresh
+    SESSION_REFRESH_TIMEOUT_SECONDS = float(os.getenv("SESSION_REFRESH_TIMEOUT_SECONDS", "10"))
+
+    # Shared keep-alive connection pool behind get_db_client / get_admin_db_client
+    SUPABASE_POOL_MAX_CONNECTIONS = int(os.getenv("SUPABASE_POOL_MAX_CONNECTIONS", "20"))
+    SUPABASE_POOL_MAX_KEEPALIVE = int(os.getenv("SUPABASE_POOL_MAX_KEEPALIVE", "10"))
+    SUPABASE_POOL_KEEPALIVE_SECONDS = float(os.getenv("SUPABASE_POOL_KEEPALIVE_SECONDS", "60"))
+    SUPABASE_HTTP_TIMEOUT_SECONDS = float(os.getenv("SUPABASE_HTTP_TIMEOUT_SECONDS", "30"))
+
+    # FarmerService read-through caches (farms, farmers, farm lists); writes invalidate
+    FARM_CACHE_SIZE = int(os.getenv("FARM_CACHE_SIZE", "2000"))
+    FARM_CACHE_TTL_SECONDS = int(os.getenv("FARM_CACHE_TTL_SECONDS", "300"))
+
+    # One scheduler thread advances every farm's drone mission this often
+    SIMULATION_TICK_SECONDS = float(os.getenv("SIMULATION_TICK_SECONDS", "2"))
+    # Stopped/finished missions are dropped from memory after this long untouched
+    SIMULATION_IDLE_TTL_SECONDS = int(os.getenv("SIMULATION_IDLE_TTL_SECONDS", "3600"))
+
+    # drone_telemetry rows are buffered and bulk-inserted by a background flusher
+    TELEMETRY_BATCH_SIZE = int(os.getenv("TELEMETRY_BATCH_SIZE", "200"))
+    TELEMETRY_FLUSH_SECONDS = float(os.getenv("TELEMETRY_FLUSH_SECONDS", "2"))
+    # Buffer capacity; when full the oldest queued points are dropped
+    TELEMETRY_QUEUE_SIZE = int(os.getenv("TELEMETRY_QUEUE_SIZE", "10000"))
+
+    # Live drone telemetry over SSE: per-viewer buffer (a viewer this far behind is dropped)
+    DRONE_STREAM_QUEUE_SIZE = int(os.getenv("DRONE_STREAM_QUEUE_SIZE", "32"))
+    # Each open stream holds a gunicorn thread — keep below the thread count
+    DRONE_STREAM_MAX_SUBSCRIBERS = int(os.getenv("DRONE_STREAM_MAX_SUBSCRIBERS", "24"))
+    DRONE_STREAM_HEARTBEAT_SECONDS = float(os.getenv("DRONE_STREAM_HEARTBEAT_SECONDS", "15"))
+
+    # Per-farm in-memory telemetry ring for history charts (~28 bytes per point)
+    TELEMETRY_HISTORY_SIZE = int(os.getenv("TELEMETRY_HISTORY_SIZE", "2048"))
+    # Upper bound on points per series a history query may request
+    TELEMETRY_HISTORY_MAX_POINTS = int(os.getenv("TELEMETRY_HISTORY_MAX_POINTS", "1000"))
@@ -0,0 +1,13 @@
+-- =========================
+-- Incremental ingestion (scripts/ingest.py)
+-- =========================
+-- document_hash: sha256 of the source — the raw file bytes for files, the
+--                page text for URLs — stamped on every chunk once the
+--                document is fully ingested
+-- content_hash:  sha256 of the chunk text, used to skip chunks already stored
+
+ALTER TABLE knowledge_chunks ADD COLUMN IF NOT EXISTS document_hash text;
+ALTER TABLE knowledge_chunks ADD COLUMN IF NOT EXISTS content_hash text;
+
+CREATE INDEX IF NOT EXISTS knowledge_chunks_document_name_idx
+  ON knowledge_chunks (document_name);
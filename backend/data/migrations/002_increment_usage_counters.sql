@@ -0,0 +1,40 @@
+-- =========================
+-- Batched usage counters (app/services/usage_meter.py)
+-- =========================
+-- deltas: [{"user_id": "...", "column_name": "ai_assistant_used", "amount": 3}, ...]
+--
+-- Adds every delta in one UPDATE, so concurrent flushes from several
+-- workers never overwrite each other. Unknown column names are ignored.
+
+CREATE OR REPLACE FUNCTION increment_usage_counters(deltas jsonb)
+RETURNS void
+LANGUAGE sql
+SECURITY DEFINER
+AS $$
+  WITH d AS (
+    SELECT user_id, column_name, sum(amount) AS amount
+    FROM jsonb_to_recordset(deltas) AS x(user_id text, column_name text, amount int)
+    GROUP BY user_id, column_name
+  ),
+  per_user AS (
+    SELECT
+      user_id,
+      coalesce(sum(amount) FILTER (WHERE column_name = 'ai_assistant_used'), 0)    AS ai_assistant_used,
+      coalesce(sum(amount) FILTER (WHERE column_name = 'ai_farm_used'), 0)         AS ai_farm_used,
+      coalesce(sum(amount) FILTER (WHERE column_name = 'ai_experience_used'), 0)   AS ai_experience_used,
+      coalesce(sum(amount) FILTER (WHERE column_name = 'ai_story_used'), 0)        AS ai_story_used,
+      coalesce(sum(amount) FILTER (WHERE column_name = 'transformations_used'), 0) AS transformations_used
+    FROM d
+    GROUP BY user_id
+  )
+  UPDATE user_plans p SET
+    ai_assistant_used    = coalesce(p.ai_assistant_used, 0)    + u.ai_assistant_used,
+    ai_farm_used         = coalesce(p.ai_farm_used, 0)         + u.ai_farm_used,
+    ai_experience_used   = coalesce(p.ai_experience_used, 0)   + u.ai_experience_used,
+    ai_story_used        = coalesce(p.ai_story_used, 0)        + u.ai_story_used,
+    transformations_used = coalesce(p.transformations_used, 0) + u.transformations_used
+  FROM per_user u
+  WHERE p.user_id = u.user_id::uuid;  -- cast the parameter, not the indexed column
+$$;
+
+REVOKE EXECUTE ON FUNCTION increment_usage_counters(jsonb) FROM PUBLIC, anon, authenticated;
@@ -0,0 +1,166 @@
+-- =========================
+-- Observability rollups (/platform/observability/stats)
+-- =========================
+-- Running totals kept up to date by statement-level triggers, so the stats
+-- endpoint reads a handful of rows instead of scanning every log and
+-- evaluation. Logs and evaluations are inserted in batches, so each trigger
+-- aggregates the whole batch in one upsert.
+-- Rows deleted from the source tables are not subtracted.
+
+CREATE TABLE IF NOT EXISTS ai_interaction_rollups (
+  day             date   NOT NULL,
+  source          text   NOT NULL,
+  interactions    bigint NOT NULL DEFAULT 0,
+  latency_ms_sum  bigint NOT NULL DEFAULT 0,
+  rag_hits        bigint NOT NULL DEFAULT 0,
+  PRIMARY KEY (day, source)
+);
+
+-- Single row: evaluation scores are only ever reported as all-time averages
+CREATE TABLE IF NOT EXISTS evaluation_rollups (
+  id                      boolean PRIMARY KEY DEFAULT true CHECK (id),
+  evaluations             bigint  NOT NULL DEFAULT 0,
+  low_score_count         bigint  NOT NULL DEFAULT 0,
+  faithfulness_sum        numeric NOT NULL DEFAULT 0,
+  faithfulness_count      bigint  NOT NULL DEFAULT 0,
+  answer_relevance_sum    numeric NOT NULL DEFAULT 0,
+  answer_relevance_count  bigint  NOT NULL DEFAULT 0,
+  context_precision_sum   numeric NOT NULL DEFAULT 0,
+  context_precision_count bigint  NOT NULL DEFAULT 0,
+  completeness_sum        numeric NOT NULL DEFAULT 0,
+  completeness_count      bigint  NOT NULL DEFAULT 0,
+  safety_sum              numeric NOT NULL DEFAULT 0,
+  safety_count            bigint  NOT NULL DEFAULT 0,
+  avg_score_sum           numeric NOT NULL DEFAULT 0,
+  avg_score_count         bigint  NOT NULL DEFAULT 0
+);
+
+-- ---------- triggers ----------
+
+CREATE OR REPLACE FUNCTION rollup_ai_interactions() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  INSERT INTO ai_interaction_rollups AS r (day, source, interactions, latency_ms_sum, rag_hits)
+  SELECT
+    (coalesce(created_at, now()) AT TIME ZONE 'UTC')::date,
+    coalesce(source, 'unknown'),
+    count(*),
+    coalesce(sum(latency_ms), 0),
+    count(*) FILTER (WHERE rag_hit)
+  FROM new_rows
+  GROUP BY 1, 2
+  ON CONFLICT (day, source) DO UPDATE SET
+    interactions   = r.interactions   + excluded.interactions,
+    latency_ms_sum = r.latency_ms_sum + excluded.latency_ms_sum,
+    rag_hits       = r.rag_hits       + excluded.rag_hits;
+  RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS ai_interaction_logs_rollup ON ai_interaction_logs;
+CREATE TRIGGER ai_interaction_logs_rollup
+  AFTER INSERT ON ai_interaction_logs
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION rollup_ai_interactions();
+
+CREATE OR REPLACE FUNCTION rollup_evaluations() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  INSERT INTO evaluation_rollups AS r (
+    id, evaluations, low_score_count,
+    faithfulness_sum, faithfulness_count,
+    answer_relevance_sum, answer_relevance_count,
+    context_precision_sum, context_precision_count,
+    completeness_sum, completeness_count,
+    safety_sum, safety_count,
+    avg_score_sum, avg_score_count
+  )
+  SELECT
+    true,
+    count(*),
+    count(*) FILTER (WHERE avg_score < 0.6),
+    coalesce(sum(faithfulness), 0),      count(faithfulness),
+    coalesce(sum(answer_relevance), 0),  count(answer_relevance),
+    -- context_precision only counts on RAG evaluations (faithfulness present)
+    coalesce(sum(context_precision) FILTER (WHERE faithfulness IS NOT NULL), 0),
+    count(context_precision) FILTER (WHERE faithfulness IS NOT NULL),
+    coalesce(sum(completeness), 0),      count(completeness),
+    coalesce(sum(safety), 0),            count(safety),
+    coalesce(sum(avg_score), 0),         count(avg_score)
+  FROM new_rows
+  ON CONFLICT (id) DO UPDATE SET
+    evaluations             = r.evaluations             + excluded.evaluations,
+    low_score_count         = r.low_score_count         + excluded.low_score_count,
+    faithfulness_sum        = r.faithfulness_sum        + excluded.faithfulness_sum,
+    faithfulness_count      = r.faithfulness_count      + excluded.faithfulness_count,
+    answer_relevance_sum    = r.answer_relevance_sum    + excluded.answer_relevance_sum,
+    answer_relevance_count  = r.answer_relevance_count  + excluded.answer_relevance_count,
+    context_precision_sum   = r.context_precision_sum   + excluded.context_precision_sum,
+    context_precision_count = r.context_precision_count + excluded.context_precision_count,
+    completeness_sum        = r.completeness_sum        + excluded.completeness_sum,
+    completeness_count      = r.completeness_count      + excluded.completeness_count,
+    safety_sum              = r.safety_sum              + excluded.safety_sum,
+    safety_count            = r.safety_count            + excluded.safety_count,
+    avg_score_sum           = r.avg_score_sum           + excluded.avg_score_sum,
+    avg_score_count         = r.avg_score_count         + excluded.avg_score_count;
+  RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS evaluation_results_rollup ON evaluation_results;
+CREATE TRIGGER evaluation_results_rollup
+  AFTER INSERT ON evaluation_results
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION rollup_evaluations();
+
+-- ---------- totals read by the endpoint ----------
+
+CREATE OR REPLACE FUNCTION observability_totals(p_today date)
+RETURNS jsonb
+LANGUAGE sql STABLE AS $$
+  SELECT jsonb_build_object(
+    'interactions',       coalesce(sum(i.interactions), 0),
+    'today_interactions', coalesce(sum(i.interactions) FILTER (WHERE i.day = p_today), 0),
+    'latency_ms_sum',     coalesce(sum(i.latency_ms_sum), 0),
+    'rag_hits',           coalesce(sum(i.rag_hits), 0),
+    'web_count',          coalesce(sum(i.interactions) FILTER (WHERE i.source = 'web'), 0),
+    'whatsapp_count',     coalesce(sum(i.interactions) FILTER (WHERE i.source = 'whatsapp'), 0),
+    'evaluations',        (SELECT to_jsonb(e) - 'id' FROM evaluation_rollups e)
+  )
+  FROM ai_interaction_rollups i;
+$$;
+
+-- ---------- backfill existing history ----------
+-- Runs in the migration's transaction; the triggers above only see new rows.
+
+TRUNCATE ai_interaction_rollups, evaluation_rollups;
+
+INSERT INTO ai_interaction_rollups (day, source, interactions, latency_ms_sum, rag_hits)
+SELECT
+  (coalesce(created_at, now()) AT TIME ZONE 'UTC')::date,
+  coalesce(source, 'unknown'),
+  count(*),
+  coalesce(sum(latency_ms), 0),
+  count(*) FILTER (WHERE rag_hit)
+FROM ai_interaction_logs
+GROUP BY 1, 2;
+
+INSERT INTO evaluation_rollups (
+  id, evaluations, low_score_count,
+  faithfulness_sum, faithfulness_count,
+  answer_relevance_sum, answer_relevance_count,
+  context_precision_sum, context_precision_count,
+  completeness_sum, completeness_count,
+  safety_sum, safety_count,
+  avg_score_sum, avg_score_count
+)
+SELECT
+  true,
+  count(*),
+  count(*) FILTER (WHERE avg_score < 0.6),
+  coalesce(sum(faithfulness), 0),      count(faithfulness),
+  coalesce(sum(answer_relevance), 0),  count(answer_relevance),
+  coalesce(sum(context_precision) FILTER (WHERE faithfulness IS NOT NULL), 0),
+  count(context_precision) FILTER (WHERE faithfulness IS NOT NULL),
+  coalesce(sum(completeness), 0),      count(completeness),
+  coalesce(sum(safety), 0),            count(safety),
+  coalesce(sum(avg_score), 0),         count(avg_score)
+FROM evaluation_results;
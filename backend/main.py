@@ -1,34 +1,16 @@
 from app import create_app
 import threading
-import time
 
-from app.services.simulation.telemetry_emitter import telemetry_engine
-from app.services.simulation.sim_state import SIMULATION_STATE
+from app.services.simulation.scheduler import simulation_scheduler
 
 app = create_app()
 
-# # --- Digital Twin Simulation ---
-def simulation_loop():
-    while True:
-        if not SIMULATION_STATE["mission"]["is_running"]:
-            time.sleep(1)
-            continue
-
-        telemetry = telemetry_engine.generate_telemetry()
-
-        if telemetry:
-            # For now: log
-            print("[SIMULATION]", telemetry)
-        time.sleep(2)
-
+# --- Digital Twin Simulation ---
+# One scheduler thread advances every farm's drone mission
 
 # Start simulation ONLY once (important for Flask reloads)
 if not app.debug or not threading.current_thread().name == "MainThread":
-    simulation_thread = threading.Thread(
-        target=simulation_loop,
-        daemon=True
-    )
-    simulation_thread.start()
+    simulation_scheduler.start()
 
 # --- Flask App Runner ---
 if __name__ == "__main__":
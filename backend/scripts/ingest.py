@@ -1,6 +1,13 @@
 from app.services.ai.embeddings.factory import get_embedding_provider
 from app.core.supabase import supabase
 import os
+import time
+import hashlib
+from collections.abc import Iterable, Iterator
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
 from docx import Document
 from pypdf import PdfReader
 from bs4 import BeautifulSoup
@@ -9,19 +16,86 @@ import nltk
 
 nltk.download("punkt_tab", quiet=True)
 
-def load_document(file_path: str) -> str:
+# PDF pages handed to each extraction worker per task
+PDF_PAGES_PER_TASK = 8
+# Below this many pages a process pool costs more than it saves
+PDF_PARALLEL_MIN_PAGES = 16
+
+
+# Each extraction process parses the PDF once, in _open_pdf, not once per task
+_worker_reader = None
+
+
+def _open_pdf(file_path: str):
+    """Process pool initializer."""
+    global _worker_reader
+    _worker_reader = PdfReader(file_path)
+
+
+def _extract_pdf_pages(start: int, stop: int, reader: PdfReader = None) -> list[str]:
+    """Extract text for pages [start, stop) — in a worker process unless a reader is given."""
+    if reader is None:
+        reader = _worker_reader
+    texts = []
+    for page in reader.pages[start:stop]:
+        text = page.extract_text()
+        if text:
+            texts.append(text)
+    return texts
+
+
+def _iter_pdf(file_path: str) -> Iterator[str]:
+    """
+    Yield PDF text page by page, in order.
+    Extraction runs across a process pool; only a window of tasks is in
+    flight at once, so extracted-but-unconsumed pages stay bounded.
+    """
+    reader = PdfReader(file_path)
+    page_count = len(reader.pages)
+    if page_count < PDF_PARALLEL_MIN_PAGES:
+        yield from _extract_pdf_pages(0, page_count, reader)
+        return
+    del reader  # workers open their own
+
+    workers = min(os.cpu_count() or 1, -(-page_count // PDF_PAGES_PER_TASK))
+    ranges = iter(
+        (start, min(start + PDF_PAGES_PER_TASK, page_count))
+        for start in range(0, page_count, PDF_PAGES_PER_TASK)
+    )
+    with ProcessPoolExecutor(max_workers=workers, initializer=_open_pdf, initargs=(file_path,)) as pool:
+        in_flight = deque(
+            pool.submit(_extract_pdf_pages, start, stop)
+            for start, stop in islice(ranges, workers * 2)
+        )
+        while in_flight:
+            texts = in_flight.popleft().result()
+            next_range = next(ranges, None)
+            if next_range:
+                in_flight.append(pool.submit(_extract_pdf_pages, *next_range))
+            yield from texts
+
+
+def iter_document(file_path: str) -> Iterator[str]:
+    """
+    Yield a document's text in pieces (pages for PDF, blocks of lines for
+    text, paragraphs for DOCX) instead of building the whole string.
+    """
     ext = os.path.splitext(file_path)[1].lower()
     if ext in [".txt", ".md"]:
         with open(file_path, "r", encoding="utf-8") as file:
-            return file.read()
+            while block := "".join(islice(file, 200)):
+                yield block
     elif ext == ".pdf":
-        reader = PdfReader(file_path)
-        return "\n".join(page.extract_text() for page in reader.pages if page.extract_text())
+        yield from _iter_pdf(file_path)
     elif ext == ".docx":
         doc = Document(file_path)            
-        return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
+        yield from (p.text for p in doc.paragraphs if p.text.strip())
     else:
         raise ValueError(f"Unsupported file format: {ext}")
+
+
+def load_document(file_path: str) -> str:
+    return "\n".join(iter_document(file_path))
     
 def load_from_url(url: str) -> str:
     response = requests.get(url)
@@ -43,108 +117,388 @@ def load_from_url(url: str) -> str:
 #             break
 #         chunks.append(chunk)
 #     return chunks
-def chunk_text(text: str, chunk_size: int = 500, overlap: int = 1) -> list[str]:
+def _split_long(sentence: str, chunk_size: int) -> Iterator[str]:
+    """Hard-splits a "sentence" longer than chunk_size, preferring whitespace."""
+    while len(sentence) > chunk_size:
+        cut = sentence.rfind(" ", chunk_size // 2, chunk_size + 1)
+        if cut <= 0:
+            cut = chunk_size
+        yield sentence[:cut].strip()
+        sentence = sentence[cut:].strip()
+    if sentence:
+        yield sentence
+
+
+def iter_chunks(texts: Iterable[str], chunk_size: int = 500, overlap: int = 1) -> Iterator[str]:
     """
-    Sentence aware chunking.
+    Streaming sentence aware chunking.
     
     Splits text into sentences first, then groups sentences into chunks
     until chunk_size (in characters) is reached. Overlap is in sentences,
     not characters, so chunks always start and end on complete thoughts.
+
+    Text arrives in pieces (e.g. PDF pages). The last sentence of each piece
+    is held back and joined with the next piece, since a sentence can run
+    across a page break. Only one piece is tokenized at a time. Text with no
+    sentence boundaries is hard-split at chunk_size instead of carried.
     
     Args:
-        text: Raw document text
+        texts: Document text, in order, in any number of pieces
         chunk_size: Max characters per chunk
         overlap: Number of sentences to carry over into the next chunk
         
-    Returns:
-        List of clean, complete sentence chunks
+    Yields:
+        Clean, complete sentence chunks
     """
-    sentences = nltk.sent_tokenize(text)
-    sentences = [s.strip() for s in sentences if s.strip()]
-
-    chunks = []
     current_sentences = []
     current_length = 0
 
-    for sentence in sentences:
+    def add(sentence: str):
+        nonlocal current_sentences, current_length
         sentence_length = len(sentence)
+        chunk = None
 
         # If adding this sentence exceeds chunk_size AND we already have content,
-        # save current chunk and start a new one with overlap
+        # emit current chunk and start a new one with overlap
         if current_length + sentence_length > chunk_size and current_sentences:
             chunk = " ".join(current_sentences)
-            if len(chunk) >= 50:
-                chunks.append(chunk)
             # Carry last `overlap` sentences into next chunk
             current_sentences = current_sentences[-overlap:] if overlap else []
             current_length = sum(len(s) for s in current_sentences)
 
         current_sentences.append(sentence)
         current_length += sentence_length
+        return chunk
+
+    carry = ""
+    for text in texts:
+        sentences = nltk.sent_tokenize(f"{carry}\n{text}" if carry else text)
+        sentences = [s.strip() for s in sentences if s.strip()]
+        carry = sentences.pop() if sentences else carry
+        if len(carry) > chunk_size:
+            # No sentence boundary in sight (tables, OCR output) — stop carrying
+            # it, or every later piece re-tokenizes an ever-growing string
+            sentences.append(carry)
+            carry = ""
+        for sentence in sentences:
+            for piece in _split_long(sentence, chunk_size):
+                chunk = add(piece)
+                if chunk and len(chunk) >= 50:
+                    yield chunk
+
+    if carry:
+        for piece in _split_long(carry, chunk_size):
+            chunk = add(piece)
+            if chunk and len(chunk) >= 50:
+                yield chunk
 
     # The last remaining chunk
     if current_sentences:
         chunk = " ".join(current_sentences)
         if len(chunk) >= 50:
-            chunks.append(chunk)
+            yield chunk
+
+
+def chunk_text(text: str, chunk_size: int = 500, overlap: int = 1) -> list[str]:
+    """Chunk a whole string at once — see iter_chunks()."""
+    return list(iter_chunks([text], chunk_size, overlap))
+
+# Chunks per embed_batch() call and rows per knowledge_chunks insert
+EMBED_BATCH_SIZE = 32
+INSERT_BATCH_SIZE = 100
+
+
+@dataclass
+class IngestStats:
+    """Running totals for one ingestion run — used for progress and the final summary."""
+    chunks: int = 0
+    embedded: int = 0
+    inserted: int = 0
+    failed: int = 0
+    kept: int = 0
+    removed: int = 0
+    started_at: float = field(default_factory=time.time)
+
+    @property
+    def chunks_per_sec(self) -> float:
+        elapsed = time.time() - self.started_at
+        return self.embedded / elapsed if elapsed > 0 else 0.0
+
+    def add(self, other: "IngestStats"):
+        self.chunks += other.chunks
+        self.embedded += other.embedded
+        self.inserted += other.inserted
+        self.failed += other.failed
+        self.kept += other.kept
+        self.removed += other.removed
+
+    def summary(self) -> str:
+        return (
+            f"{self.inserted}/{self.chunks} chunks inserted, {self.kept} kept, "
+            f"{self.removed} removed, {self.failed} failed "
+            f"in {time.time() - self.started_at:.1f}s ({self.chunks_per_sec:.1f} chunks/sec)"
+        )
+
+
+def _batched(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _embed_batch(provider, texts: list[str], stats: IngestStats) -> list:
+    """
+    Embed a batch. If the batch call fails, retry chunk by chunk so one bad
+    chunk doesn't lose the whole batch. Failed chunks come back as None.
+    """
+    try:
+        return provider.embed_batch(texts)
+    except Exception as e:
+        print(f"Batch embedding failed, retrying one by one: {e}")
+
+    embeddings = []
+    for text in texts:
+        try:
+            embeddings.append(provider.embed(text))
+        except Exception as e:
+            print(f"Failed chunk: {e}")
+            stats.failed += 1
+            embeddings.append(None)
+    return embeddings
+
+
+def _insert_rows(rows: list[dict]) -> tuple[int, int]:
+    """Runs on the insert thread. Returns (inserted, failed) for the caller to merge."""
+    try:
+        supabase.table("knowledge_chunks").insert(rows).execute()
+        return len(rows), 0
+    except Exception as e:
+        print(f"Failed to insert {len(rows)} chunks: {e}")
+        return 0, len(rows)
+
+
+def embed_and_insert(chunks: Iterable[tuple[int, str]], base_row: dict, provider) -> IngestStats:
+    """
+    Two-stage pipeline: embed chunks in batches on this thread while the
+    previous group of rows is bulk-inserted on a background thread.
+    At most one insert is in flight, so memory stays bounded. Only this
+    thread touches `stats` — insert counts are merged as each insert finishes.
+    """
+    stats = IngestStats()
+    rows = []
+    pending_insert = None
+
+    def wait():
+        nonlocal pending_insert
+        if pending_insert:
+            inserted, failed = pending_insert.result()
+            stats.inserted += inserted
+            stats.failed += failed
+            pending_insert = None
+
+    def submit(pool, rows):
+        nonlocal pending_insert
+        wait()
+        pending_insert = pool.submit(_insert_rows, rows)
+
+    with ThreadPoolExecutor(max_workers=1) as insert_pool:
+        for batch in _batched(chunks, EMBED_BATCH_SIZE):
+            stats.chunks += len(batch)
+            embeddings = _embed_batch(provider, [chunk for _, chunk in batch], stats)
+
+            for (index, chunk), embedding in zip(batch, embeddings):
+                if not embedding:
+                    continue
+                stats.embedded += 1
+                rows.append({
+                    **base_row,
+                    "content": chunk,
+                    "content_hash": content_hash(chunk),
+                    "embedding": embedding,
+                    "chunk_index": index,
+                })
+
+            if len(rows) >= INSERT_BATCH_SIZE:
+                submit(insert_pool, rows)
+                rows = []
+
+            print(f"Embedded {stats.embedded}/{stats.chunks} chunks ({stats.chunks_per_sec:.1f} chunks/sec)")
+
+        if rows:
+            submit(insert_pool, rows)
+        wait()
+
+    return stats
+
+def content_hash(text: str) -> str:
+    """Stable hash for a document or chunk — same text, same hash, across runs."""
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
 
-    return chunks
 
-def ingest(file_path: str, category: str, target_audience: str, provider):
+def _existing_chunks(document_name: str) -> list[dict]:
+    """All stored chunks for a document (no embeddings — they aren't needed to diff)."""
+    rows = []
+    start = 0
+    while True:
+        result = (
+            supabase.table("knowledge_chunks")
+            .select("id, content, content_hash, document_hash")
+            .eq("document_name", document_name)
+            .range(start, start + 999)
+            .execute()
+        )
+        page = result.data or []
+        rows.extend(page)
+        if len(page) < 1000:
+            return rows
+        start += 1000
+
+
+def _delete_chunks(ids: list, stats: IngestStats):
+    for batch in _batched(ids, INSERT_BATCH_SIZE):
+        try:
+            supabase.table("knowledge_chunks").delete().in_("id", batch).execute()
+            stats.removed += len(batch)
+        except Exception as e:
+            print(f"Failed to remove {len(batch)} chunks: {e}")
+
+def file_hash(file_path: str) -> str:
+    """Hash of the raw file bytes, read in blocks — no text extraction needed."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        while block := file.read(1 << 20):
+            digest.update(block)
+    return digest.hexdigest()
+
+def ingest(file_path: str, category: str, target_audience: str, provider, dry_run: bool = False) -> IngestStats:
     document_name = os.path.basename(file_path)
-    content = load_document(file_path)
-    print(f"Loaded {len(content)} characters")
-    ingest_content(content, document_name, category, target_audience, provider)
+    # Text is only extracted (lazily, page by page) if the file changed
+    chunks = iter_chunks(iter_document(file_path))
+    return ingest_chunks(chunks, document_name, file_hash(file_path), category, target_audience, provider, dry_run)
     
-def ingest_content(content: str, document_name: str, category: str, target_audience: str, provider):
-    chunks = chunk_text(content)
-    print(f"Created {len(chunks)} chunks")
-    for index, chunk in enumerate(chunks):
+def ingest_content(content: str, document_name: str, category: str, target_audience: str, provider, dry_run: bool = False) -> IngestStats:
+    chunks = iter_chunks([content])
+    return ingest_chunks(chunks, document_name, content_hash(content), category, target_audience, provider, dry_run)
+
+def ingest_chunks(
+    chunks: Iterable[str],
+    document_name: str,
+    document_hash: str,
+    category: str,
+    target_audience: str,
+    provider,
+    dry_run: bool = False,
+) -> IngestStats:
+    """
+    Incremental ingestion of one document.
+
+    - Document hash unchanged → chunks are never even read, every stored chunk is kept
+    - Document changed → only chunks whose hash is new get embedded and
+      inserted; stored chunks no longer in the document are removed
+    - dry_run → report what would be added/kept/removed, write nothing
+
+    Chunks are consumed as a stream; only their hashes are kept in memory.
+    """
+    existing = _existing_chunks(document_name)
+
+    if existing and all(row.get("document_hash") == document_hash for row in existing):
+        stats = IngestStats(kept=len(existing))
+        print(f"{document_name}: unchanged, {stats.kept} chunks kept")
+        return stats
+
+    # Rows from before hashes were stored have no content_hash — hash their content
+    existing_by_hash = {
+        row.get("content_hash") or content_hash(row["content"]): row["id"]
+        for row in existing
+    }
+
+    seen = set()
+
+    def new_chunks():
+        for index, chunk in enumerate(chunks):
+            chunk_hash = content_hash(chunk)
+            if chunk_hash in seen:
+                continue
+            seen.add(chunk_hash)
+            if chunk_hash not in existing_by_hash:
+                yield index, chunk
+
+    def removals() -> list:
+        # Only valid once new_chunks() has been fully consumed
+        to_remove = [row_id for chunk_hash, row_id in existing_by_hash.items() if chunk_hash not in seen]
+        # Duplicate rows from earlier non-incremental runs are removed too
+        duplicate_ids = {row["id"] for row in existing} - set(existing_by_hash.values())
+        return to_remove + list(duplicate_ids)
+
+    if dry_run:
+        added = sum(1 for _ in new_chunks())
+        to_remove = removals()
+        kept = len(existing) - len(to_remove)
+        stats = IngestStats(chunks=added, kept=kept, removed=len(to_remove))
+        print(f"[DRY RUN] {document_name}: would add {added}, keep {kept}, remove {len(to_remove)} chunks")
+        return stats
+
+    base_row = {
+        "document_name": document_name,
+        "category": category,
+        "target_audience": target_audience,
+    }
+    # Insert new chunks before removing old ones, so retrieval never sees the document missing
+    stats = embed_and_insert(new_chunks(), base_row, provider)
+    to_remove = removals()
+    stats.kept = len(existing) - len(to_remove)
+    _delete_chunks(to_remove, stats)
+
+    # Stamp every row with this version's hash — only once all chunks made it in,
+    # so a partially failed run is retried next time instead of marked unchanged
+    if not stats.failed:
         try:
-            embedding = provider.embed(chunk)
-            supabase.table("knowledge_chunks").insert({
-                "content": chunk,
-                "embedding": embedding,
-                "document_name": document_name,
-                "category": category,
-                "target_audience": target_audience,
-                "chunk_index": index
-            }).execute()
-            print(f"Inserted chunk {index + 1}/{len(chunks)}")
+            (
+                supabase.table("knowledge_chunks")
+                .update({"document_hash": document_hash})
+                .eq("document_name", document_name)
+                .execute()
+            )
         except Exception as e:
-            print(f"Failed chunk {index + 1}: {e}")
-            continue
+            print(f"Failed to update document hash for {document_name}: {e}")
+
+    print(f"{document_name}: {stats.summary()}")
+    return stats
 
-def ingest_folder(folder_path: str, category: str, target_audience: str, provider):
+def ingest_folder(folder_path: str, category: str, target_audience: str, provider, dry_run: bool = False) -> IngestStats:
     supported = [".txt", ".md", ".pdf", ".docx"]
     files = [f for f in os.listdir(folder_path) if os.path.splitext(f)[1].lower() in supported]
     print(f"Found {len(files)} files")    
+    total = IngestStats()
     for file in files:
         file_path = os.path.join(folder_path, file)
         try:
-            ingest(file_path, category, target_audience, provider)
+            total.add(ingest(file_path, category, target_audience, provider, dry_run))
             print(f"Ingestion completed for file {file}")
         except Exception as e:
             print(f"Failed file {file}: {e}")
             continue
+    print(f"Folder total: {total.summary()}")
+    return total
     
 def main():
     mode = input("Ingest single file or folder or Webpage URL? (file/folder/url): ").strip().lower()
     path = input("Enter path: ").strip()
     category = input("Enter category: ").strip()
     audience = input("Enter target audience: ").strip()
-    provider = get_embedding_provider()
+    dry_run = input("Dry run — only report changes? (y/N): ").strip().lower() == "y"
+    provider = get_embedding_provider(cached=False)
     
     try:
         if mode == "folder":
-            ingest_folder(path, category, audience, provider)
+            ingest_folder(path, category, audience, provider, dry_run)
             # ingest("C:\\Users\\Dell\\Desktop\\test_doc.txt", "category", "audience")
         elif mode == "file":
-            ingest(path, category, audience, provider)
+            ingest(path, category, audience, provider, dry_run)
         elif mode == "url":
             content = load_from_url(path)
-            ingest_content(content, path, category, audience, provider)
-        print("Ingestion complete.")
+            ingest_content(content, path, category, audience, provider, dry_run)
+        print("Dry run complete." if dry_run else "Ingestion complete.")
     except FileNotFoundError:
         print("Error: Path not found.")
     except Exception as e:
@@ -0,0 +1,50 @@
+import pytest
+from app.services.ai import answer_cache as answer_cache_module
+from app.services.ai.answer_cache import SemanticAnswerCache
+
+
+@pytest.fixture
+def cache():
+    return SemanticAnswerCache(similarity_threshold=0.95, max_entries=2, ttl_seconds=60)
+
+
+def test_close_question_hits_and_far_question_misses(cache):
+    cache.store("en", [1.0, 0.0, 0.0], {"answer": "A"})
+    assert cache.lookup("en", [0.99, 0.05, 0.0]) == {"answer": "A"}
+    assert cache.lookup("en", [0.5, 0.5, 0.0]) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_languages_never_share_answers(cache):
+    cache.store("en", [1.0, 0.0], {"answer": "English"})
+    assert cache.lookup("ur", [1.0, 0.0]) is None
+
+
+def test_oldest_entry_is_overwritten_when_full(cache):
+    cache.store("en", [1.0, 0.0, 0.0], {"answer": "first"})
+    cache.store("en", [0.0, 1.0, 0.0], {"answer": "second"})
+    cache.store("en", [0.0, 0.0, 1.0], {"answer": "third"})
+    assert cache.lookup("en", [1.0, 0.0, 0.0]) is None
+    assert cache.lookup("en", [0.0, 0.0, 1.0]) == {"answer": "third"}
+
+
+def test_entries_expire(cache, monkeypatch):
+    cache.store("en", [1.0, 0.0], {"answer": "A"})
+    now = answer_cache_module.time.time()
+    monkeypatch.setattr(answer_cache_module.time, "time", lambda: now + 61)
+    assert cache.lookup("en", [1.0, 0.0]) is None
+
+
+def test_dimension_change_and_clear(cache):
+    cache.store("en", [1.0, 0.0], {"answer": "A"})
+    assert cache.lookup("en", [1.0, 0.0, 0.0]) is None
+    cache.clear()
+    assert cache.lookup("en", [1.0, 0.0]) is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_zero_or_empty_embeddings_are_ignored(cache):
+    cache.store("en", [], {"answer": "A"})
+    cache.store("en", [0.0, 0.0], {"answer": "B"})
+    assert cache.lookup("en", [0.0, 0.0]) is None
+    assert cache.stats()["entries"] == {}
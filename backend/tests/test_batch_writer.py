@@ -0,0 +1,76 @@
+import threading
+import time
+from app.utils.batch_writer import BatchWriter
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_flushes_when_batch_is_full():
+    batches = []
+    writer = BatchWriter("t", batches.append, max_batch=3, flush_interval=60)
+    for i in range(7):
+        writer.submit(i)
+    assert _wait_for(lambda: len(batches) == 2)
+    assert batches == [[0, 1, 2], [3, 4, 5]]
+    writer.close()
+    assert batches[-1] == [6]
+
+
+def test_flushes_partial_batch_after_interval():
+    batches = []
+    writer = BatchWriter("t", batches.append, max_batch=100, flush_interval=0.05)
+    writer.submit("a")
+    assert _wait_for(lambda: batches == [["a"]])
+    writer.close()
+
+
+def test_failed_flush_is_counted_and_writer_keeps_going():
+    calls = []
+
+    def flush(batch):
+        calls.append(batch)
+        if len(calls) == 1:
+            raise RuntimeError("db down")
+
+    writer = BatchWriter("t", flush, max_batch=2, flush_interval=60)
+    for i in range(4):
+        writer.submit(i)
+    writer.close()
+    assert calls == [[0, 1], [2, 3]]
+    stats = writer.stats()
+    assert (stats["failed"], stats["flushed"], stats["batches"]) == (2, 2, 2)
+
+
+def test_full_queue_drops_newest_by_default():
+    release = threading.Event()
+    flushed = []
+    writer = BatchWriter("t", lambda b: (release.wait(5), flushed.extend(b)), max_batch=1, flush_interval=60, max_queue=2)
+    writer.submit(0)
+    assert _wait_for(lambda: writer.stats()["queue_depth"] == 0)  # 0 is being flushed
+    results = [writer.submit(i) for i in (1, 2, 3)]
+    release.set()
+    writer.close()
+    assert results == [True, True, False]
+    assert flushed == [0, 1, 2]
+    assert writer.stats()["dropped"] == 1
+
+
+def test_drop_oldest_keeps_newest_items():
+    release = threading.Event()
+    flushed = []
+    writer = BatchWriter("t", lambda b: (release.wait(5), flushed.extend(b)), max_batch=1, flush_interval=60, max_queue=2, drop_oldest=True)
+    writer.submit(0)
+    assert _wait_for(lambda: writer.stats()["queue_depth"] == 0)
+    results = [writer.submit(i) for i in (1, 2, 3, 4)]
+    release.set()
+    writer.close()
+    assert results == [True] * 4
+    assert flushed == [0, 3, 4]
+    assert writer.stats()["dropped"] == 2
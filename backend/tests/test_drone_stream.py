@@ -0,0 +1,54 @@
+import pytest
+from flask import Flask, g
+from app.api import drone
+from app.services.simulation.telemetry_broadcaster import TelemetryBroadcaster
+
+
+@pytest.fixture
+def client(monkeypatch):
+    broadcaster = TelemetryBroadcaster(queue_size=4, max_subscribers=2)
+    monkeypatch.setattr(drone, "telemetry_broadcaster", broadcaster)
+    owner = type("Loader", (), {"verify_ownership": lambda self, farm_id: True})()
+    monkeypatch.setattr(drone, "get_farm_loader", lambda: owner)
+    monkeypatch.setattr(drone.Config, "DRONE_STREAM_HEARTBEAT_SECONDS", 0.05)
+
+    app = Flask(__name__)
+    app.register_blueprint(drone.drone_bp)
+
+    @app.before_request
+    def fake_auth():
+        g.user = {"id": "u1"}
+        g.user_id = "u1"
+
+    return app.test_client(), broadcaster
+
+
+def test_head_requests_release_their_subscription(client):
+    client, broadcaster = client
+    for _ in range(3):
+        assert client.head("/farms/f1/drone/stream").status_code == 200
+    assert broadcaster.subscriber_count() == 0
+
+
+def test_closed_stream_releases_its_subscription(client):
+    client, broadcaster = client
+    response = client.get("/farms/f1/drone/stream", buffered=False)
+    assert broadcaster.subscriber_count("f1") == 1
+
+    broadcaster.publish("f1", {"zone_id": 3})
+    frames = [frame for frame, _ in zip(response.response, range(5))]
+    assert b'data: {"zone_id": 3}\n\n' in frames
+
+    response.close()
+    assert broadcaster.subscriber_count() == 0
+
+
+def test_full_broadcaster_returns_503(client):
+    client, broadcaster = client
+    open_streams = [client.get("/farms/f1/drone/stream", buffered=False) for _ in range(2)]
+    assert client.get("/farms/f1/drone/stream", buffered=False).status_code == 503
+    # Streams keep their request context pushed; close them innermost first
+    for response in reversed(open_streams):
+        response.close()
+    assert broadcaster.subscriber_count() == 0
+    assert broadcaster.stats()["rejected"] == 1
@@ -0,0 +1,47 @@
+from app.services.ai.embeddings.cached import CachedEmbeddingProvider
+from app.utils.ttl_cache import TTLCache
+
+
+class CountingProvider:
+    def __init__(self):
+        self.single = []
+        self.batches = []
+
+    def embed(self, text):
+        self.single.append(text)
+        return [float(len(text))]
+
+    def embed_batch(self, texts):
+        self.batches.append(list(texts))
+        return [[float(len(t))] for t in texts]
+
+
+def test_normalized_text_hits_the_cache():
+    provider = CountingProvider()
+    cached = CachedEmbeddingProvider(provider, TTLCache(max_size=10, ttl_seconds=60))
+    first = cached.embed("How do I start  Agritourism")
+    second = cached.embed("  how do i start agritourism ")
+    assert first == second
+    assert len(provider.single) == 1
+
+
+def test_batch_only_fetches_missing_texts():
+    provider = CountingProvider()
+    cached = CachedEmbeddingProvider(provider, TTLCache(max_size=10, ttl_seconds=60))
+    cached.embed("soil")
+    result = cached.embed_batch(["soil", "compost", "SOIL"])
+    assert provider.batches == [["compost"]]
+    assert result == [[4.0], [7.0], [4.0]]
+
+
+def test_empty_embeddings_are_not_cached():
+    class EmptyProvider(CountingProvider):
+        def embed(self, text):
+            self.single.append(text)
+            return []
+
+    provider = EmptyProvider()
+    cached = CachedEmbeddingProvider(provider, TTLCache(max_size=10, ttl_seconds=60))
+    cached.embed("x")
+    cached.embed("x")
+    assert len(provider.single) == 2
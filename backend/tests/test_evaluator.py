@@ -0,0 +1,25 @@
+import threading
+from app.services.ai import evaluator as evaluator_module
+from app.services.ai.evaluator import EvaluatorService
+
+
+def test_worker_survives_a_failing_job(monkeypatch):
+    monkeypatch.setattr(evaluator_module.Config, "EVALUATOR_WORKERS", 1)
+    service = EvaluatorService()
+    done = threading.Event()
+    handled = []
+
+    def evaluate(log_id, user_message, ai_response):
+        handled.append(log_id)
+        if log_id == "bad":
+            raise RuntimeError("provider exploded")
+        done.set()
+
+    monkeypatch.setattr(service, "evaluate_no_context_async", evaluate)
+    assert service.submit("bad", "q", "a")
+    assert service.submit("good", "q", "a")
+
+    assert done.wait(5)
+    assert handled == ["bad", "good"]
+    assert service._threads[0].is_alive()
+    assert service.stats()["failed"] == 1
@@ -0,0 +1,43 @@
+import pytest
+from flask import Flask, g
+from app.api import farm as farm_api
+from app.services import farm_loader
+
+FARMS = {
+    "mine":   {"id": "mine", "farmer_id": "farmer-1"},
+    "theirs": {"id": "theirs", "farmer_id": "farmer-2"},
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    def get_owned_farm(farm_id, user_id):
+        farm = FARMS.get(farm_id)
+        return (farm, {"id": "farmer-1"}) if farm and farm["farmer_id"] == "farmer-1" else None
+
+    monkeypatch.setattr(farm_loader.farmer_service, "get_owned_farm", get_owned_farm)
+    monkeypatch.setattr(farm_loader.farmer_service, "get_farm_by_id", FARMS.get)
+
+    app = Flask(__name__)
+    app.register_blueprint(farm_api.farm_bp)
+
+    @app.before_request
+    def fake_auth():
+        g.user = {"id": "u1"}
+        g.user_id = "u1"
+
+    return app.test_client()
+
+
+def test_own_farm_is_returned(client):
+    response = client.get("/farms/mine")
+    assert response.status_code == 200
+    assert response.get_json()["farm"]["id"] == "mine"
+
+
+def test_someone_elses_farm_is_forbidden(client):
+    assert client.get("/farms/theirs").status_code == 403
+
+
+def test_missing_farm_is_not_found(client):
+    assert client.get("/farms/nope").status_code == 404
@@ -0,0 +1,58 @@
+import warnings
+from datetime import datetime, timezone
+import numpy as np
+from app.services.simulation.farm_world import FarmWorld
+from app.services.simulation.telemetry_emitter import TelemetryEmitter
+
+
+def _brute_force_zone(world, x, y):
+    for zone in world.zones.values():
+        if zone["x_range"][0] <= x < zone["x_range"][1] and zone["y_range"][0] <= y < zone["y_range"][1]:
+            return zone["id"]
+    return None
+
+
+def test_zone_ids_follow_original_layout():
+    world = FarmWorld(width=100, height=60, zone_size=20, seed=1)
+    expected = [(x, y) for x in range(0, 100, 20) for y in range(0, 60, 20)]
+    assert [(z["x_range"][0], z["y_range"][0]) for z in world.zones.values()] == expected
+
+
+def test_grid_lookup_matches_linear_scan():
+    world = FarmWorld(width=110, height=70, zone_size=20, seed=2)
+    for x in range(-5, 130, 3):
+        for y in range(-5, 90, 3):
+            zone = world.get_zone_by_position(x, y)
+            assert (zone["id"] if zone else None) == _brute_force_zone(world, x, y)
+
+
+def test_simulate_health_all_updates_every_zone_in_range():
+    world = FarmWorld(width=1000, height=1000, zone_size=10, seed=3)
+    before = world.health.copy()
+    health = world.simulate_health_all()
+    assert health.shape == (10_000,)
+    assert np.all((health >= 0) & (health <= 1))
+    assert not np.array_equal(before, health)
+    assert world.simulate_health(world.zones[42]) == float(health[42])
+    assert world.zones[42]["health"] == round(float(health[42]), 3)
+
+
+def test_emitter_tick_advances_world_once(monkeypatch):
+    emitter = TelemetryEmitter()
+    calls = []
+    original = emitter.farm.simulate_health_all
+    monkeypatch.setattr(emitter.farm, "simulate_health_all", lambda: calls.append(1) or original())
+    emitter.start()
+    telemetry = emitter.generate_telemetry()
+    assert calls == [1]
+    assert telemetry["ndvi_score"] == round(float(emitter.farm.health[telemetry["zone_id"]]), 3)
+
+
+def test_zone_last_updated_is_naive_utc_without_deprecation_warning():
+    world = FarmWorld(seed=4)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        stamp = world.zones[0]["last_updated"]
+    assert stamp.tzinfo is None
+    expected = datetime.fromtimestamp(float(world.last_updated[0]), timezone.utc)
+    assert stamp.isoformat() == expected.replace(tzinfo=None).isoformat()
@@ -0,0 +1,48 @@
+import re
+import pytest
+from scripts import ingest
+
+
+@pytest.fixture(autouse=True)
+def simple_tokenizer(monkeypatch):
+    # punkt data is downloaded at runtime; split on ". " so tests run offline
+    calls = []
+
+    def sent_tokenize(text):
+        calls.append(len(text))
+        return [s for s in re.split(r"(?<=\.)\s+", text) if s]
+
+    monkeypatch.setattr(ingest.nltk, "sent_tokenize", sent_tokenize)
+    return calls
+
+
+def test_chunks_respect_size_and_keep_sentences():
+    text = " ".join(f"Sentence number {i} talks about crops." for i in range(40))
+    chunks = ingest.chunk_text(text, chunk_size=200)
+    assert len(chunks) > 1
+    assert all(len(c) <= 200 + 40 for c in chunks)
+    assert all(c.endswith(".") for c in chunks)
+
+
+def test_sentence_split_across_pieces_is_rejoined():
+    pieces = ["First sentence about wheat. Second sentence is", "split across pages. Third one here is long enough."]
+    chunks = list(ingest.iter_chunks(pieces, chunk_size=500))
+    assert "Second sentence is\nsplit across pages." in chunks[0]
+
+
+def test_text_without_punctuation_is_bounded(simple_tokenizer):
+    page = "word " * 2000  # 10K chars, no sentence boundary
+    pages = [page] * 60   # 600K chars total
+    chunks = list(ingest.iter_chunks(pages, chunk_size=500))
+
+    assert chunks
+    assert max(len(c) for c in chunks) <= 500 * 2
+    # Each page is tokenized with at most one chunk of carry — linear, not quadratic
+    assert max(simple_tokenizer) <= len(page) + 500 + 1
+    assert sum(simple_tokenizer) < 2 * 60 * len(page)
+
+
+def test_split_long_prefers_whitespace():
+    pieces = list(ingest._split_long("aaaa bbbb cccc dddd", 10))
+    assert pieces == ["aaaa bbbb", "cccc dddd"]
+    assert list(ingest._split_long("x" * 25, 10)) == ["x" * 10, "x" * 10, "x" * 5]
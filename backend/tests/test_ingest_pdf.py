@@ -0,0 +1,59 @@
+from concurrent.futures import Future
+from scripts import ingest
+
+
+class FakePage:
+    def __init__(self, number):
+        self.number = number
+
+    def extract_text(self):
+        return f"page {self.number}"
+
+
+class FakePdfReader:
+    opened = 0
+
+    def __init__(self, file_path):
+        FakePdfReader.opened += 1
+        self.pages = [FakePage(i) for i in range(40)]
+
+
+class InlinePool:
+    """ProcessPoolExecutor stand-in: `max_workers` workers, each initialized once, run inline."""
+
+    def __init__(self, max_workers, initializer, initargs):
+        self.workers = max_workers
+        for _ in range(max_workers):
+            initializer(*initargs)
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def test_pdf_is_parsed_once_per_worker_not_per_task(monkeypatch):
+    FakePdfReader.opened = 0
+    monkeypatch.setattr(ingest, "PdfReader", FakePdfReader)
+    monkeypatch.setattr(ingest, "ProcessPoolExecutor", InlinePool)
+    monkeypatch.setattr(ingest.os, "cpu_count", lambda: 2)
+
+    pages = list(ingest._iter_pdf("book.pdf"))
+
+    assert pages == [f"page {i}" for i in range(40)]
+    # One parse to count pages, one per worker — not one per 8-page task
+    assert FakePdfReader.opened == 1 + 2
+
+
+def test_short_pdf_is_parsed_once(monkeypatch):
+    FakePdfReader.opened = 0
+    monkeypatch.setattr(ingest, "PdfReader", FakePdfReader)
+    monkeypatch.setattr(ingest, "PDF_PARALLEL_MIN_PAGES", 100)
+    assert len(list(ingest._iter_pdf("leaflet.pdf"))) == 40
+    assert FakePdfReader.opened == 1
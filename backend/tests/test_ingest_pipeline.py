@@ -0,0 +1,45 @@
+from scripts import ingest
+
+
+class FakeProvider:
+    def embed_batch(self, texts):
+        return [[0.1, 0.2] for _ in texts]
+
+
+class FakeTable:
+    def __init__(self, fail_on):
+        self.fail_on = fail_on
+        self.inserts = 0
+
+    def table(self, name):
+        return self
+
+    def insert(self, rows):
+        self.inserts += 1
+        self.rows = rows
+        return self
+
+    def execute(self):
+        if self.inserts in self.fail_on:
+            raise RuntimeError("insert failed")
+
+
+def test_insert_counts_are_merged_on_the_calling_thread(monkeypatch):
+    db = FakeTable(fail_on={2})
+    monkeypatch.setattr(ingest, "supabase", db)
+    monkeypatch.setattr(ingest, "INSERT_BATCH_SIZE", 32)
+    chunks = [(i, f"chunk {i}") for i in range(100)]
+
+    stats = ingest.embed_and_insert(chunks, {"document_name": "doc"}, FakeProvider())
+
+    assert db.inserts == 4
+    assert stats.chunks == stats.embedded == 100
+    assert stats.inserted == 68
+    assert stats.failed == 32
+
+
+def test_insert_rows_reports_instead_of_mutating(monkeypatch):
+    monkeypatch.setattr(ingest, "supabase", FakeTable(fail_on={1}))
+    assert ingest._insert_rows([{}, {}]) == (0, 2)
+    monkeypatch.setattr(ingest, "supabase", FakeTable(fail_on=set()))
+    assert ingest._insert_rows([{}, {}]) == (2, 0)
@@ -0,0 +1,49 @@
+from app.services.ai import interaction_loger
+from app.services.ai.interaction_loger import InteractionLogger, _flush_logs
+
+
+def _row(session_id):
+    return {"session_id": session_id, "user_id": None}
+
+
+def test_failed_bulk_insert_falls_back_to_single_rows(monkeypatch):
+    inserted = []
+
+    def insert(rows):
+        if len(rows) > 1:
+            raise RuntimeError("bulk failed")
+        if rows[0]["session_id"] == "bad":
+            raise RuntimeError("row failed")
+        inserted.append(rows[0]["session_id"])
+        return [f"id-{rows[0]['session_id']}"]
+
+    monkeypatch.setattr(interaction_loger, "_insert_logs", insert)
+    logged = []
+    entries = [(_row(sid), logged.append) for sid in ("a", "bad", "c")]
+
+    _flush_logs(entries)
+
+    assert inserted == ["a", "c"]
+    assert logged == ["id-a", "id-c"]
+
+
+def test_bulk_insert_runs_callbacks_in_order(monkeypatch):
+    monkeypatch.setattr(interaction_loger, "_insert_logs", lambda rows: [f"id-{r['session_id']}" for r in rows])
+    logged = []
+    _flush_logs([(_row(sid), logged.append) for sid in ("a", "b")] + [(_row("c"), None)])
+    assert logged == ["id-a", "id-b"]
+
+
+def test_usage_is_metered_even_when_log_is_dropped(monkeypatch):
+    metered = []
+    monkeypatch.setattr(interaction_loger.plan_service, "increment_ai_counter",
+                        lambda user_id, ai_type: metered.append((user_id, ai_type)))
+    monkeypatch.setattr(interaction_loger.log_writer, "submit", lambda item: False)
+
+    queued = InteractionLogger().log(
+        session_id="s", user_message="hi", ai_response="hello", language="en",
+        latency_ms=10, user_id="user-1", ai_type="farm",
+    )
+
+    assert queued is False
+    assert metered == [("user-1", "farm")]
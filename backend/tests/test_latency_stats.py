@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from app.services.ai.latency_stats import LatencyHistogram, LatencyStats
+
+
+@pytest.mark.parametrize("q", [0.5, 0.9, 0.99])
+def test_quantiles_are_within_bucket_error(q):
+    samples = np.random.default_rng(3).lognormal(mean=6, sigma=1, size=20_000)
+    histogram = LatencyHistogram()
+    for ms in samples:
+        histogram.record(ms)
+    exact = np.quantile(samples, q)
+    assert abs(histogram.quantile(q) - exact) / exact < 0.05
+
+
+def test_summary_and_edge_values():
+    histogram = LatencyHistogram()
+    assert histogram.summary()["p99_ms"] == 0
+    for ms in (0, -5, 0.5, 10_000_000):
+        histogram.record(ms)
+    summary = histogram.summary()
+    assert summary["count"] == 4
+    assert summary["max_ms"] == 10_000_000
+    assert summary["p50_ms"] <= 1
+
+
+def test_quantile_never_exceeds_max_seen():
+    histogram = LatencyHistogram()
+    histogram.record(101)
+    assert histogram.quantile(0.99) <= 101
+
+
+def test_stats_group_by_provider_and_source():
+    stats = LatencyStats()
+    stats.record_timings("web", {"total_ms": 120, "guardrail_ms": 30, "rag_hit": True}, provider="Groq")
+    stats.record("whatsapp", "total", 200, provider="bedrock")
+    snapshot = stats.snapshot()
+    assert set(snapshot["by_provider"]) == {"groq", "bedrock"}
+    assert set(snapshot["by_source"]["web"]) == {"total", "guardrail"}
+    assert snapshot["by_source"]["whatsapp"]["total"]["count"] == 1
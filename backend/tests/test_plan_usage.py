@@ -0,0 +1,160 @@
+import threading
+import pytest
+from app.services import plan_service as plan_module
+from app.services import usage_meter as meter_module
+from app.services.usage_meter import UsageMeter
+
+
+class FakeDB:
+    """user_plans with one row, plus the increment_usage_counters RPC."""
+
+    def __init__(self):
+        self.row = {"user_id": "u1", "ai_assistant_used": 0}
+        self.reads = 0
+        self.rpc_committed = threading.Event()
+        self.release_rpc = threading.Event()
+        self.release_rpc.set()
+
+    # user_plans read chain
+    def table(self, name):
+        return self
+
+    def select(self, *args):
+        return self
+
+    def eq(self, *args):
+        return self
+
+    def single(self):
+        return self
+
+    def execute(self):
+        self.reads += 1
+        return type("Res", (), {"data": dict(self.row)})()
+
+    def rpc(self, name, params):
+        db = self
+
+        class Call:
+            def execute(self):
+                for delta in params["deltas"]:
+                    db.row[delta["column_name"]] += delta["amount"]
+                db.rpc_committed.set()
+                # Hold the flush between commit and listeners
+                db.release_rpc.wait(5)
+
+        return Call()
+
+
+@pytest.fixture
+def env(monkeypatch):
+    db = FakeDB()
+    meter = UsageMeter(flush_interval=3600)
+    monkeypatch.setattr(meter_module, "get_admin_db_client", lambda: db)
+    monkeypatch.setattr(plan_module, "supabase", db)
+    monkeypatch.setattr(plan_module, "usage_meter", meter)
+    yield db, meter, plan_module.PlanService()
+    # Drain while the fake is still patched in (the meter also flushes at exit)
+    db.release_rpc.set()
+    meter.flush()
+
+
+def used(plan):
+    return plan["ai_assistant_used"]
+
+
+def test_pending_increments_are_overlaid_on_cached_row(env):
+    db, meter, plans = env
+    assert used(plans.get_plan("u1")) == 0
+    plans.increment_ai_counter("u1", "assistant")
+    plans.increment_ai_counter("u1", "assistant")
+    assert used(plans.get_plan("u1")) == 2
+    assert db.reads == 1
+
+
+def test_flush_drops_cached_row_and_never_double_counts(env):
+    db, meter, plans = env
+    plans.get_plan("u1")
+    plans.increment_ai_counter("u1", "assistant")
+    meter.flush()
+    assert db.row["ai_assistant_used"] == 1
+    assert used(plans.get_plan("u1")) == 1
+    assert used(plans.get_plan("u1")) == 1
+    assert db.reads == 2
+
+
+def test_read_during_a_slow_flush_does_not_wait_and_is_not_cached(env):
+    db, meter, plans = env
+    plans.increment_ai_counter("u1", "assistant")
+    db.release_rpc.clear()
+    flusher = threading.Thread(target=meter.flush)
+    flusher.start()
+    assert db.rpc_committed.wait(5)
+
+    # Committed in the database, listeners not yet run: a cache-miss read
+    # returns without waiting for the flush, over- rather than undercounting
+    result = {}
+    reader = threading.Thread(target=lambda: result.setdefault("plan", plans.get_plan("u1")))
+    reader.start()
+    reader.join(2)
+    assert not reader.is_alive()
+    assert used(result["plan"]) == 2
+    assert plans.cache_stats()["size"] == 0
+
+    db.release_rpc.set()
+    flusher.join(5)
+    assert used(plans.get_plan("u1")) == 1
+    assert used(plans.get_plan("u1")) == 1
+
+
+def test_row_read_across_a_whole_flush_is_not_cached(env, monkeypatch):
+    db, meter, plans = env
+    plans.increment_ai_counter("u1", "assistant")
+    fetch = plans._fetch
+
+    def fetch_then_flush(user_id):
+        # The first read predates the flush; the flush starts and commits before it returns
+        row = fetch(user_id)
+        if db.reads == 1:
+            meter.flush()
+        return row
+
+    monkeypatch.setattr(plans, "_fetch", fetch_then_flush)
+    assert used(plans.get_plan("u1")) == 1
+    assert db.reads == 2
+    assert used(plans.get_plan("u1")) == 1
+    assert db.reads == 2
+
+
+def test_cached_read_during_flush_counts_each_delta_once(env):
+    db, meter, plans = env
+    plans.get_plan("u1")  # cached at 0
+    plans.increment_ai_counter("u1", "assistant")
+    db.release_rpc.clear()
+    flusher = threading.Thread(target=meter.flush)
+    flusher.start()
+    assert db.rpc_committed.wait(5)
+
+    # Cached row predates the batch, pending() still has it in flight
+    assert used(plans.get_plan("u1")) == 1
+    db.release_rpc.set()
+    flusher.join(5)
+    assert used(plans.get_plan("u1")) == 1
+
+
+def test_failed_flush_keeps_deltas_pending(env):
+    db, meter, plans = env
+    plans.increment_ai_counter("u1", "assistant")
+
+    def broken_rpc(name, params):
+        raise RuntimeError("db down")
+
+    db.rpc = broken_rpc
+    meter.flush()
+    assert meter.pending("u1") == {"ai_assistant_used": 1}
+    assert meter.stats()["failures"] == 1
+
+    del db.rpc
+    meter.flush()
+    assert meter.pending("u1") == {}
+    assert db.row["ai_assistant_used"] == 1
@@ -0,0 +1,59 @@
+import threading
+import time
+import pytest
+from app.middleware import auth_middleware
+from config import Config
+
+
+class FakeAuth:
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+
+    def refresh_session(self, refresh_token):
+        self.calls += 1
+        self.release.wait(5)
+        session = type("Session", (), {
+            "access_token": f"access-{self.calls}",
+            "refresh_token": f"refresh-{self.calls}",
+        })()
+        return type("Response", (), {"session": session})()
+
+
+@pytest.fixture
+def auth(monkeypatch):
+    fake = FakeAuth()
+    client = type("Client", (), {"auth": fake})()
+    monkeypatch.setattr(auth_middleware, "get_supabase_client", lambda: client)
+    auth_middleware._refreshed_sessions.clear()
+    yield fake
+    auth_middleware._refreshed_sessions.clear()
+
+
+def test_concurrent_refreshes_share_one_call(auth):
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(auth_middleware.refresh_session_tokens("old-token")))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    auth.release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert auth.calls == 1
+    assert results == [("access-1", "refresh-1")] * 5
+
+
+def test_cache_is_keyed_on_digest_not_raw_token(auth):
+    auth.release.set()
+    auth_middleware.refresh_session_tokens("secret-refresh-token")
+    keys = list(auth_middleware._refreshed_sessions._entries)
+    assert keys and all("secret-refresh-token" not in key for key in keys)
+
+
+def test_replay_window_is_short():
+    assert Config.SESSION_REFRESH_CACHE_SECONDS <= 10
+    assert auth_middleware._refreshed_sessions.ttl_seconds <= 10
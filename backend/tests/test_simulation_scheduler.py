@@ -0,0 +1,114 @@
+import pytest
+from flask import Flask, g
+from app.api import drone, health
+from app.services import farm_loader
+from app.services.simulation.scheduler import SimulationScheduler
+
+
+def _scan(emitter):
+    emitter.drone.last_scan_time = None
+    return emitter.generate_telemetry()
+
+
+def test_missions_are_isolated_per_farm():
+    scheduler = SimulationScheduler()
+    a = scheduler.start_mission("farm-a")
+    b = scheduler.get("farm-b", create=True)
+    a.farm_id = b.farm_id = None  # keep the tick off the database
+
+    scheduler.tick()
+    assert a.latest is not None
+    assert b.latest is None
+    assert b.mission["mission_status"] == "NOT_STARTED"
+    assert scheduler.stats()["running"] == 1
+
+
+def test_failing_mission_does_not_stop_the_others():
+    scheduler = SimulationScheduler()
+    good = scheduler.start_mission("good")
+    bad = scheduler.start_mission("bad")
+    good.farm_id = None
+
+    def boom():
+        raise RuntimeError("broken")
+
+    bad.generate_telemetry = boom
+    scheduler.tick()
+    assert good.latest is not None
+    assert scheduler.stats()["errors"] == 1
+
+
+def test_idle_missions_are_evicted():
+    scheduler = SimulationScheduler(idle_ttl=0)
+    scheduler.get("idle", create=True)
+    scheduler.tick()
+    assert scheduler.get("idle") is None
+    assert scheduler.stats()["evicted"] == 1
+
+
+@pytest.fixture
+def legacy(monkeypatch):
+    """Legacy routes for a user owning farm-a and farm-b (farm-a first)."""
+    scheduler = SimulationScheduler()
+    monkeypatch.setattr(drone, "simulation_scheduler", scheduler)
+    monkeypatch.setattr(health, "simulation_scheduler", scheduler)
+    owned = ["farm-a", "farm-b"]
+    monkeypatch.setattr(farm_loader.farmer_service, "get_owned_farm",
+                        lambda farm_id, user_id: ({"id": farm_id}, {"id": "farmer"}) if farm_id in owned else None)
+    monkeypatch.setattr(farm_loader.farmer_service, "get_farms_for_user",
+                        lambda user_id: [{"id": farm_id} for farm_id in owned])
+
+    app = Flask(__name__)
+    app.register_blueprint(drone.drone_bp)
+    app.register_blueprint(health.health_live_bp)
+
+    @app.before_request
+    def fake_auth():
+        g.user = {"id": "u1"}
+        g.user_id = "u1"
+
+    return app.test_client(), scheduler
+
+
+def test_legacy_routes_follow_the_callers_farm_not_the_last_scan(legacy):
+    client, scheduler = legacy
+    a = scheduler.start_mission("farm-a")
+    b = scheduler.start_mission("farm-b")
+    a.farm_id = b.farm_id = None  # keep scans off the database
+    _scan(a)
+    _scan(b)  # farm-b scanned last
+
+    assert client.get("/drone/status").get_json()["drone"] == a.latest
+    assert client.get("/drone/status?farm_id=farm-b").get_json()["drone"] == b.latest
+    assert client.get("/health/live").get_json()["zone_id"] == a.latest["zone_id"]
+    assert client.get("/health/live?farm_id=farm-b").get_json()["timestamp"] == b.latest["timestamp"]
+    zones = client.get("/drone/zones?farm_id=farm-b").get_json()["zones"]
+    assert len(zones) == len(b.farm.zones)
+
+
+def test_legacy_routes_reject_farms_the_caller_does_not_own(legacy):
+    client, _ = legacy
+    for path in ("/drone/status", "/drone/zones", "/health/live"):
+        assert client.get(f"{path}?farm_id=someone-else").status_code == 403
+
+
+def test_reset_clears_what_legacy_routes_show(legacy):
+    client, scheduler = legacy
+    a = scheduler.start_mission("farm-a")
+    a.farm_id = None
+    _scan(a)
+    assert client.get("/health/live").get_json()["zone_id"] == a.latest["zone_id"]
+
+    scheduler.reset_mission("farm-a")
+    assert client.get("/health/live").get_json() == {"status": "NO_DATA"}
+    assert client.get("/drone/status").get_json()["status"] == "INITIALIZING"
+
+
+def test_tick_does_not_print_every_scan(capsys):
+    scheduler = SimulationScheduler()
+    emitter = scheduler.start_mission("farm-a")
+    emitter.farm_id = None
+    emitter.drone.last_scan_time = None
+    scheduler.tick()
+    assert scheduler.stats()["emitted"] == 1
+    assert capsys.readouterr().out == ""
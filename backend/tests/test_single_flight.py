@@ -0,0 +1,74 @@
+import threading
+import time
+import pytest
+from app.utils.single_flight import SingleFlight
+
+
+def _run_concurrently(flights, key, fn, callers=5):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flights.do(key, fn, timeout=5))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results, errors
+
+
+def test_concurrent_callers_share_one_call():
+    flights = SingleFlight()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        time.sleep(0.1)
+        return "value"
+
+    results, errors = _run_concurrently(flights, "k", fn)
+    assert calls == [1]
+    assert results == ["value"] * 5 and errors == []
+    assert flights.stats() == {"in_flight": 0, "leaders": 1, "shared": 4}
+
+
+def test_leader_error_reaches_every_waiter():
+    flights = SingleFlight()
+
+    def fn():
+        time.sleep(0.1)
+        raise ValueError("refresh failed")
+
+    results, errors = _run_concurrently(flights, "k", fn)
+    assert results == []
+    assert len(errors) == 5 and all(isinstance(e, ValueError) for e in errors)
+
+
+def test_key_is_free_after_the_flight():
+    flights = SingleFlight()
+    with pytest.raises(ValueError):
+        flights.do("k", lambda: (_ for _ in ()).throw(ValueError("first")))
+    assert flights.do("k", lambda: "second") == "second"
+    assert flights.stats()["leaders"] == 2
+
+
+def test_different_keys_do_not_share():
+    flights = SingleFlight()
+    assert flights.do("a", lambda: 1) == 1
+    assert flights.do("b", lambda: 2) == 2
+
+
+def test_waiter_times_out():
+    flights = SingleFlight()
+    release = threading.Event()
+    leader = threading.Thread(target=lambda: flights.do("k", release.wait))
+    leader.start()
+    time.sleep(0.05)
+    with pytest.raises(TimeoutError):
+        flights.do("k", lambda: "unused", timeout=0.05)
+    release.set()
+    leader.join(5)
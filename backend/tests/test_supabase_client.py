@@ -0,0 +1,16 @@
+from app.utils import supabase_client
+
+
+def test_admin_db_client_is_shared_and_pool_is_http1(monkeypatch):
+    monkeypatch.setattr(supabase_client, "_http_client", None)
+    monkeypatch.setattr(supabase_client, "_admin_db", None)
+    admin = supabase_client.get_admin_db_client()
+    assert supabase_client.get_admin_db_client() is admin
+    assert supabase_client._http_client._transport._pool._http2 is False
+
+
+def test_pool_stats_report_configured_limits(monkeypatch):
+    monkeypatch.setattr(supabase_client, "_http_client", None)
+    stats = supabase_client.pool_stats()
+    assert stats["max_connections"] == supabase_client.Config.SUPABASE_POOL_MAX_CONNECTIONS
+    assert stats["initialized"] is False
@@ -0,0 +1,37 @@
+from app.services.simulation.telemetry_broadcaster import TelemetryBroadcaster
+
+
+def test_publish_fans_out_only_to_the_farms_viewers():
+    broadcaster = TelemetryBroadcaster(queue_size=4, max_subscribers=10)
+    a1, a2, b = (broadcaster.subscribe(f) for f in ("a", "a", "b"))
+    broadcaster.publish("a", {"zone_id": 1})
+    assert a1.queue.get_nowait() == a2.queue.get_nowait() == 'data: {"zone_id": 1}\n\n'
+    assert b.queue.empty()
+    assert broadcaster.stats()["delivered"] == 2
+
+
+def test_slow_viewer_is_dropped_and_told_so():
+    broadcaster = TelemetryBroadcaster(queue_size=2, max_subscribers=10)
+    slow = broadcaster.subscribe("a")
+    for i in range(3):
+        broadcaster.publish("a", {"i": i})
+    assert broadcaster.subscriber_count() == 0
+    assert broadcaster.stats()["dropped"] == 1
+    frames = list(slow.events(heartbeat=0.01))
+    assert frames[-1].startswith("event: dropped")
+
+
+def test_subscriber_cap_and_release():
+    broadcaster = TelemetryBroadcaster(queue_size=2, max_subscribers=1)
+    first = broadcaster.subscribe("a")
+    assert broadcaster.subscribe("a") is None
+    broadcaster.unsubscribe(first)
+    broadcaster.unsubscribe(first)  # idempotent
+    assert broadcaster.subscriber_count() == 0
+    assert broadcaster.subscribe("a") is not None
+
+
+def test_idle_stream_sends_heartbeats():
+    broadcaster = TelemetryBroadcaster()
+    events = broadcaster.subscribe("a").events(heartbeat=0.01)
+    assert next(events) == ": keep-alive\n\n"
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from flask import Flask, g
+from app.api import drone
+from app.services.simulation.telemetry_history import TelemetryRing, downsample, lttb, minmax
+
+T0 = datetime(2026, 1, 1)
+
+
+def _point(i):
+    return {
+        "timestamp": (T0 + timedelta(seconds=5 * i)).isoformat(),
+        "position": {"x": i, "y": 2 * i},
+        "battery": 100 - i * 0.1,
+        "ndvi_score": 0.5 + 0.3 * np.sin(i / 5),
+        "zone_id": i % 25,
+    }
+
+
+def _ring(points, capacity=100):
+    ring = TelemetryRing(capacity)
+    for i in range(points):
+        ring.append(_point(i))
+    return ring
+
+
+def test_ring_keeps_newest_points_in_time_order():
+    ring = _ring(250)
+    columns = ring.snapshot()
+    assert ring.size == 100
+    assert columns["x"].tolist() == list(range(150, 250))
+    assert np.all(np.diff(columns["timestamp"]) > 0)
+
+
+def test_ring_since_filter_and_clear():
+    ring = _ring(20)
+    cutoff = ring.snapshot()["timestamp"][14]
+    assert ring.snapshot(since=cutoff)["x"].tolist() == [15, 16, 17, 18, 19]
+    ring.clear()
+    assert len(ring.snapshot()["timestamp"]) == 0
+
+
+@pytest.mark.parametrize("threshold", [1, 2, 3, 4, 10, 99, 100, 500])
+def test_lttb_returns_exactly_threshold_points(threshold):
+    x = np.arange(100, dtype=float)
+    y = np.random.default_rng(0).random(100)
+    indices = lttb(x, y, threshold)
+    assert len(indices) == min(threshold, 100)
+    assert np.all(np.diff(indices) > 0)
+    assert indices[-1] == 99
+    if threshold >= 2:
+        assert indices[0] == 0
+
+
+def test_lttb_keeps_a_spike():
+    x = np.arange(1000, dtype=float)
+    y = np.zeros(1000)
+    y[537] = 10
+    assert 537 in lttb(x, y, 20)
+
+
+def test_lttb_on_tiny_inputs():
+    assert lttb(np.array([]), np.array([]), 5).tolist() == []
+    assert lttb(np.array([1.0]), np.array([2.0]), 2).tolist() == [0]
+
+
+@pytest.mark.parametrize("points", [1, 2, 3, 10, 200])
+def test_minmax_bounds_and_extremes(points):
+    y = np.random.default_rng(1).random(100)
+    indices = minmax(y, points)
+    assert 1 <= len(indices) <= points
+    assert np.all(np.diff(indices) > 0)
+    if points >= 2:
+        assert y.argmin() in indices and y.argmax() in indices
+
+
+def test_downsample_shapes_series():
+    columns = _ring(100).snapshot()
+    series = downsample(columns, ["battery", "zone_id"], 10, "minmax")
+    assert set(series) == {"battery", "zone_id"}
+    assert len(series["battery"]["t"]) == len(series["battery"]["v"]) <= 10
+    assert series["battery"]["t"][0] == int(columns["timestamp"][0] * 1000)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    emitter = type("Emitter", (), {"history": _ring(100)})()
+    scheduler = type("Scheduler", (), {"get": lambda self, farm_id: emitter})()
+    owner = type("Loader", (), {"verify_ownership": lambda self, farm_id: True})()
+    monkeypatch.setattr(drone, "simulation_scheduler", scheduler)
+    monkeypatch.setattr(drone, "get_farm_loader", lambda: owner)
+
+    app = Flask(__name__)
+    app.register_blueprint(drone.drone_bp)
+
+    @app.before_request
+    def fake_auth():
+        g.user = {"id": "u1"}
+        g.user_id = "u1"
+
+    return app.test_client()
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+@pytest.mark.parametrize("points,expected", [(0, 2), (2, 2), (4, 4), (50, 50), (5000, 100)])
+def test_history_route_honours_points(client, method, points, expected):
+    body = client.get(f"/farms/f1/drone/history?points={points}&method={method}").get_json()
+    assert body["total"] == 100
+    # minmax keeps a bucket's min and max, which can be the same point
+    assert len(body["series"]["battery"]["v"]) == expected
+    assert len(body["series"]["ndvi"]["v"]) <= expected
+
+
+def test_history_route_rejects_bad_params(client):
+    assert client.get("/farms/f1/drone/history?series=altitude").status_code == 400
+    assert client.get("/farms/f1/drone/history?method=fft").status_code == 400
+    assert client.get("/farms/f1/drone/history?points=many").status_code == 400
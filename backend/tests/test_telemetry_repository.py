@@ -0,0 +1,33 @@
+from app.services.simulation import telemetry_repository
+from app.services.simulation.telemetry_repository import TelemetryRepository
+
+
+def test_save_queues_a_drone_telemetry_row(monkeypatch):
+    queued = []
+    monkeypatch.setattr(telemetry_repository.telemetry_writer, "submit", lambda row: queued.append(row) or True)
+    telemetry = {
+        "zone_id": 4, "status": "SCANNING", "battery": 88.5,
+        "position": {"x": 30, "y": 10}, "ndvi_score": 0.61, "health_label": "Moderate",
+    }
+    assert TelemetryRepository.save_telemetry(telemetry, farm_id="farm-1") is True
+    assert queued == [{
+        "farm_id": "farm-1", "zone_id": 4, "drone_status": "SCANNING", "battery": 88.5,
+        "position_x": 30, "position_y": 10, "ndvi_score": 0.61, "health_label": "Moderate",
+    }]
+
+
+def test_rows_are_bulk_inserted(monkeypatch):
+    inserted = []
+
+    class Table:
+        def insert(self, rows):
+            inserted.append(rows)
+            return self
+
+        def execute(self):
+            return None
+
+    db = type("DB", (), {"table": lambda self, name: Table()})()
+    monkeypatch.setattr(telemetry_repository, "get_admin_db_client", lambda: db)
+    telemetry_repository._insert_telemetry([{"zone_id": 1}, {"zone_id": 2}])
+    assert inserted == [[{"zone_id": 1}, {"zone_id": 2}]]
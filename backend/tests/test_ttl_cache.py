@@ -0,0 +1,60 @@
+import pytest
+from app.utils import ttl_cache
+from app.utils.ttl_cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_evicts_least_recently_used():
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")          # a is now most recent
+    cache.set("c", 3)       # evicts b
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(max_size=10, ttl_seconds=5)
+    cache.set("a", 1)
+    clock[0] += 4.9
+    assert cache.get("a") == 1
+    clock[0] += 0.2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl_overrides_default(clock):
+    cache = TTLCache(max_size=10, ttl_seconds=5)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2, ttl=100)
+    clock[0] += 10
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_non_positive_ttl_or_size_stores_nothing():
+    assert TTLCache(max_size=0).set("a", 1) is None
+    cache = TTLCache(max_size=10, ttl_seconds=5)
+    cache.set("a", 1, ttl=0)
+    cache.set("b", 1, ttl=-3)
+    assert len(cache) == 0
+
+
+def test_pop_and_stats():
+    cache = TTLCache(max_size=10, ttl_seconds=5)
+    cache.set("a", 1)
+    assert cache.pop("a") == 1
+    assert cache.pop("a", "gone") == "gone"
+    cache.get("a")
+    cache.set("b", 2)
+    cache.get("b")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
@@ -0,0 +1,50 @@
+from app.services import usage_meter as meter_module
+from app.services.usage_meter import UsageMeter
+
+
+class FakeRPC:
+    def __init__(self):
+        self.calls = []
+
+    def rpc(self, name, params):
+        self.calls.append((name, params))
+        return type("Call", (), {"execute": lambda self: None})()
+
+
+def test_deltas_are_aggregated_into_one_rpc(monkeypatch):
+    db = FakeRPC()
+    monkeypatch.setattr(meter_module, "get_admin_db_client", lambda: db)
+    meter = UsageMeter(flush_interval=3600)
+    for _ in range(3):
+        meter.add("u1", "ai_assistant_used")
+    meter.add("u2", "transformations_used", 2)
+    assert meter.pending("u1") == {"ai_assistant_used": 3}
+
+    meter.flush()
+    assert len(db.calls) == 1
+    name, params = db.calls[0]
+    assert name == "increment_usage_counters"
+    assert sorted((d["user_id"], d["column_name"], d["amount"]) for d in params["deltas"]) == [
+        ("u1", "ai_assistant_used", 3),
+        ("u2", "transformations_used", 2),
+    ]
+    assert meter.pending("u1") == {}
+
+
+def test_listeners_see_persisted_batches_and_errors_are_contained(monkeypatch):
+    monkeypatch.setattr(meter_module, "get_admin_db_client", FakeRPC)
+    meter = UsageMeter(flush_interval=3600)
+    seen = []
+    meter.on_flush(lambda user_id, columns: seen.append((user_id, columns)))
+    meter.on_flush(lambda user_id, columns: 1 / 0)
+    meter.add("u1", "ai_farm_used")
+    meter.flush()
+    assert seen == [("u1", {"ai_farm_used": 1})]
+    assert meter.stats()["flushes"] == 1
+
+
+def test_empty_flush_makes_no_call(monkeypatch):
+    db = FakeRPC()
+    monkeypatch.setattr(meter_module, "get_admin_db_client", lambda: db)
+    UsageMeter(flush_interval=3600).flush()
+    assert db.calls == []
@@ -0,0 +1,104 @@
+import json
+import threading
+import time
+import numpy as np
+import pytest
+from app.services.ai.vector_index import LocalVectorIndex
+
+
+def _index_with(rows):
+    index = LocalVectorIndex()
+    index._fetch_all = lambda: iter(rows)
+    index.refresh()
+    return index
+
+
+@pytest.fixture
+def corpus():
+    rng = np.random.default_rng(7)
+    vectors = rng.normal(size=(500, 64))
+    rows = [{"content": f"chunk-{i}", "embedding": v.tolist()} for i, v in enumerate(vectors)]
+    return vectors, rows
+
+
+def _brute_force(vectors, query, k):
+    scores = vectors @ query / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(query))
+    top = np.argsort(-scores)[:k]
+    return [f"chunk-{i}" for i in top], scores[top]
+
+
+@pytest.mark.parametrize("top_k", [1, 3, 10])
+def test_search_matches_brute_force(corpus, top_k):
+    vectors, rows = corpus
+    index = _index_with(rows)
+    rng = np.random.default_rng(11)
+    for _ in range(20):
+        query = rng.normal(size=64)
+        expected, scores = _brute_force(vectors, query, top_k)
+        results = index.search(query.tolist(), top_k=top_k)
+        assert [r["content"] for r in results] == expected
+        assert np.allclose([r["similarity"] for r in results], scores, atol=1e-5)
+
+
+def test_refresh_parses_pgvector_strings_and_skips_empty():
+    rows = [
+        {"content": "a", "embedding": json.dumps([1.0, 0.0])},
+        {"content": "b", "embedding": [0.0, 1.0]},
+        {"content": "no-vector", "embedding": None},
+    ]
+    index = _index_with(rows)
+    assert index.is_ready and index.size == 2
+    assert index.search([0.9, 0.1], top_k=5)[0]["content"] == "a"
+
+
+def test_bad_queries_return_nothing(corpus):
+    _, rows = corpus
+    index = _index_with(rows)
+    assert index.search([0.0] * 64) == []
+    assert index.search([1.0] * 3) == []
+    assert LocalVectorIndex().search([1.0] * 64) == []
+
+
+def test_top_k_larger_than_index():
+    index = _index_with([{"content": "only", "embedding": [1.0, 2.0]}])
+    assert [r["content"] for r in index.search([1.0, 2.0], top_k=5)] == ["only"]
+
+
+def test_on_change_fires_only_when_chunks_change():
+    rows = [{"content": "a", "embedding": [1.0, 0.0]}]
+    index = _index_with(rows)
+    changes = []
+    index.on_change(lambda: changes.append(1))
+    index.refresh()
+    assert changes == []
+    rows.append({"content": "b", "embedding": [0.0, 1.0]})
+    index.refresh()
+    assert changes == [1]
+
+
+def test_concurrent_refresh_async_starts_one_refresh():
+    index = LocalVectorIndex()
+    release = threading.Event()
+    fetches = []
+
+    def slow_fetch():
+        fetches.append(1)
+        release.wait(5)
+        return iter([{"content": "a", "embedding": [1.0, 0.0]}])
+
+    index._fetch_all = slow_fetch
+    callers = [threading.Thread(target=index.maybe_refresh) for _ in range(16)]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join(5)
+    release.set()
+    for _ in range(100):
+        if index.is_ready:
+            break
+        time.sleep(0.01)
+
+    assert index.is_ready
+    assert len(fetches) == 1
+    # The finished thread frees the slot for the next refresh
+    assert index._async_pending.acquire(timeout=1)